@@ -0,0 +1,75 @@
+# Copyright 2019, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Variables local to the current execution context.
+
+With :mod:`contextvars` (Python 3.7+), the values are local to the current
+asyncio task, and to the current thread otherwise. Older versions of Python
+fall back to :class:`threading.local`.
+"""
+
+import threading
+
+try:
+    import contextvars
+except ImportError:  # pragma: NO COVER
+    contextvars = None
+
+
+class ThreadLocalVar(object):
+    """A :class:`contextvars.ContextVar` lookalike backed by a
+    :class:`threading.local`, for versions of Python without
+    :mod:`contextvars`.
+
+    :type name: str
+    :param name: The name of the variable.
+
+    :type default: object
+    :param default: The value of the variable until it is set.
+    """
+    __slots__ = ('name', '_default', '_local')
+
+    def __init__(self, name, default=None):
+        self.name = name
+        self._default = default
+        self._local = threading.local()
+
+    def get(self):
+        """Get the value of the variable in the current thread."""
+        return getattr(self._local, 'value', self._default)
+
+    def set(self, value):
+        """Set the value of the variable in the current thread."""
+        self._local.value = value
+
+
+def context_var(name, default=None):
+    """Create a variable local to the current execution context.
+
+    Create variables once, at module level, and read and write them with
+    their ``get`` and ``set`` methods.
+
+    :type name: str
+    :param name: The name of the variable.
+
+    :type default: object
+    :param default: The value of the variable until it is set.
+
+    :rtype: :class:`contextvars.ContextVar` or :class:`ThreadLocalVar`
+    :returns: A :class:`contextvars.ContextVar` if :mod:`contextvars` is
+              available, a :class:`ThreadLocalVar` otherwise.
+    """
+    if contextvars is None:  # pragma: NO COVER
+        return ThreadLocalVar(name, default)
+    return contextvars.ContextVar(name, default=default)
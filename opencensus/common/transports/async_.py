@@ -13,19 +13,74 @@
 # limitations under the License.
 
 import atexit
+import itertools
 import logging
+import os
 import threading
+import time
+import weakref
 
 from six.moves import queue
 from six.moves import range
 
 from opencensus.common.transports import base
+from opencensus.metrics import label_key
+from opencensus.metrics import label_value
+from opencensus.metrics.export import gauge
 
 _DEFAULT_GRACE_PERIOD = 5.0  # Seconds
 _DEFAULT_MAX_BATCH_SIZE = 600
-_WAIT_PERIOD = 60.0  # Seconds
+_DEFAULT_MAX_QUEUE_SIZE = 0  # Unbounded
+_DEFAULT_BLOCK_TIMEOUT = 1.0  # Seconds
+_DEFAULT_MAX_LATENCY = 5.0  # Seconds
+_DEFAULT_NUM_WORKERS = 4
 _WORKER_THREAD_NAME = 'opencensus.common.Worker'
 _WORKER_TERMINATOR = object()
+_WORKER_FLUSH = object()
+
+_EXPORTER_LABEL_KEY = label_key.LabelKey(
+    'exporter', 'The class of the exporter of the transport')
+
+
+class NotEmittedError(Exception):
+    """Raised by objects wrapping an exporter to let the worker know that a
+    batch they already logged was not emitted.
+
+    :type spilled: bool
+    :param spilled: Whether the batch was stored to be emitted later rather
+                    than dropped.
+    """
+
+    def __init__(self, spilled=False):
+        super(NotEmittedError, self).__init__()
+        self.spilled = spilled
+
+
+class DropPolicy(object):
+    """What to do with exported data when the queue of the worker is full.
+
+    Attributes:
+      DROP_NEWEST (int): Drop the exported data.
+      DROP_OLDEST (int): Drop the oldest data of the queue to make room.
+      BLOCK (int): Wait up to `block_timeout` for room in the queue, then
+        drop the exported data.
+    """
+    DROP_NEWEST = 0
+    DROP_OLDEST = 1
+    BLOCK = 2
+
+
+# Workers to reset in the child process after a fork
+_workers = weakref.WeakSet()
+
+
+def _after_fork_in_child():
+    for worker in list(_workers):
+        worker._after_fork_in_child()
+
+
+if hasattr(os, 'register_at_fork'):  # pragma: NO COVER
+    os.register_at_fork(after_in_child=_after_fork_in_child)
 
 
 class _Worker(object):
@@ -44,17 +99,123 @@ class _Worker(object):
 
     :type max_batch_size: int
     :param max_batch_size: The maximum number of items to send at a time
-                           in the background thread.
+                           in the background thread. A batch is sent as
+                           soon as it is full.
+
+    :type max_queue_size: int
+    :param max_queue_size: The maximum number of exports waiting in the
+                           queue, unbounded if 0.
+
+    :type drop_policy: int
+    :param drop_policy: What to do when the queue is full, one of
+                        :class:`DropPolicy`.
+
+    :type block_timeout: float
+    :param block_timeout: The amount of time to wait for room in the queue
+                          with the :attr:`DropPolicy.BLOCK` policy.
+
+    :type max_latency: float
+    :param max_latency: The maximum amount of time to wait for a batch to
+                        fill up after its first item was queued, before
+                        sending it anyway.
+
+    The worker logs errors and labels its gauges with ``exporter_name``, the
+    class name of the exporter by default. Transports wrapping the exporter
+    set it to the name of the exporter they wrap.
     """
     def __init__(self, exporter, grace_period=_DEFAULT_GRACE_PERIOD,
-                 max_batch_size=_DEFAULT_MAX_BATCH_SIZE):
+                 max_batch_size=_DEFAULT_MAX_BATCH_SIZE,
+                 max_queue_size=_DEFAULT_MAX_QUEUE_SIZE,
+                 drop_policy=DropPolicy.DROP_NEWEST,
+                 block_timeout=_DEFAULT_BLOCK_TIMEOUT,
+                 max_latency=_DEFAULT_MAX_LATENCY):
+        if max_queue_size < 0:
+            raise ValueError("max_queue_size must not be negative")
+        if drop_policy not in (DropPolicy.DROP_NEWEST, DropPolicy.DROP_OLDEST,
+                               DropPolicy.BLOCK):
+            raise ValueError("invalid drop_policy")
+
         self.exporter = exporter
+        self.exporter_name = exporter.__class__.__name__
         self._grace_period = grace_period
         self._max_batch_size = max_batch_size
-        self._queue = queue.Queue(0)
+        self._drop_policy = drop_policy
+        self._block_timeout = block_timeout
+        self._max_latency = max_latency
+        self._max_queue_size = max_queue_size
         self._lock = threading.Lock()
+        self._pid = None
+        self._reset()
+        _workers.add(self)
+
+    def _reset(self):
+        """Create an empty queue and reset the thread and counters."""
+        self._queue = queue.Queue(self._max_queue_size)
         self._event = threading.Event()
         self._thread = None
+        self._counts_lock = threading.Lock()
+        self._enqueued_count = 0
+        self._dropped_count = 0
+        self._spilled_count = 0
+        self._exported_count = 0
+        self._export_latency = 0.0
+
+    def _after_fork_in_child(self):
+        """Discard the state inherited from the parent process.
+
+        Called in the child process right after a fork, when the thread of
+        the parent does not exist anymore. Locks that were held by threads of
+        the parent are replaced, and the queue is emptied since its data will
+        be exported by the parent.
+        """
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _check_fork(self):
+        """Restart the background thread if the process forked since it
+        was started."""
+        if self._pid is None or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+                self._start()
+
+    @property
+    def enqueued_count(self):
+        """The number of exports queued."""
+        return self._enqueued_count
+
+    @property
+    def dropped_count(self):
+        """The number of exports dropped because the queue was full or the
+        exporter failed."""
+        return self._dropped_count
+
+    @property
+    def spilled_count(self):
+        """The number of exports the exporter failed to emit and stored to
+        emit later."""
+        return self._spilled_count
+
+    @property
+    def exported_count(self):
+        """The number of exports emitted by the exporter."""
+        return self._exported_count
+
+    @property
+    def export_latency(self):
+        """The time the exporter took to emit the last batch, in seconds."""
+        return self._export_latency
+
+    @property
+    def queue_size(self):
+        """The number of exports waiting in the queue."""
+        return self._queue.qsize()
+
+    def _count_dropped(self, count):
+        with self._counts_lock:
+            self._dropped_count += count
 
     @property
     def is_alive(self):
@@ -65,16 +226,28 @@ class _Worker(object):
         """Get multiple items from a Queue.
 
         Gets at least one (blocking) and at most ``max_batch_size`` items
-        (non-blocking) from a given Queue. Does not mark the items as done.
+        from a given Queue. Waits up to ``max_latency`` after the first item
+        for the batch to fill up, unless the worker is stopping or flushing.
+        Does not mark the items as done.
 
         :rtype: Sequence
         :returns: A sequence of items retrieved from the queue.
         """
         items = [self._queue.get()]
+        deadline = time.time() + self._max_latency
+        # self._event is set at exit, at which point we start draining the
+        # queue immediately.
+        wait = not self._event.is_set()
 
         while len(items) < self._max_batch_size:
+            if items[-1] is _WORKER_TERMINATOR or items[-1] is _WORKER_FLUSH:
+                wait = False
+            timeout = deadline - time.time()
             try:
-                items.append(self._queue.get_nowait())
+                if wait and timeout > 0:
+                    items.append(self._queue.get(timeout=timeout))
+                else:
+                    items.append(self._queue.get_nowait())
             except queue.Empty:
                 break
 
@@ -91,34 +264,44 @@ class _Worker(object):
         while True:
             items = self._get_items()
             data = []
+            count = 0
 
             for item in items:
                 if item is _WORKER_TERMINATOR:
                     quit_ = True
                     # Continue processing items, don't break, try to process
                     # all items we got back before quitting.
+                elif item is _WORKER_FLUSH:
+                    pass
                 else:
                     data.extend(item)
+                    count += 1
 
             if data:
+                start = time.time()
                 try:
                     self.exporter.emit(data)
+                except NotEmittedError as exc:
+                    if exc.spilled:
+                        with self._counts_lock:
+                            self._spilled_count += count
+                    else:
+                        self._count_dropped(count)
                 except Exception:
                     logging.exception(
                         '%s failed to emit data.'
                         'Dropping %s objects from queue.',
-                        self.exporter.__class__.__name__,
+                        self.exporter_name,
                         len(data))
-                    pass
+                    self._count_dropped(count)
+                else:
+                    with self._counts_lock:
+                        self._exported_count += count
+                self._export_latency = time.time() - start
 
             for _ in range(len(items)):
                 self._queue.task_done()
 
-            # self._event is set at exit, at which point we start draining the
-            # queue immediately. If self._event is unset, block for
-            # _WAIT_PERIOD between each batch of exports.
-            self._event.wait(_WAIT_PERIOD)
-
             if quit_:
                 break
 
@@ -131,12 +314,15 @@ class _Worker(object):
         with self._lock:
             if self.is_alive:
                 return
+            self._start()
 
-            self._thread = threading.Thread(
-                target=self._thread_main, name=_WORKER_THREAD_NAME)
-            self._thread.daemon = True
-            self._thread.start()
-            atexit.register(self._export_pending_data)
+    def _start(self):
+        self._pid = os.getpid()
+        self._thread = threading.Thread(
+            target=self._thread_main, name=_WORKER_THREAD_NAME)
+        self._thread.daemon = True
+        self._thread.start()
+        atexit.register(self._export_pending_data)
 
     def stop(self):
         """Signals the background thread to stop.
@@ -155,7 +341,13 @@ class _Worker(object):
             return True
 
         with self._lock:
-            self._queue.put_nowait(_WORKER_TERMINATOR)
+            # The termination signal is never dropped, if the queue is full
+            # wait for the worker to make room for it.
+            try:
+                self._queue.put(_WORKER_TERMINATOR,
+                                timeout=self._grace_period)
+            except queue.Full:
+                return False
             self._thread.join(timeout=self._grace_period)
 
             success = not self.is_alive
@@ -167,18 +359,133 @@ class _Worker(object):
         """Callback that attempts to send pending data before termination."""
         if not self.is_alive:
             return
-        # Stop blocking between export batches
+        # Stop waiting for batches to fill up
         self._event.set()
         self.stop()
 
     def enqueue(self, data):
-        """Queues data to be written by the background thread."""
-        self._queue.put_nowait(data)
+        """Queues data to be written by the background thread.
+
+        If the queue is full, either this data or the oldest data of the
+        queue is dropped according to the drop policy.
+
+        If the process forked since the worker was started, e.g. in the
+        workers of a prefork server, the background thread is restarted
+        first.
+        """
+        self._check_fork()
+        if data is _WORKER_TERMINATOR or data is _WORKER_FLUSH:
+            self._queue.put(data)
+            return
+
+        try:
+            if self._drop_policy == DropPolicy.BLOCK:
+                self._queue.put(data, timeout=self._block_timeout)
+            elif self._drop_policy == DropPolicy.DROP_OLDEST:
+                self._put_drop_oldest(data)
+            else:
+                self._queue.put_nowait(data)
+        except queue.Full:
+            self._count_dropped(1)
+            return
+
+        with self._counts_lock:
+            self._enqueued_count += 1
+
+    def _put_drop_oldest(self, data):
+        """Queues data, dropping the oldest data of the queue if it is
+        full."""
+        while True:
+            try:
+                self._queue.put_nowait(data)
+                return
+            except queue.Full:
+                pass
+            try:
+                oldest = self._queue.get_nowait()
+            except queue.Empty:
+                continue
+            self._queue.task_done()
+            if oldest is _WORKER_TERMINATOR:
+                # Keep the termination signal, drop the new data instead
+                self._queue.put_nowait(oldest)
+                raise queue.Full
+            if oldest is not _WORKER_FLUSH:
+                self._count_dropped(1)
 
     def flush(self):
-        """Submit any pending data."""
+        """Submit any pending data.
+
+        If the worker is running, the current batch is sent without waiting
+        for it to fill up.
+        """
+        self._check_fork()
+        if self.is_alive:
+            self._queue.put(_WORKER_FLUSH)
         self._queue.join()
 
+    def get_metrics_registry(self):
+        """Get gauges tracking the queue and the counters of the worker.
+
+        :rtype: :class:`~opencensus.metrics.export.gauge.Registry`
+        :returns: A registry of derived gauges labeled with the class of the
+                  exporter.
+        """
+        return _get_metrics_registry(self)
+
+    # Bound methods tracked by the gauges, which only keep weak references
+    def _get_queue_size(self):
+        return self.queue_size
+
+    def _get_enqueued_count(self):
+        return self._enqueued_count
+
+    def _get_dropped_count(self):
+        return self._dropped_count
+
+    def _get_spilled_count(self):
+        return self._spilled_count
+
+    def _get_exported_count(self):
+        return self._exported_count
+
+    def _get_export_latency(self):
+        return self._export_latency
+
+
+def _get_metrics_registry(source):
+    """Create the gauges tracking the queue and counters of ``source``.
+
+    :type source: :class:`_Worker` or :class:`WorkerPoolTransport`
+    :param source: The object to read the name of the exporter, the queue
+                   size and the counters from.
+
+    :rtype: :class:`~opencensus.metrics.export.gauge.Registry`
+    :returns: A registry of derived gauges labeled with the class of the
+              exporter.
+    """
+    label_values = [label_value.LabelValue(source.exporter_name)]
+    registry = gauge.Registry()
+    for name, description, unit, gauge_class, func in (
+            ('queue_size', 'Number of exports waiting in the queue',
+             '1', gauge.DerivedLongGauge, source._get_queue_size),
+            ('enqueued', 'Number of exports queued',
+             '1', gauge.DerivedLongGauge, source._get_enqueued_count),
+            ('dropped', 'Number of exports dropped',
+             '1', gauge.DerivedLongGauge, source._get_dropped_count),
+            ('spilled', 'Number of exports stored to be emitted later',
+             '1', gauge.DerivedLongGauge, source._get_spilled_count),
+            ('exported', 'Number of exports emitted',
+             '1', gauge.DerivedLongGauge, source._get_exported_count),
+            ('export_latency', 'Time taken to emit the last batch',
+             's', gauge.DerivedDoubleGauge, source._get_export_latency)):
+        derived_gauge = gauge_class(
+            'opencensus.io/transport/' + name, description, unit,
+            [_EXPORTER_LABEL_KEY])
+        derived_gauge.create_time_series(label_values, func)
+        registry.add_gauge(derived_gauge)
+    return registry
+
 
 class AsyncTransport(base.Transport):
     """Asynchronous transport that uses a background thread.
@@ -197,12 +504,35 @@ class AsyncTransport(base.Transport):
     :type max_batch_size: int
     :param max_batch_size: The maximum number of items to send at a time
                            in the background thread.
+
+    :type max_queue_size: int
+    :param max_queue_size: The maximum number of exports waiting in the
+                           queue, unbounded if 0.
+
+    :type drop_policy: int
+    :param drop_policy: What to do when the queue is full, one of
+                        :class:`DropPolicy`.
+
+    :type block_timeout: float
+    :param block_timeout: The amount of time to wait for room in the queue
+                          with the :attr:`DropPolicy.BLOCK` policy.
+
+    :type max_latency: float
+    :param max_latency: The maximum amount of time to wait for a batch to
+                        fill up after its first item was queued, before
+                        sending it anyway.
     """
 
     def __init__(self, exporter, grace_period=_DEFAULT_GRACE_PERIOD,
-                 max_batch_size=_DEFAULT_MAX_BATCH_SIZE):
+                 max_batch_size=_DEFAULT_MAX_BATCH_SIZE,
+                 max_queue_size=_DEFAULT_MAX_QUEUE_SIZE,
+                 drop_policy=DropPolicy.DROP_NEWEST,
+                 block_timeout=_DEFAULT_BLOCK_TIMEOUT,
+                 max_latency=_DEFAULT_MAX_LATENCY):
         self.exporter = exporter
-        self.worker = _Worker(exporter, grace_period, max_batch_size)
+        self.worker = _Worker(exporter, grace_period, max_batch_size,
+                              max_queue_size, drop_policy, block_timeout,
+                              max_latency)
         self.worker.start()
 
     def export(self, data):
@@ -212,3 +542,155 @@ class AsyncTransport(base.Transport):
     def flush(self):
         """Submit any pending traces/stats."""
         self.worker.flush()
+
+    def get_metrics_registry(self):
+        """Get gauges tracking the queue and the counters of the worker.
+
+        Add the registry to the metric producers of a metrics exporter to
+        monitor the backpressure of the exporter.
+
+        :rtype: :class:`~opencensus.metrics.export.gauge.Registry`
+        :returns: A registry of derived gauges labeled with the class of the
+                  exporter.
+        """
+        return self.worker.get_metrics_registry()
+
+
+def _get_trace_id(data):
+    """Get the trace id of a span, or None for other kinds of data."""
+    context = getattr(data, 'context', None)
+    return getattr(context, 'trace_id', None)
+
+
+class WorkerPoolTransport(base.Transport):
+    """Asynchronous transport that uses a pool of background threads.
+
+    Each worker has its own queue and thread, which emit batches with the
+    exporter independently, so that up to ``num_workers`` batches are being
+    serialized and sent at the same time. Spans of the same trace always go
+    to the same worker, which emits them in the order they were exported.
+    Other data is spread over the workers in turn.
+
+    :type exporter: :class:`~opencensus.trace.exporters.base.Exporter` or
+                    :class:`~opencensus.stats.exporters.base.StatsExporter`
+    :param exporter: Instances of Exporter objects. Its ``emit`` method is
+                     called from several threads at once.
+
+    :type num_workers: int
+    :param num_workers: The number of background threads.
+
+    :type grace_period: float
+    :param grace_period: The amount of time to wait for the pending data of
+                         each worker to be submitted when the process is
+                         shutting down.
+
+    :type max_batch_size: int
+    :param max_batch_size: The maximum number of items to send at a time
+                           from each worker.
+
+    :type max_queue_size: int
+    :param max_queue_size: The maximum number of exports waiting in the
+                           queue of each worker, unbounded if 0.
+
+    :type drop_policy: int
+    :param drop_policy: What to do when the queue of a worker is full, one of
+                        :class:`DropPolicy`.
+
+    :type block_timeout: float
+    :param block_timeout: The amount of time to wait for room in the queue
+                          with the :attr:`DropPolicy.BLOCK` policy.
+
+    :type max_latency: float
+    :param max_latency: The maximum amount of time to wait for a batch to
+                        fill up after its first item was queued, before
+                        sending it anyway.
+    """
+
+    def __init__(self, exporter, num_workers=_DEFAULT_NUM_WORKERS,
+                 grace_period=_DEFAULT_GRACE_PERIOD,
+                 max_batch_size=_DEFAULT_MAX_BATCH_SIZE,
+                 max_queue_size=_DEFAULT_MAX_QUEUE_SIZE,
+                 drop_policy=DropPolicy.DROP_NEWEST,
+                 block_timeout=_DEFAULT_BLOCK_TIMEOUT,
+                 max_latency=_DEFAULT_MAX_LATENCY):
+        if num_workers < 1:
+            raise ValueError("num_workers must be positive")
+
+        self.exporter = exporter
+        self.exporter_name = exporter.__class__.__name__
+        self.workers = [
+            _Worker(exporter, grace_period, max_batch_size, max_queue_size,
+                    drop_policy, block_timeout, max_latency)
+            for _ in range(num_workers)]
+        self._round_robin = itertools.count()
+        for worker in self.workers:
+            worker.start()
+
+    def _next_index(self):
+        return next(self._round_robin) % len(self.workers)
+
+    def export(self, data):
+        """Split the trace/stats by trace and put them into the queues of
+        the workers."""
+        if not isinstance(data, (list, tuple)):
+            self.workers[self._next_index()].enqueue(data)
+            return
+
+        partitions = {}
+        for item in data:
+            trace_id = _get_trace_id(item)
+            if trace_id is None:
+                index = self._next_index()
+            else:
+                index = hash(trace_id) % len(self.workers)
+            partitions.setdefault(index, []).append(item)
+
+        for index, partition in partitions.items():
+            self.workers[index].enqueue(partition)
+
+    def flush(self):
+        """Submit any pending traces/stats."""
+        for worker in self.workers:
+            worker.flush()
+
+    def stop(self):
+        """Signals the background threads to stop.
+
+        :rtype: bool
+        :returns: True if all the threads terminated.
+        """
+        # Let every worker drain its queue while the first ones are joined
+        for worker in self.workers:
+            worker._event.set()
+        return all([worker.stop() for worker in self.workers])
+
+    def get_metrics_registry(self):
+        """Get gauges tracking the queues and the counters of the workers.
+
+        Values are summed over the workers, except the export latency which
+        is the largest latency of the last batches of the workers.
+
+        :rtype: :class:`~opencensus.metrics.export.gauge.Registry`
+        :returns: A registry of derived gauges labeled with the class of the
+                  exporter.
+        """
+        return _get_metrics_registry(self)
+
+    # Bound methods tracked by the gauges, which only keep weak references
+    def _get_queue_size(self):
+        return sum(worker.queue_size for worker in self.workers)
+
+    def _get_enqueued_count(self):
+        return sum(worker.enqueued_count for worker in self.workers)
+
+    def _get_dropped_count(self):
+        return sum(worker.dropped_count for worker in self.workers)
+
+    def _get_spilled_count(self):
+        return sum(worker.spilled_count for worker in self.workers)
+
+    def _get_exported_count(self):
+        return sum(worker.exported_count for worker in self.workers)
+
+    def _get_export_latency(self):
+        return max(worker.export_latency for worker in self.workers)
@@ -0,0 +1,238 @@
+# Copyright 2019, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Transport exporting batches of data from a task of the running asyncio
+event loop. Requires Python 3.5+."""
+
+import asyncio
+import functools
+import logging
+
+from opencensus.common.transports import base
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_GRACE_PERIOD = 5.0  # Seconds
+_DEFAULT_MAX_BATCH_SIZE = 600
+_DEFAULT_MAX_LATENCY = 5.0  # Seconds
+_WORKER_TERMINATOR = object()
+_WORKER_FLUSH = object()
+
+
+def _get_running_loop():
+    """Get the event loop running in the current thread.
+
+    :rtype: :class:`asyncio.AbstractEventLoop`
+    :returns: The running event loop, or None.
+    """
+    if hasattr(asyncio, 'get_running_loop'):
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+    # Python 3.5 and 3.6
+    try:  # pragma: NO COVER
+        loop = asyncio.get_event_loop()
+    except RuntimeError:  # pragma: NO COVER
+        return None
+    return loop if loop.is_running() else None  # pragma: NO COVER
+
+
+class AsyncioTransport(base.Transport):
+    """Asynchronous transport that uses a task of an asyncio event loop.
+
+    Exported data is put in an :class:`asyncio.Queue` and emitted in batches
+    by a task of the event loop, so that exporting a span neither needs a
+    background thread nor a handoff between threads. If the ``emit`` method
+    of the exporter is a coroutine function, it is awaited on the loop.
+    Otherwise it is blocking, and runs in the default executor of the loop.
+
+    The transport binds to the event loop running when data is first
+    exported, unless ``loop`` is given. Data exported from other threads is
+    handed to the loop thread-safely. Data exported before the transport is
+    bound, outside of a running event loop, is logged and dropped.
+
+    Unlike in other transports, :meth:`flush` and :meth:`stop` are
+    coroutines, to be awaited on the event loop of the transport.
+
+    :type exporter: :class:`~opencensus.trace.exporters.base.Exporter` or
+                    :class:`~opencensus.stats.exporters.base.StatsExporter`
+    :param exporter: Instances of Exporter objects.
+
+    :type grace_period: float
+    :param grace_period: The amount of time to wait for pending data to
+                         be submitted when the transport is stopped.
+
+    :type max_batch_size: int
+    :param max_batch_size: The maximum number of items to send at a time. A
+                           batch is sent as soon as it is full.
+
+    :type loop: :class:`asyncio.AbstractEventLoop`
+    :param loop: The event loop to export data from.
+
+    :type max_latency: float
+    :param max_latency: The maximum amount of time to wait for a batch to
+                        fill up after its first item was queued, before
+                        sending it anyway.
+    """
+
+    def __init__(self, exporter, grace_period=_DEFAULT_GRACE_PERIOD,
+                 max_batch_size=_DEFAULT_MAX_BATCH_SIZE, loop=None,
+                 max_latency=_DEFAULT_MAX_LATENCY):
+        self.exporter = exporter
+        self._grace_period = grace_period
+        self._max_batch_size = max_batch_size
+        self._max_latency = max_latency
+        self._loop = loop
+        self._queue = None
+        self._task = None
+
+    @property
+    def is_alive(self):
+        """Returns True if the export task is running."""
+        return self._task is not None and not self._task.done()
+
+    def _start(self):
+        """Start the export task, in the thread of the event loop."""
+        self._queue = asyncio.Queue()
+        self._task = self._loop.create_task(self._task_main())
+
+    def _enqueue(self, data):
+        """Queue data to be emitted, in the thread of the event loop."""
+        if self._task is None:
+            self._start()
+        self._queue.put_nowait(data)
+
+    async def _get_items(self):
+        """Get multiple items from the queue.
+
+        Waits for at least one and gets at most ``max_batch_size`` items
+        from the queue. Waits up to ``max_latency`` after the first item for
+        the batch to fill up, unless the transport is stopping or flushing.
+        Does not mark the items as done.
+
+        :rtype: Sequence
+        :returns: A sequence of items retrieved from the queue.
+        """
+        items = [await self._queue.get()]
+        deadline = self._loop.time() + self._max_latency
+
+        while len(items) < self._max_batch_size:
+            if not self._queue.empty():
+                items.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - self._loop.time()
+            if (timeout <= 0 or items[-1] is _WORKER_TERMINATOR or
+                    items[-1] is _WORKER_FLUSH):
+                break
+            try:
+                items.append(
+                    await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return items
+
+    async def _emit(self, data):
+        """Emit data with the exporter without blocking the event loop."""
+        emit = self.exporter.emit
+        if asyncio.iscoroutinefunction(emit):
+            await emit(data)
+        else:
+            await self._loop.run_in_executor(
+                None, functools.partial(emit, data))
+
+    async def _task_main(self):
+        """The entry point for the export task.
+
+        Pulls pending data off the queue and emits them in batches with the
+        exporter.
+        """
+        quit_ = False
+
+        while not quit_:
+            items = await self._get_items()
+            data = []
+
+            for item in items:
+                if item is _WORKER_TERMINATOR:
+                    quit_ = True
+                elif item is _WORKER_FLUSH:
+                    pass
+                else:
+                    data.extend(item)
+
+            if data:
+                try:
+                    await self._emit(data)
+                except Exception:
+                    logger.exception(
+                        '%s failed to emit data.'
+                        'Dropping %s objects from queue.',
+                        self.exporter.__class__.__name__,
+                        len(data))
+
+            for _ in range(len(items)):
+                self._queue.task_done()
+
+    def export(self, data):
+        """Put the trace/stats to be exported into the queue."""
+        running_loop = _get_running_loop()
+        if self._loop is None:
+            if running_loop is None:
+                logger.warning(
+                    'No event loop to export data to. Dropping %s objects. '
+                    'Export from a running event loop or pass a loop to '
+                    'AsyncioTransport.', len(data))
+                return
+            self._loop = running_loop
+        if running_loop is self._loop:
+            self._enqueue(data)
+        else:
+            self._loop.call_soon_threadsafe(self._enqueue, data)
+
+    async def flush(self):
+        """Submit any pending traces/stats.
+
+        This is a coroutine, unlike :meth:`.Transport.flush`. It must be
+        awaited on the event loop of the transport.
+        """
+        if not self.is_alive:
+            return
+        # Send the current batch without waiting for it to fill up
+        self._queue.put_nowait(_WORKER_FLUSH)
+        await self._queue.join()
+
+    async def stop(self):
+        """Submit pending traces/stats and stop the export task.
+
+        This is a coroutine, to be awaited on the event loop of the
+        transport.
+
+        :rtype: bool
+        :returns: True if the task terminated. False if pending data could
+                  not be submitted within ``grace_period``.
+        """
+        if not self.is_alive:
+            return True
+
+        self._queue.put_nowait(_WORKER_TERMINATOR)
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task),
+                                   self._grace_period)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            return False
+        finally:
+            self._task = None
+        return True
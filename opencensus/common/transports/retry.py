@@ -0,0 +1,484 @@
+# Copyright 2019, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Transport retrying failed exports, and spilling them to disk to be
+replayed when the backend recovers."""
+
+import errno
+import logging
+import os
+import random
+import struct
+import threading
+import time
+
+from six.moves import cPickle as pickle
+
+from opencensus.common.transports import async_
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_MAX_ATTEMPTS = 5
+_DEFAULT_INITIAL_BACKOFF = 1.0  # Seconds
+_DEFAULT_MAX_BACKOFF = 30.0  # Seconds
+_DEFAULT_SPILL_MAX_BYTES = 64 * 1024 * 1024
+_DEFAULT_SEGMENT_BYTES = 4 * 1024 * 1024
+_REPLAY_INTERVAL = 60.0  # Seconds
+_PICKLE_PROTOCOL = 2
+_HEADER = struct.Struct('>I')
+
+# Segments being written, closed and waiting to be replayed, and claimed by
+# the process replaying them. Segments are named after the time they were
+# created and the process writing them, and claimed segments after the
+# process replaying them.
+_OPEN_SUFFIX = '.open'
+_SEGMENT_SUFFIX = '.seg'
+_REPLAY_SUFFIX = '.replay'
+
+
+def _pid_alive(pid):
+    """Whether a process is running, assuming it is when it cannot be
+    checked."""
+    if os.name != 'posix':  # pragma: NO COVER
+        return True
+    try:
+        os.kill(pid, 0)
+    except OSError as exc:
+        return exc.errno == errno.EPERM
+    return True
+
+
+def _owner_pid(name):
+    """The process writing or replaying a segment, parsed from its
+    name."""
+    base = name.rsplit('.', 1)[0]
+    if name.endswith(_REPLAY_SUFFIX):
+        pid = base.rsplit('.', 1)[-1]
+    else:
+        pid = base.split('-')[1]
+    try:
+        return int(pid)
+    except ValueError:
+        return None
+
+
+def _should_retry(exc):
+    """Retry all errors except client errors other than timeouts and rate
+    limiting, which fail again when retried."""
+    status_code = getattr(getattr(exc, 'response', None), 'status_code', None)
+    if status_code is None:
+        return True
+    return not 400 <= status_code < 500 or status_code in (408, 429)
+
+
+class RetryBudget(object):
+    """Limit retries to a fraction of the successful exports.
+
+    Each successful export adds ``ratio`` tokens to the budget, up to
+    ``max_tokens``, and each retry takes one token. During a long outage,
+    the budget runs out after ``max_tokens`` retries and failed batches are
+    no longer retried, so that the transport does not keep hammering the
+    backend or fall behind on new data.
+
+    :type ratio: float
+    :param ratio: The number of retries allowed per successful export.
+
+    :type max_tokens: float
+    :param max_tokens: The maximum number of retries in a row.
+    """
+
+    def __init__(self, ratio=0.1, max_tokens=10):
+        if ratio < 0:
+            raise ValueError("ratio must not be negative")
+        if max_tokens < 1:
+            raise ValueError("max_tokens must be at least 1")
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = float(max_tokens)
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self):
+        """the number of retries left"""
+        return self._tokens
+
+    def on_success(self):
+        """Record a successful export."""
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_retry(self):
+        """Take a token for a retry.
+
+        :rtype: bool
+        :returns: Whether the retry is allowed.
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class SpillDirectory(object):
+    """Append-only segment files of batches that could not be exported.
+
+    Batches are pickled and appended to a segment file. Segments are closed
+    when they reach ``segment_bytes``, and the oldest closed segments are
+    deleted when the directory grows over ``max_bytes``. Several processes
+    may share the directory: each one writes its own segments, and
+    segments are claimed by renaming them before being replayed.
+
+    Batches are replayed at least once: a batch may be exported again if
+    the process stops while replaying its segment. The segments that
+    processes were writing or replaying when they stopped are closed and
+    replayed again by the next process opening the directory.
+
+    :type path: str
+    :param path: The directory to write segments to, created if needed.
+
+    :type max_bytes: int
+    :param max_bytes: The maximum total size of the segments.
+
+    :type segment_bytes: int
+    :param segment_bytes: The size at which segments are closed.
+    """
+
+    def __init__(self, path, max_bytes=_DEFAULT_SPILL_MAX_BYTES,
+                 segment_bytes=_DEFAULT_SEGMENT_BYTES):
+        if not 0 < segment_bytes <= max_bytes:
+            raise ValueError(
+                "segment_bytes must be positive and at most max_bytes")
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        self._lock = threading.Lock()
+        self._file = None
+        self._file_name = None
+        self._file_size = 0
+        self._pid = None
+        self._sequence = 0
+        self._recover()
+
+    def _segment_names(self, *suffixes):
+        return sorted(name for name in os.listdir(self.path)
+                      if name.endswith(suffixes))
+
+    def _recover(self):
+        """Close the segments left open or claimed by processes that
+        stopped, so that they are replayed."""
+        for name in self._segment_names(_OPEN_SUFFIX, _REPLAY_SUFFIX):
+            pid = _owner_pid(name)
+            if pid is not None and _pid_alive(pid):
+                continue
+            base = name.rsplit('.', 1)[0]
+            if name.endswith(_REPLAY_SUFFIX):
+                base = base.rsplit('.', 1)[0]
+            try:
+                os.rename(os.path.join(self.path, name),
+                          os.path.join(self.path, base + _SEGMENT_SUFFIX))
+            except OSError:  # pragma: NO COVER
+                # Recovered by another process
+                continue
+            logger.info('Recovered spill segment %s.', name)
+
+    def _new_segment_name(self):
+        # Names sort by creation time, then by process
+        self._sequence += 1
+        return '{:016d}-{}-{}'.format(
+            int(time.time() * 1e6), os.getpid(), self._sequence)
+
+    def _open_segment(self):
+        self._file_name = self._new_segment_name()
+        self._file = open(os.path.join(
+            self.path, self._file_name + _OPEN_SUFFIX), 'ab')
+        self._file_size = 0
+        self._pid = os.getpid()
+
+    def _close_segment(self):
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        path = os.path.join(self.path, self._file_name)
+        os.rename(path + _OPEN_SUFFIX, path + _SEGMENT_SUFFIX)
+
+    def _enforce_max_bytes(self):
+        names = self._segment_names(
+            _OPEN_SUFFIX, _SEGMENT_SUFFIX, _REPLAY_SUFFIX)
+        sizes = []
+        for name in names:
+            try:
+                sizes.append(os.path.getsize(os.path.join(self.path, name)))
+            except OSError:  # pragma: NO COVER
+                # Renamed or removed by another process
+                sizes.append(0)
+        total = sum(sizes)
+        # Only closed segments can be dropped
+        for name, size in zip(names, sizes):
+            if total <= self.max_bytes:
+                break
+            if not name.endswith(_SEGMENT_SUFFIX):
+                continue
+            try:
+                os.remove(os.path.join(self.path, name))
+            except OSError:  # pragma: NO COVER
+                continue
+            total -= size
+            logger.warning(
+                'Spill directory is full, dropped segment %s of %s bytes.',
+                name, size)
+
+    def append(self, datas):
+        """Append a batch to the current segment.
+
+        :type datas: list
+        :param datas: The spans or view data that could not be exported.
+        """
+        payload = pickle.dumps(datas, _PICKLE_PROTOCOL)
+        with self._lock:
+            if self._file is not None and self._pid != os.getpid():
+                # Leave the segment of the parent process to the parent
+                self._file.close()
+                self._file = None
+            if self._file is None:
+                self._open_segment()
+            self._file.write(_HEADER.pack(len(payload)) + payload)
+            self._file.flush()
+            self._file_size += _HEADER.size + len(payload)
+            if self._file_size >= self.segment_bytes:
+                self._close_segment()
+                self._file_size = 0
+            self._enforce_max_bytes()
+
+    def _read_segment(self, path):
+        """Read the batches of a segment, up to a truncated record."""
+        with open(path, 'rb') as segment:
+            data = segment.read()
+        batches = []
+        offset = 0
+        while offset + _HEADER.size <= len(data):
+            (size,) = _HEADER.unpack_from(data, offset)
+            offset += _HEADER.size
+            if offset + size > len(data):
+                logger.warning('Ignoring truncated batch in %s.', path)
+                break
+            try:
+                batches.append(pickle.loads(data[offset:offset + size]))
+            except Exception:
+                logger.exception('Ignoring batch that could not be read.')
+            offset += size
+        return batches
+
+    def _write_segment(self, path, batches):
+        with open(path, 'wb') as segment:
+            for datas in batches:
+                payload = pickle.dumps(datas, _PICKLE_PROTOCOL)
+                segment.write(_HEADER.pack(len(payload)) + payload)
+
+    def replay(self, emit, should_retry=_should_retry):
+        """Emit the batches of the closed segments, oldest first.
+
+        Batches failing with an error that should not be retried are
+        dropped. Replaying stops at the first batch failing with another
+        error: the batches left in its segment are moved to a new segment,
+        replayed after the other segments, so that a batch failing
+        repeatedly does not keep the next segments from being replayed.
+
+        :type emit: callable
+        :param emit: Function emitting a batch, raising if it fails.
+
+        :type should_retry: callable
+        :param should_retry: Whether to replay a batch again after the
+                             exception raised when emitting it.
+
+        :rtype: bool
+        :returns: True if all closed segments were replayed.
+        """
+        with self._lock:
+            if self._pid == os.getpid():
+                self._close_segment()
+                self._file_size = 0
+
+        for name in self._segment_names(_SEGMENT_SUFFIX):
+            path = os.path.join(self.path, name)
+            claimed = '{}.{}{}'.format(
+                path[:-len(_SEGMENT_SUFFIX)], os.getpid(), _REPLAY_SUFFIX)
+            try:
+                os.rename(path, claimed)
+            except OSError:
+                # Claimed by another process
+                continue
+
+            batches = self._read_segment(claimed)
+            for index, datas in enumerate(batches):
+                try:
+                    emit(datas)
+                except Exception as exc:
+                    if not should_retry(exc):
+                        logger.warning('Dropping spilled batch of %s objects '
+                                       'that cannot be exported: %s',
+                                       len(datas), exc)
+                        continue
+                    with self._lock:
+                        requeued = os.path.join(
+                            self.path, self._new_segment_name())
+                    logger.warning('Failed to replay spilled batches, %s '
+                                   'batches left in %s.',
+                                   len(batches) - index, requeued)
+                    self._write_segment(claimed, batches[index:])
+                    os.rename(claimed, requeued + _SEGMENT_SUFFIX)
+                    return False
+            os.remove(claimed)
+        return True
+
+
+class _RetryingEmitter(object):
+    """Emits batches with an exporter, retrying failures with exponential
+    backoff and spilling batches that still fail to disk.
+
+    Raises :class:`~opencensus.common.transports.async_.NotEmittedError`
+    for the batches it spilled or dropped, so that the worker counts them.
+    """
+
+    def __init__(self, exporter, max_attempts, initial_backoff, max_backoff,
+                 retry_budget, spill, should_retry):
+        self.exporter = exporter
+        self._max_attempts = max_attempts
+        self._initial_backoff = initial_backoff
+        self._max_backoff = max_backoff
+        self._retry_budget = retry_budget
+        self._spill = spill
+        self._should_retry = should_retry
+        # Replay the segments left by previous runs on the first success
+        self._next_replay = 0
+
+    def _backoff(self, attempt):
+        """Exponential backoff, with half of it randomized so that
+        processes do not retry in lockstep."""
+        delay = min(self._max_backoff,
+                    self._initial_backoff * 2 ** (attempt - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def emit(self, datas):
+        attempt = 1
+        while True:
+            try:
+                self.exporter.emit(datas)
+                break
+            except Exception as exc:
+                retryable = self._should_retry(exc)
+                if (attempt >= self._max_attempts or not retryable or
+                        not self._retry_budget.try_retry()):
+                    if self._spill is None:
+                        raise
+                    if not retryable:
+                        # Replaying the batch would fail again
+                        logger.warning(
+                            '%s failed to emit data, dropping %s objects '
+                            'that cannot be exported: %s',
+                            self.exporter.__class__.__name__, len(datas),
+                            exc)
+                        raise async_.NotEmittedError()
+                    logger.warning(
+                        '%s failed to emit data, spilling %s objects to '
+                        'disk: %s', self.exporter.__class__.__name__,
+                        len(datas), exc)
+                    self._spill.append(datas)
+                    self._next_replay = 0
+                    raise async_.NotEmittedError(spilled=True)
+            time.sleep(self._backoff(attempt))
+            attempt += 1
+
+        self._retry_budget.on_success()
+        if self._spill is not None and time.time() >= self._next_replay:
+            self._next_replay = time.time() + _REPLAY_INTERVAL
+            if not self._spill.replay(self.exporter.emit,
+                                      self._should_retry):
+                self._next_replay = 0
+
+
+class RetryingTransport(async_.AsyncTransport):
+    """Asynchronous transport retrying failed exports.
+
+    Batches are emitted from a background thread like with
+    :class:`~opencensus.common.transports.async_.AsyncTransport`. When the
+    exporter fails to emit a batch, it is retried up to ``max_attempts``
+    times with exponential backoff, as long as the retry budget allows it.
+    Batches that still fail are dropped, or spilled to ``spill_dir`` if
+    given and the error is worth retrying. Spilled batches are replayed
+    once the exporter succeeds again.
+
+    The exporter must raise when it fails to emit a batch. The
+    ``raise_on_error`` option of exporters logging errors by default, such
+    as :class:`~opencensus.trace.exporters.zipkin_exporter.ZipkinExporter`,
+    is turned on.
+
+    :type exporter: :class:`~opencensus.trace.exporters.base.Exporter` or
+                    :class:`~opencensus.stats.exporters.base.StatsExporter`
+    :param exporter: Instances of Exporter objects.
+
+    :type max_attempts: int
+    :param max_attempts: The maximum number of times to emit a batch.
+
+    :type initial_backoff: float
+    :param initial_backoff: The time to wait before the first retry, doubled
+                            before each next retry.
+
+    :type max_backoff: float
+    :param max_backoff: The maximum time to wait before a retry.
+
+    :type retry_budget: :class:`RetryBudget`
+    :param retry_budget: Limits the number of retries during outages.
+
+    :type spill_dir: str
+    :param spill_dir: The directory to spill failed batches to.
+
+    :type spill_max_bytes: int
+    :param spill_max_bytes: The maximum size of the spilled batches.
+
+    :type should_retry: callable
+    :param should_retry: Whether to retry after an exception raised by the
+                         exporter. By default, HTTP client errors other than
+                         408 and 429 are not retried.
+
+    :type kwargs: dict
+    :param kwargs: Options of
+                   :class:`~opencensus.common.transports.async_.AsyncTransport`.
+    """
+
+    def __init__(self, exporter, max_attempts=_DEFAULT_MAX_ATTEMPTS,
+                 initial_backoff=_DEFAULT_INITIAL_BACKOFF,
+                 max_backoff=_DEFAULT_MAX_BACKOFF, retry_budget=None,
+                 spill_dir=None, spill_max_bytes=_DEFAULT_SPILL_MAX_BYTES,
+                 should_retry=_should_retry, **kwargs):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if retry_budget is None:
+            retry_budget = RetryBudget()
+        spill = None
+        if spill_dir is not None:
+            spill = SpillDirectory(
+                spill_dir, spill_max_bytes,
+                min(_DEFAULT_SEGMENT_BYTES, spill_max_bytes))
+        self.emitter = _RetryingEmitter(
+            exporter, max_attempts, initial_backoff, max_backoff,
+            retry_budget, spill, should_retry)
+        if hasattr(exporter, 'raise_on_error'):
+            exporter.raise_on_error = True
+        super(RetryingTransport, self).__init__(self.emitter, **kwargs)
+        self.exporter = exporter
+        self.worker.exporter_name = exporter.__class__.__name__
@@ -0,0 +1,315 @@
+# Copyright 2019, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Transport handing data to a sidecar exporter process over a Unix domain
+socket, and the sidecar itself.
+
+Processes of a host use :class:`UnixSocketTransport` to send their batches to
+a single sidecar, which batches the data of every process and exports it with
+one exporter and one connection to the backend. Start the sidecar with::
+
+    python -m opencensus.common.transports.unix_socket \\
+        --exporter opencensus.trace.exporters.zipkin_exporter:ZipkinExporter
+
+Data is pickled, so the socket is only accessible to the user running the
+sidecar. By default, it is created in the runtime directory of the user,
+see :func:`default_socket_path`.
+"""
+
+import argparse
+import errno
+import importlib
+import logging
+import os
+import signal
+import socket
+import stat
+import struct
+import sys
+import tempfile
+import threading
+
+from six.moves import cPickle as pickle
+from six.moves import socketserver
+
+from opencensus.common.transports import async_
+
+logger = logging.getLogger(__name__)
+
+_SOCKET_NAME = 'opencensus-exporter.sock'
+
+_HEADER = struct.Struct('>I')
+_MAX_FRAME_SIZE = 64 * 1024 * 1024  # Bytes
+_PICKLE_PROTOCOL = 2
+
+
+def default_socket_path():
+    """The path of the socket of the sidecar of the current user.
+
+    The socket is created in ``$XDG_RUNTIME_DIR`` if set, or else in an
+    ``opencensus-<uid>`` directory of the temporary directory, only
+    accessible to the user. Other users cannot create a socket there to
+    receive the data of the processes of the user.
+
+    :rtype: str
+    :returns: The path of the socket.
+
+    :raises: :class:`ValueError` if the directory of the socket belongs to
+             another user or is accessible to other users.
+    """
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return os.path.join(runtime_dir, _SOCKET_NAME)
+
+    directory = os.path.join(
+        tempfile.gettempdir(), 'opencensus-{}'.format(os.getuid()))
+    try:
+        os.mkdir(directory, 0o700)
+    except OSError as exc:
+        if exc.errno != errno.EEXIST:
+            raise
+    dir_stat = os.lstat(directory)
+    if (not stat.S_ISDIR(dir_stat.st_mode) or
+            dir_stat.st_uid != os.getuid() or dir_stat.st_mode & 0o077):
+        raise ValueError(
+            "{} is not a private directory of the current user, pass the "
+            "path of the socket explicitly".format(directory))
+    return os.path.join(directory, _SOCKET_NAME)
+
+
+def _recv_exactly(sock, size):
+    """Read ``size`` bytes from a socket.
+
+    :rtype: bytes
+    :returns: The bytes read, or None if the connection was closed first.
+    """
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+class _SocketClient(object):
+    """Sends batches as length-prefixed pickles to the sidecar.
+
+    The connection is opened on the first batch, and reopened after errors
+    and in forked child processes, which must not write to the connection
+    of their parent.
+
+    :type path: str
+    :param path: The path of the socket of the sidecar.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._sock = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+        except Exception:
+            sock.close()
+            raise
+        self._sock = sock
+        self._pid = os.getpid()
+
+    def close(self):
+        """Close the connection to the sidecar."""
+        with self._lock:
+            self._close()
+
+    def _close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def emit(self, datas):
+        """Send a batch to the sidecar.
+
+        :type datas: list
+        :param datas: The spans or view data to export.
+        """
+        payload = pickle.dumps(datas, _PICKLE_PROTOCOL)
+        frame = _HEADER.pack(len(payload)) + payload
+        with self._lock:
+            if self._pid != os.getpid():
+                # Closing the copy of the connection of the parent does not
+                # close it in the parent
+                self._close()
+            # Retry once on a new connection, in case the sidecar restarted
+            for attempt in range(2):
+                if self._sock is None:
+                    self._connect()
+                try:
+                    self._sock.sendall(frame)
+                    return
+                except socket.error:
+                    self._close()
+                    if attempt:
+                        raise
+
+
+class UnixSocketTransport(async_.AsyncTransport):
+    """Asynchronous transport that sends batches to a sidecar process.
+
+    Batches are sent from a background thread like with
+    :class:`~opencensus.common.transports.async_.AsyncTransport`, to the
+    sidecar listening on ``path`` instead of to the backend. The exporter
+    is only used to name the gauges of the transport, the sidecar exports
+    the data with its own exporter.
+
+    :type exporter: :class:`~opencensus.trace.exporters.base.Exporter` or
+                    :class:`~opencensus.stats.exporters.base.StatsExporter`
+    :param exporter: Instances of Exporter objects.
+
+    :type path: str
+    :param path: The path of the socket of the sidecar. Defaults to
+                 :func:`default_socket_path`.
+
+    :type kwargs: dict
+    :param kwargs: Options of
+                   :class:`~opencensus.common.transports.async_.AsyncTransport`.
+    """
+
+    def __init__(self, exporter, path=None, **kwargs):
+        if path is None:
+            path = default_socket_path()
+        self.client = _SocketClient(path)
+        super(UnixSocketTransport, self).__init__(self.client, **kwargs)
+        self.exporter = exporter
+        self.worker.exporter_name = exporter.__class__.__name__
+
+
+class _FrameHandler(socketserver.BaseRequestHandler):
+    """Reads the batches sent by one process until it disconnects."""
+
+    def handle(self):
+        while True:
+            header = _recv_exactly(self.request, _HEADER.size)
+            if header is None:
+                return
+            (size,) = _HEADER.unpack(header)
+            if size > _MAX_FRAME_SIZE:
+                logger.error('Dropping connection sending a %s bytes batch.',
+                             size)
+                return
+            payload = _recv_exactly(self.request, size)
+            if payload is None:
+                return
+            try:
+                datas = pickle.loads(payload)
+            except Exception:
+                logger.exception('Dropping batch that could not be read.')
+                continue
+            self.server.transport.export(datas)
+
+
+class SidecarServer(socketserver.ThreadingMixIn,
+                    socketserver.UnixStreamServer):
+    """Receives the batches of local processes and exports them together.
+
+    :type exporter: :class:`~opencensus.trace.exporters.base.Exporter` or
+                    :class:`~opencensus.stats.exporters.base.StatsExporter`
+    :param exporter: The exporter emitting the data of every process.
+
+    :type path: str
+    :param path: The path to listen on, defaults to
+                 :func:`default_socket_path`. A stale socket of the current
+                 user left at this path is replaced.
+
+    :type transport: :class:`type`
+    :param transport: Class of the transport batching the data for the
+                      exporter. Defaults to
+                      :class:`~opencensus.common.transports.async_.AsyncTransport`.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, exporter, path=None,
+                 transport=async_.AsyncTransport):
+        if path is None:
+            path = default_socket_path()
+        self.exporter = exporter
+        self.transport = transport(exporter)
+        self._bound = False
+        try:
+            path_stat = os.lstat(path)
+        except OSError:
+            path_stat = None
+        # Binding fails if anything else is at the path
+        if (path_stat is not None and stat.S_ISSOCK(path_stat.st_mode) and
+                path_stat.st_uid == os.getuid()):
+            os.unlink(path)
+        socketserver.UnixStreamServer.__init__(self, path, _FrameHandler)
+
+    def server_bind(self):
+        # Only the user running the sidecar may connect, as data is pickled
+        umask = os.umask(0o177)
+        try:
+            socketserver.UnixStreamServer.server_bind(self)
+        finally:
+            os.umask(umask)
+        self._bound = True
+
+    def server_close(self):
+        socketserver.UnixStreamServer.server_close(self)
+        # Also called when binding failed, leave the path as it was then
+        if self._bound and os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        self.transport.flush()
+
+
+def _load_exporter(spec):
+    """Create an exporter from a ``module:callable`` string."""
+    module_name, _, name = spec.partition(':')
+    if not name:
+        raise ValueError("exporter must be given as module:callable")
+    return getattr(importlib.import_module(module_name), name)()
+
+
+def main(argv=None):
+    """Run the sidecar until interrupted."""
+    parser = argparse.ArgumentParser(
+        description='Export the data sent by the local processes using '
+                    'UnixSocketTransport.')
+    parser.add_argument(
+        '--exporter', required=True,
+        help='Callable creating the exporter, as module:callable.')
+    parser.add_argument(
+        '--path',
+        help='Path of the socket to listen on, in the runtime directory of '
+             'the user by default.')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig()
+    server = SidecarServer(_load_exporter(args.exporter), args.path)
+    # Export pending data when the service manager stops the sidecar
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':  # pragma: NO COVER
+    main()
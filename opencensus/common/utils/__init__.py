@@ -80,6 +80,17 @@ def timestamp_to_microseconds(timestamp):
     return epoch_time_mus
 
 
+def to_iso_str(timestamp):
+    """Convert a timestamp in seconds since the epoch into an ISO 8601
+    string, as recorded by the stats API. Strings are returned as is.
+    :param timestamp
+    :return timestamp string
+    """
+    if isinstance(timestamp, (int, float)):
+        return datetime.datetime.utcfromtimestamp(timestamp).isoformat() + 'Z'
+    return timestamp
+
+
 def iuniq(ible):
     """Get an iterator over unique items of `ible`."""
     items = set()
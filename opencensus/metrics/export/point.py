@@ -25,6 +25,7 @@ class Point(object):
     :type timestamp: time
     :param timestamp: the timestamp when the `Point` was recorded.
     """
+    __slots__ = ('_value', '_timestamp')
 
     def __init__(self, value, timestamp):
         self._value = value
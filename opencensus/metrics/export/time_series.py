@@ -36,6 +36,7 @@ class TimeSeries(object):
     :param start_timestamp: The time when the cumulative value was reset to
     zero, must be set for cumulative metrics.
     """  # noqa
+    __slots__ = ('_label_values', '_points', '_start_timestamp')
 
     def __init__(self, label_values, points, start_timestamp):
         if not label_values:
@@ -27,6 +27,7 @@ class ValueDouble(object):
     :type value: float
     :param value: the value in float.
     """
+    __slots__ = ('_value',)
 
     def __init__(self, value):
         self._value = value
@@ -49,6 +50,7 @@ class ValueLong(object):
     :type value: long
     :param value: the value in long.
     """
+    __slots__ = ('_value',)
 
     def __init__(self, value):
         self._value = value
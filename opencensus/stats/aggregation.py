@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 import logging
 
 from opencensus.stats import bucket_boundaries
@@ -30,12 +31,14 @@ class Type(object):
       COUNT (int): The aggregation type of the view is 'count'.
       DISTRIBUTION (int): The aggregation type of the view is 'distribution'.
       LASTVALUE (int): The aggregation type of the view is 'lastvalue'.
+      QUANTILE (int): The aggregation type of the view is 'quantile'.
     """
     NONE = 0
     SUM = 1
     COUNT = 2
     DISTRIBUTION = 3
     LASTVALUE = 4
+    QUANTILE = 5
 
 
 class BaseAggregation(object):
@@ -65,6 +68,18 @@ class BaseAggregation(object):
         """The buckets of the current aggregation"""
         return self._buckets
 
+    def new_aggregation_data(self):
+        """Create the aggregation data for a new time series.
+
+        Subclasses should override this with a cheaper way to build their
+        initial aggregation data than copying it.
+
+        :rtype: :class:
+            `~opencensus.stats.aggregation_data.BaseAggregationData`
+        :return: A new aggregation data in its initial state.
+        """
+        return copy.deepcopy(self.aggregation_data)
+
 
 class SumAggregation(BaseAggregation):
     """Sum Aggregation escribes that data collected and aggregated with this
@@ -80,8 +95,9 @@ class SumAggregation(BaseAggregation):
     """
     def __init__(self, sum=None, aggregation_type=Type.SUM):
         super(SumAggregation, self).__init__(aggregation_type=aggregation_type)
+        self._initial_sum = float(sum or 0)
         self._sum = aggregation_data.SumAggregationDataFloat(
-            sum_data=float(sum or 0))
+            sum_data=self._initial_sum)
         self.aggregation_data = self._sum
 
     @property
@@ -89,6 +105,11 @@ class SumAggregation(BaseAggregation):
         """The sum of the current aggregation"""
         return self._sum
 
+    def new_aggregation_data(self):
+        """Create the aggregation data for a new time series"""
+        return aggregation_data.SumAggregationDataFloat(
+            sum_data=self._initial_sum)
+
 
 class CountAggregation(BaseAggregation):
     """Describes that the data collected and aggregated with this method will
@@ -104,6 +125,7 @@ class CountAggregation(BaseAggregation):
     def __init__(self, count=0, aggregation_type=Type.COUNT):
         super(CountAggregation, self).__init__(
             aggregation_type=aggregation_type)
+        self._initial_count = count
         self._count = aggregation_data.CountAggregationData(count)
         self.aggregation_data = self._count
 
@@ -112,6 +134,10 @@ class CountAggregation(BaseAggregation):
         """The count of the current aggregation"""
         return self._count
 
+    def new_aggregation_data(self):
+        """Create the aggregation data for a new time series"""
+        return aggregation_data.CountAggregationData(self._initial_count)
+
 
 class DistributionAggregation(BaseAggregation):
     """Distribution Aggregation indicates that the desired aggregation is a
@@ -127,12 +153,19 @@ class DistributionAggregation(BaseAggregation):
     :type aggregation_type: :class:`~opencensus.stats.aggregation.Type`
     :param aggregation_type: represents the type of this aggregation
 
+    :type exemplar_sampler: :class:
+        `~opencensus.stats.exemplar_sampler.ExemplarSampler`
+    :param exemplar_sampler: decides which values recorded with attachments
+                             become the exemplars of their bucket. By
+                             default, the last one does.
+
     """
 
     def __init__(self,
                  boundaries=None,
                  distribution=None,
-                 aggregation_type=Type.DISTRIBUTION):
+                 aggregation_type=Type.DISTRIBUTION,
+                 exemplar_sampler=None):
         if boundaries:
             if not all(boundaries[ii] < boundaries[ii + 1]
                        for ii in range(len(boundaries) - 1)):
@@ -151,8 +184,8 @@ class DistributionAggregation(BaseAggregation):
             buckets=boundaries, aggregation_type=aggregation_type)
         self._boundaries = bucket_boundaries.BucketBoundaries(boundaries)
         self._distribution = distribution or {}
-        self.aggregation_data = aggregation_data.DistributionAggregationData(
-            0, 0, 0, None, boundaries)
+        self._exemplar_sampler = exemplar_sampler
+        self.aggregation_data = self.new_aggregation_data()
 
     @property
     def boundaries(self):
@@ -164,6 +197,67 @@ class DistributionAggregation(BaseAggregation):
         """The distribution of the current aggregation"""
         return self._distribution
 
+    @property
+    def exemplar_sampler(self):
+        """The sampler of the exemplars of the current aggregation"""
+        return self._exemplar_sampler
+
+    def new_aggregation_data(self):
+        """Create the aggregation data for a new time series
+
+        The new aggregation data shares the validated boundaries of this
+        aggregation.
+        """
+        if not self._boundaries.boundaries:
+            return aggregation_data.DistributionAggregationData(0, 0, 0)
+        return aggregation_data.DistributionAggregationData(
+            0, 0, 0, None, self._boundaries,
+            exemplar_sampler=self._exemplar_sampler)
+
+
+class ExponentialDistributionAggregation(DistributionAggregation):
+    """Exponential Distribution Aggregation is a histogram distribution whose
+    buckets grow exponentially and adapt to the range of the recorded values
+
+    :type max_size: int
+    :param max_size: the maximum number of buckets of each time series, at
+                     least 2
+
+    :type max_scale: int
+    :param max_scale: the initial and highest scale of the buckets, the
+                      relative width of the buckets is 2 ** (2 ** -scale) - 1
+
+    :type aggregation_type: :class:`~opencensus.stats.aggregation.Type`
+    :param aggregation_type: represents the type of this aggregation
+
+    """
+
+    def __init__(self,
+                 max_size=160,
+                 max_scale=20,
+                 aggregation_type=Type.DISTRIBUTION):
+        if max_size < 2:
+            raise ValueError("max_size must be at least 2")
+        self._max_size = max_size
+        self._max_scale = max_scale
+        super(ExponentialDistributionAggregation, self).__init__(
+            aggregation_type=aggregation_type)
+
+    @property
+    def max_size(self):
+        """The maximum number of buckets of each time series"""
+        return self._max_size
+
+    @property
+    def max_scale(self):
+        """The initial and highest scale of the buckets"""
+        return self._max_scale
+
+    def new_aggregation_data(self):
+        """Create the aggregation data for a new time series"""
+        return aggregation_data.ExponentialDistributionAggregationData(
+            self._max_size, self._max_scale)
+
 
 class LastValueAggregation(BaseAggregation):
     """Describes that the data collected with this method will
@@ -188,3 +282,71 @@ class LastValueAggregation(BaseAggregation):
         """The current recorded value
         """
         return self._value
+
+    def new_aggregation_data(self):
+        """Create the aggregation data for a new time series"""
+        return aggregation_data.LastValueAggregationData(value=self._value)
+
+
+class QuantileAggregation(BaseAggregation):
+    """Quantile Aggregation estimates the values at given percentiles with a
+    mergeable sketch, without predefined bucket boundaries
+
+    :type percentiles: list(float)
+    :param percentiles: the percentiles to report, in strictly increasing
+                        order and in (0, 100]
+
+    :type relative_accuracy: float
+    :param relative_accuracy: the relative accuracy of the estimated values,
+                              in (0, 1)
+
+    :type max_bins: int
+    :param max_bins: the maximum number of bins of the sketch of each time
+                     series, which bounds its memory
+
+    :type aggregation_type: :class:`~opencensus.stats.aggregation.Type`
+    :param aggregation_type: represents the type of this aggregation
+
+    """
+    def __init__(self,
+                 percentiles=(50, 90, 99, 99.9),
+                 relative_accuracy=0.01,
+                 max_bins=2048,
+                 aggregation_type=Type.QUANTILE):
+        percentiles = list(percentiles)
+        if not all(0 < pp <= 100 for pp in percentiles):
+            raise ValueError("percentiles must be in (0, 100]")
+        if not all(percentiles[ii] < percentiles[ii + 1]
+                   for ii in range(len(percentiles) - 1)):
+            raise ValueError("percentiles must be sorted in increasing order")
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        if max_bins < 1:
+            raise ValueError("max_bins must be positive")
+
+        super(QuantileAggregation, self).__init__(
+            aggregation_type=aggregation_type)
+        self._percentiles = percentiles
+        self._relative_accuracy = relative_accuracy
+        self._max_bins = max_bins
+        self.aggregation_data = self.new_aggregation_data()
+
+    @property
+    def percentiles(self):
+        """The percentiles reported by the aggregation"""
+        return self._percentiles
+
+    @property
+    def relative_accuracy(self):
+        """The relative accuracy of the estimated values"""
+        return self._relative_accuracy
+
+    @property
+    def max_bins(self):
+        """The maximum number of bins of the sketch of each time series"""
+        return self._max_bins
+
+    def new_aggregation_data(self):
+        """Create the aggregation data for a new time series"""
+        return aggregation_data.QuantileAggregationData(
+            self._relative_accuracy, self._max_bins, self._percentiles)
@@ -12,10 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import bisect
 import copy
 import logging
+import math
 
+from opencensus.common import utils
 from opencensus.metrics.export import point
+from opencensus.metrics.export import summary
 from opencensus.metrics.export import value
 from opencensus.stats import bucket_boundaries
 
@@ -30,6 +34,7 @@ class BaseAggregationData(object):
     :param aggregation_data: represents the aggregated value from a collection
 
     """
+    __slots__ = ('_aggregation_data',)
 
     def __init__(self, aggregation_data):
         self._aggregation_data = aggregation_data
@@ -39,6 +44,17 @@ class BaseAggregationData(object):
         """The current aggregation data"""
         return self._aggregation_data
 
+    def __deepcopy__(self, memo):
+        cls = type(self)
+        result = cls.__new__(cls)
+        memo[id(self)] = result
+        for klass in cls.__mro__:
+            for name in getattr(klass, '__slots__', ()):
+                setattr(result, name, copy.deepcopy(getattr(self, name), memo))
+        if hasattr(self, '__dict__'):
+            result.__dict__.update(copy.deepcopy(self.__dict__, memo))
+        return result
+
     def to_point(self, timestamp):
         """Get a Point conversion of this aggregation.
 
@@ -51,6 +67,30 @@ class BaseAggregationData(object):
         """
         raise NotImplementedError  # pragma: NO COVER
 
+    def add_samples(self, values, timestamp=None, attachments=None):
+        """Add a batch of samples recorded at the same time.
+
+        :type values: list
+        :param values: The values of the samples.
+
+        :type timestamp: float
+        :param timestamp: The time the samples were recorded, in seconds
+                          since the epoch.
+
+        :type attachments: dict
+        :param attachments: The contextual information of the samples.
+        """
+        for value_ in values:
+            self.add_sample(value_, timestamp, attachments)
+
+    def merge(self, other):
+        """Merge the data aggregated by another aggregation data into this one.
+
+        :type other: :class: `BaseAggregationData`
+        :param other: An aggregation data of the same type as this one.
+        """
+        raise NotImplementedError  # pragma: NO COVER
+
 
 class SumAggregationDataFloat(BaseAggregationData):
     """Sum Aggregation Data is the aggregated data for the Sum aggregation
@@ -59,6 +99,7 @@ class SumAggregationDataFloat(BaseAggregationData):
     :param sum_data: represents the aggregated sum
 
     """
+    __slots__ = ('_sum_data',)
 
     def __init__(self, sum_data):
         super(SumAggregationDataFloat, self).__init__(sum_data)
@@ -77,6 +118,14 @@ class SumAggregationDataFloat(BaseAggregationData):
         """
         self._sum_data += value
 
+    def add_samples(self, values, timestamp=None, attachments=None):
+        """Add the sum of a batch of samples to the current sum data"""
+        self._sum_data += sum(values)
+
+    def merge(self, other):
+        """Add the sum of another Sum Aggregation Data to this one"""
+        self._sum_data += other.sum_data
+
     @property
     def sum_data(self):
         """The current sum data"""
@@ -102,6 +151,7 @@ class CountAggregationData(BaseAggregationData):
     :param count_data: represents the aggregated count
 
     """
+    __slots__ = ('_count_data',)
 
     def __init__(self, count_data):
         super(CountAggregationData, self).__init__(count_data)
@@ -119,6 +169,14 @@ class CountAggregationData(BaseAggregationData):
         the count data"""
         self._count_data = self._count_data + 1
 
+    def add_samples(self, values, timestamp=None, attachments=None):
+        """Adds the number of samples in a batch to the count data"""
+        self._count_data += len(values)
+
+    def merge(self, other):
+        """Add the count of another Count Aggregation Data to this one"""
+        self._count_data += other.count_data
+
     @property
     def count_data(self):
         """The current count data"""
@@ -156,10 +214,28 @@ class DistributionAggregationData(BaseAggregationData):
     :type exemplars: list(Exemplar)
     :param: exemplars: the exemplars associated with histogram buckets.
 
-    :type bounds: list(float)
-    :param bounds: the histogram distribution of the values
+    :type bounds: list(float) or :class:
+        `~opencensus.stats.bucket_boundaries.BucketBoundaries`
+    :param bounds: the histogram distribution of the values. Validated bucket
+                   boundaries are shared as is instead of being checked and
+                   copied.
+
+    :type min_: float
+    :param min_: the smallest value of the distribution, or None
+
+    :type max_: float
+    :param max_: the largest value of the distribution, or None
+
+    :type exemplar_sampler: :class:
+        `~opencensus.stats.exemplar_sampler.ExemplarSampler`
+    :param exemplar_sampler: decides which values recorded with attachments
+                             become the exemplars of their bucket. By
+                             default, the last one does.
 
     """
+    __slots__ = ('_mean_data', '_count_data', '_sum_of_sqd_deviations',
+                 '_counts_per_bucket', '_exemplars', '_bounds', '_min',
+                 '_max', '_exemplar_sampler')
 
     def __init__(self,
                  mean_data,
@@ -167,7 +243,10 @@ class DistributionAggregationData(BaseAggregationData):
                  sum_of_sqd_deviations,
                  counts_per_bucket=None,
                  bounds=None,
-                 exemplars=None):
+                 exemplars=None,
+                 min_=None,
+                 max_=None,
+                 exemplar_sampler=None):
         if bounds is None and exemplars is not None:
             raise ValueError
         if exemplars is not None and len(exemplars) != len(bounds) + 1:
@@ -177,22 +256,31 @@ class DistributionAggregationData(BaseAggregationData):
         self._mean_data = mean_data
         self._count_data = count_data
         self._sum_of_sqd_deviations = sum_of_sqd_deviations
+        self._min = min_
+        self._max = max_
+        self._exemplar_sampler = exemplar_sampler
+
+        if isinstance(bounds, bucket_boundaries.BucketBoundaries):
+            bounds = bounds.boundaries
+        elif bounds is not None:
+            assert bounds == list(sorted(set(bounds)))
+            assert all(bb > 0 for bb in bounds)
+            bounds = (bucket_boundaries.BucketBoundaries(boundaries=bounds)
+                      .boundaries)
 
         if bounds is None:
             bounds = []
             self._exemplars = None
+        elif exemplars is None:
+            # Allocated when first recorded or read, most distributions
+            # never record exemplars
+            self._exemplars = ()
         else:
-            assert bounds == list(sorted(set(bounds)))
-            assert all(bb > 0 for bb in bounds)
-            if exemplars is None:
-                self._exemplars = {ii: None for ii in range(len(bounds) + 1)}
-            else:
-                self._exemplars = {ii: ex for ii, ex in enumerate(exemplars)}
-        self._bounds = (bucket_boundaries.BucketBoundaries(boundaries=bounds)
-                        .boundaries)
+            self._exemplars = {ii: ex for ii, ex in enumerate(exemplars)}
+        self._bounds = bounds
 
         if counts_per_bucket is None:
-            counts_per_bucket = [0 for ii in range(len(bounds) + 1)]
+            counts_per_bucket = [0] * (len(bounds) + 1)
         else:
             assert all(cc >= 0 for cc in counts_per_bucket)
             assert len(counts_per_bucket) == len(bounds) + 1
@@ -205,6 +293,13 @@ class DistributionAggregationData(BaseAggregationData):
                     self.count_data,
                 ))
 
+    def __deepcopy__(self, memo):
+        # The bounds and the exemplar sampler are shared by all the time
+        # series of the aggregation, and so by their copies
+        memo[id(self._bounds)] = self._bounds
+        memo[id(self._exemplar_sampler)] = self._exemplar_sampler
+        return super(DistributionAggregationData, self).__deepcopy__(memo)
+
     @property
     def mean_data(self):
         """The current mean data"""
@@ -227,14 +322,28 @@ class DistributionAggregationData(BaseAggregationData):
 
     @property
     def exemplars(self):
-        """The current counts per bucket for the distribution"""
-        return self._exemplars
+        """The current exemplars of the buckets of the distribution"""
+        exemplars = self._exemplars
+        if exemplars is not None and not exemplars:
+            exemplars = self._exemplars = dict.fromkeys(
+                range(len(self._bounds) + 1))
+        return exemplars
 
     @property
     def bounds(self):
         """The current bounds for the distribution"""
         return self._bounds
 
+    @property
+    def min(self):
+        """The smallest value of the current distribution, or None"""
+        return self._min
+
+    @property
+    def max(self):
+        """The largest value of the current distribution, or None"""
+        return self._max
+
     @property
     def sum(self):
         """The sum of the current distribution"""
@@ -251,9 +360,18 @@ class DistributionAggregationData(BaseAggregationData):
         """Adding a sample to Distribution Aggregation Data"""
         self._count_data += 1
         bucket = self.increment_bucket_count(value)
+        if self._min is None or value < self._min:
+            self._min = value
+        if self._max is None or value > self._max:
+            self._max = value
 
         if attachments is not None and self.exemplars is not None:
-            self.exemplars[bucket] = Exemplar(value, timestamp, attachments)
+            sampler = self._exemplar_sampler
+            if sampler is None or sampler.should_sample(
+                    self._counts_per_bucket[bucket],
+                    self._exemplars[bucket], timestamp):
+                self._exemplars[bucket] = Exemplar(
+                    value, timestamp, attachments)
         if self.count_data == 1:
             self._mean_data = value
             return
@@ -264,20 +382,94 @@ class DistributionAggregationData(BaseAggregationData):
         self._sum_of_sqd_deviations = self._sum_of_sqd_deviations + (
             (value - old_mean) * (value - self._mean_data))
 
+    def add_samples(self, values, timestamp=None, attachments=None):
+        """Add a batch of samples to Distribution Aggregation Data
+
+        The moments of the batch are computed in two passes and combined
+        with the current ones, and the bucket counts are computed from the
+        sorted batch. Samples with attachments are added one by one to keep
+        their exemplars.
+        """
+        if attachments is not None and self.exemplars is not None:
+            super(DistributionAggregationData, self).add_samples(
+                values, timestamp, attachments)
+            return
+        count = len(values)
+        if count == 0:
+            return
+
+        mean = sum(values) / float(count)
+        self._merge_moments(
+            count, mean, sum((vv - mean) * (vv - mean) for vv in values))
+        self._merge_min_max(min(values), max(values))
+        self.increment_bucket_counts(values)
+
+    def _merge_moments(self, count, mean, sum_of_sqd_deviations):
+        """Combine the count, mean and sum of squared deviations of other
+        samples with the current ones, with the parallel algorithm of Chan et
+        al."""
+        total = float(self._count_data + count)
+        delta = mean - self._mean_data
+        self._sum_of_sqd_deviations = (
+            self._sum_of_sqd_deviations + sum_of_sqd_deviations +
+            delta * delta * self._count_data * count / total)
+        self._mean_data = self._mean_data + delta * count / total
+        self._count_data += count
+
+    def _merge_min_max(self, min_, max_):
+        """Combine the smallest and largest values of other samples with the
+        current ones"""
+        if self._min is None or min_ < self._min:
+            self._min = min_
+        if self._max is None or max_ > self._max:
+            self._max = max_
+
+    def merge(self, other):
+        """Merge another Distribution Aggregation Data into this one
+
+        The mean and sum of squared deviations are combined with the
+        parallel algorithm of Chan et al. Exemplars of the other distribution
+        replace the ones of this distribution for the same bucket.
+        """
+        if other.bounds != self._bounds:
+            raise ValueError("cannot merge distributions with different "
+                             "bounds")
+        if other.count_data == 0:
+            return
+
+        self._merge_moments(other.count_data, other.mean_data,
+                            other.sum_of_sqd_deviations)
+        if other.min is not None:
+            self._merge_min_max(other.min, other.max)
+
+        for ii, bucket_count in enumerate(other.counts_per_bucket):
+            self._counts_per_bucket[ii] += bucket_count
+
+        if self._exemplars is not None and other._exemplars:
+            for ii, exemplar in other._exemplars.items():
+                if exemplar is not None:
+                    self.exemplars[ii] = exemplar
+
     def increment_bucket_count(self, value):
         """Increment the bucket count based on a given value from the user"""
-        if len(self._bounds) == 0:
-            self._counts_per_bucket[0] += 1
-            return 0
-
-        for ii, bb in enumerate(self._bounds):
-            if value < bb:
-                self._counts_per_bucket[ii] += 1
-                return ii
-        else:
-            last_bucket_index = len(self._bounds)
-            self._counts_per_bucket[last_bucket_index] += 1
-            return last_bucket_index
+        # Bucket ii holds the values in [bounds[ii - 1], bounds[ii]).
+        bucket = bisect.bisect_right(self._bounds, value)
+        self._counts_per_bucket[bucket] += 1
+        return bucket
+
+    def increment_bucket_counts(self, values):
+        """Increment the bucket counts based on a batch of values"""
+        if not self._bounds:
+            self._counts_per_bucket[0] += len(values)
+            return
+        # Bucket ii holds the values in [bounds[ii - 1], bounds[ii]).
+        sorted_values = sorted(values)
+        lower = 0
+        for ii, bound in enumerate(self._bounds):
+            upper = bisect.bisect_left(sorted_values, bound, lower)
+            self._counts_per_bucket[ii] += upper - lower
+            lower = upper
+        self._counts_per_bucket[-1] += len(values) - lower
 
     def to_point(self, timestamp):
         """Get a Point conversion of this aggregation.
@@ -300,11 +492,12 @@ class DistributionAggregationData(BaseAggregationData):
             bucket_options = value.BucketOptions(value.Explicit(self.bounds))
             buckets = [None] * len(self.counts_per_bucket)
             for ii, count in enumerate(self.counts_per_bucket):
-                stat_ex = self.exemplars.get(ii) if self.exemplars else None
+                stat_ex = (self._exemplars.get(ii) if self._exemplars
+                           else None)
                 if stat_ex is not None:
-                    metric_ex = value.Exemplar(stat_ex.value,
-                                               stat_ex.timestamp,
-                                               copy.copy(stat_ex.attachments))
+                    metric_ex = value.Exemplar(
+                        stat_ex.value, utils.to_iso_str(stat_ex.timestamp),
+                        copy.copy(stat_ex.attachments))
                     buckets[ii] = value.Bucket(count, metric_ex)
                 else:
                     buckets[ii] = value.Bucket(count)
@@ -324,6 +517,176 @@ class DistributionAggregationData(BaseAggregationData):
         )
 
 
+class ExponentialDistributionAggregationData(DistributionAggregationData):
+    """Exponential Distribution Aggregation Data is a distribution whose
+    buckets grow exponentially
+
+    At scale `s`, the bucket of index `i` holds the values in
+    [base ** i, base ** (i + 1)) with base = 2 ** (2 ** -s), so every bucket
+    has the same relative width. Values that are not positive are counted
+    in a zero bucket. The distribution starts at `max_scale` and halves its
+    resolution by merging adjacent buckets whenever the recorded values
+    span more than `max_size` buckets.
+
+    The buckets are exported as explicit bounds covering the recorded
+    values, the first bucket holding the values that are not positive.
+    Exemplars are not recorded.
+
+    :type max_size: int
+    :param max_size: the maximum number of buckets, at least 2
+
+    :type max_scale: int
+    :param max_scale: the initial and highest scale of the buckets
+
+    """
+    __slots__ = ('_max_size', '_scale', '_counts', '_zero_count',
+                 '_lowest_index', '_highest_index')
+
+    def __init__(self, max_size, max_scale):
+        super(ExponentialDistributionAggregationData, self).__init__(0, 0, 0)
+        self._max_size = max_size
+        self._scale = max_scale
+        self._counts = {}
+        self._zero_count = 0
+        self._lowest_index = None
+        self._highest_index = None
+
+    @property
+    def max_size(self):
+        """The maximum number of buckets"""
+        return self._max_size
+
+    @property
+    def scale(self):
+        """The current scale of the buckets"""
+        return self._scale
+
+    @property
+    def zero_count(self):
+        """The number of values that are not positive"""
+        return self._zero_count
+
+    @property
+    def bounds(self):
+        """The explicit bounds of the buckets covering the recorded values"""
+        if not self._counts:
+            return []
+        return [self._lower_bound(ii) for ii in
+                range(self._lowest_index, self._highest_index + 2)]
+
+    @property
+    def counts_per_bucket(self):
+        """The counts of the buckets delimited by `bounds`"""
+        if not self._counts:
+            return [self._zero_count]
+        counts = [self._counts.get(ii, 0) for ii in
+                  range(self._lowest_index, self._highest_index + 1)]
+        return [self._zero_count] + counts + [0]
+
+    def _lower_bound(self, index):
+        """The lowest value of the bucket of the given index"""
+        if self._scale <= 0:
+            return math.ldexp(1.0, index << -self._scale)
+        return math.pow(2.0, index / float(1 << self._scale))
+
+    def _get_index(self, value):
+        """The index of the bucket of a positive value"""
+        mantissa, exponent = math.frexp(value)
+        if self._scale <= 0:
+            return (exponent - 1) >> -self._scale
+        if mantissa == 0.5:
+            # Powers of two are exact bucket boundaries
+            return (exponent - 1) << self._scale
+        return int(math.floor(
+            math.log(value) * (1 << self._scale) / math.log(2)))
+
+    def _downscale(self, change):
+        """Lower the scale by merging groups of 2 ** change buckets"""
+        counts = {}
+        for index, count in self._counts.items():
+            index >>= change
+            counts[index] = counts.get(index, 0) + count
+        self._counts = counts
+        self._scale -= change
+
+    def _fit(self, lowest_index, highest_index):
+        """Lower the scale until the buckets between the given indexes fit
+        in `max_size` buckets, and make them the recorded range
+
+        :rtype: int
+        :returns: the number of times the scale was lowered
+        """
+        change = 0
+        while ((highest_index >> change) - (lowest_index >> change) >=
+               self._max_size):
+            change += 1
+        if change:
+            self._downscale(change)
+        self._lowest_index = lowest_index >> change
+        self._highest_index = highest_index >> change
+        return change
+
+    def increment_bucket_count(self, value):
+        """Increment the bucket count based on a given value from the user"""
+        if value <= 0:
+            self._zero_count += 1
+            return None
+        index = self._get_index(value)
+        counts = self._counts
+        if index in counts:
+            counts[index] += 1
+            return None
+        if counts:
+            index >>= self._fit(min(index, self._lowest_index),
+                                max(index, self._highest_index))
+        else:
+            self._lowest_index = self._highest_index = index
+        self._counts[index] = self._counts.get(index, 0) + 1
+        return None
+
+    def increment_bucket_counts(self, values):
+        """Increment the bucket counts based on a batch of values"""
+        for sample in values:
+            self.increment_bucket_count(sample)
+
+    def merge(self, other):
+        """Merge another Exponential Distribution Aggregation Data into this
+        one
+
+        The distribution with the highest scale is downscaled to the scale of
+        the other one before adding the counts of their buckets.
+        """
+        if not isinstance(other, ExponentialDistributionAggregationData):
+            raise ValueError("cannot merge an explicit distribution into an "
+                             "exponential one")
+        if other.count_data == 0:
+            return
+
+        self._merge_moments(other.count_data, other.mean_data,
+                            other.sum_of_sqd_deviations)
+        self._merge_min_max(other.min, other.max)
+        self._zero_count += other.zero_count
+        if not other._counts:
+            return
+
+        if self._scale > other.scale:
+            change = self._scale - other.scale
+            self._downscale(change)
+            if self._counts:
+                self._lowest_index >>= change
+                self._highest_index >>= change
+        change = other.scale - self._scale
+        lowest_index = other._lowest_index >> change
+        highest_index = other._highest_index >> change
+        if self._counts:
+            lowest_index = min(lowest_index, self._lowest_index)
+            highest_index = max(highest_index, self._highest_index)
+        change += self._fit(lowest_index, highest_index)
+        for index, count in other._counts.items():
+            index >>= change
+            self._counts[index] = self._counts.get(index, 0) + count
+
+
 class LastValueAggregationData(BaseAggregationData):
     """
     LastValue Aggregation Data is the value of aggregated data
@@ -332,10 +695,12 @@ class LastValueAggregationData(BaseAggregationData):
     :param value: represents the current value
 
     """
+    __slots__ = ('_value', '_timestamp')
 
     def __init__(self, value):
         super(LastValueAggregationData, self).__init__(value)
         self._value = value
+        self._timestamp = None
 
     def __repr__(self):
         return ("{}({})"
@@ -349,12 +714,33 @@ class LastValueAggregationData(BaseAggregationData):
         LastValue Aggregation Data and overwrite
         the current recorded value"""
         self._value = value
+        self._timestamp = timestamp
+
+    def add_samples(self, values, timestamp=None, attachments=None):
+        """Overwrite the current recorded value with the last value of a
+        batch of samples"""
+        if values:
+            self.add_sample(values[-1], timestamp, attachments)
+
+    def merge(self, other):
+        """Keep the value of another LastValue Aggregation Data if it was
+        recorded later than the value of this one"""
+        if other.timestamp is None:
+            return
+        if self._timestamp is None or other.timestamp >= self._timestamp:
+            self._value = other.value
+            self._timestamp = other.timestamp
 
     @property
     def value(self):
         """The current value recorded"""
         return self._value
 
+    @property
+    def timestamp(self):
+        """The time the current value was recorded"""
+        return self._timestamp
+
     def to_point(self, timestamp):
         """Get a Point conversion of this aggregation.
 
@@ -368,6 +754,175 @@ class LastValueAggregationData(BaseAggregationData):
         return point.Point(value.ValueDouble(self.value), timestamp)
 
 
+class QuantileAggregationData(BaseAggregationData):
+    """Quantile Aggregation Data is a DDSketch of the aggregated values
+
+    The positive values are counted in logarithmically sized bins, so any
+    quantile is estimated within `relative_accuracy` of its exact value.
+    Values that are not positive are all counted as zero. When
+    there are more than `max_bins` bins, the lowest ones are collapsed, which
+    only degrades the accuracy of the lowest quantiles.
+
+    :type relative_accuracy: float
+    :param relative_accuracy: the relative accuracy of the quantiles
+
+    :type max_bins: int
+    :param max_bins: the maximum number of bins
+
+    :type percentiles: list(float)
+    :param percentiles: the percentiles reported when converted to a point,
+                        in increasing order
+
+    """
+    __slots__ = ('_relative_accuracy', '_gamma', '_log_gamma', '_max_bins',
+                 '_percentiles', '_bins', '_zero_count', '_count_data',
+                 '_sum_data', '_min', '_max')
+
+    def __init__(self, relative_accuracy, max_bins, percentiles):
+        super(QuantileAggregationData, self).__init__(None)
+        self._relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._max_bins = max_bins
+        self._percentiles = percentiles
+        self._bins = {}
+        self._zero_count = 0
+        self._count_data = 0
+        self._sum_data = 0
+        self._min = None
+        self._max = None
+
+    def __repr__(self):
+        return ("{}({})"
+                .format(
+                    type(self).__name__,
+                    self.count_data,
+                ))
+
+    @property
+    def relative_accuracy(self):
+        """The relative accuracy of the quantiles"""
+        return self._relative_accuracy
+
+    @property
+    def percentiles(self):
+        """The percentiles reported when converted to a point"""
+        return self._percentiles
+
+    @property
+    def count_data(self):
+        """The current count data"""
+        return self._count_data
+
+    @property
+    def sum_data(self):
+        """The current sum data"""
+        return self._sum_data
+
+    @property
+    def min(self):
+        """The smallest value added, or None"""
+        return self._min
+
+    @property
+    def max(self):
+        """The largest value added, or None"""
+        return self._max
+
+    def add_sample(self, value, timestamp=None, attachments=None):
+        """Adds a sample to the sketch"""
+        if value > 0:
+            index = int(math.ceil(math.log(value) / self._log_gamma))
+            bins = self._bins
+            if index in bins:
+                bins[index] += 1
+            else:
+                bins[index] = 1
+                if len(bins) > self._max_bins:
+                    self._collapse()
+        else:
+            self._zero_count += 1
+        self._count_data += 1
+        self._sum_data += value
+        if self._min is None or value < self._min:
+            self._min = value
+        if self._max is None or value > self._max:
+            self._max = value
+
+    def _collapse(self):
+        """Collapse the lowest bins into one to keep at most max_bins bins"""
+        indexes = sorted(self._bins)
+        excess = len(indexes) - self._max_bins
+        self._bins[indexes[excess]] += sum(
+            self._bins.pop(index) for index in indexes[:excess])
+
+    def merge(self, other):
+        """Merge the sketch of another Quantile Aggregation Data into this
+        one"""
+        if other.relative_accuracy != self._relative_accuracy:
+            raise ValueError("cannot merge sketches with different relative "
+                             "accuracies")
+        if other.count_data == 0:
+            return
+        for index, count in other._bins.items():
+            self._bins[index] = self._bins.get(index, 0) + count
+        if len(self._bins) > self._max_bins:
+            self._collapse()
+        self._zero_count += other._zero_count
+        self._count_data += other.count_data
+        self._sum_data += other.sum_data
+        if self._min is None or other.min < self._min:
+            self._min = other.min
+        if self._max is None or other.max > self._max:
+            self._max = other.max
+
+    def quantile(self, quantile):
+        """Estimate the value at the given quantile
+
+        :type quantile: float
+        :param quantile: the quantile, between 0 and 1
+
+        :rtype: float
+        :returns: the estimated value, or 0 if the sketch is empty
+        """
+        if self._count_data == 0:
+            return 0.0
+        if quantile <= 0:
+            return self._min
+        if quantile >= 1:
+            return self._max
+        rank = quantile * (self._count_data - 1)
+        if rank < self._zero_count:
+            return min(max(0.0, self._min), self._max)
+        running = self._zero_count
+        for index in sorted(self._bins):
+            running += self._bins[index]
+            if running > rank:
+                break
+        estimate = 2 * self._gamma ** index / (self._gamma + 1)
+        return min(max(estimate, self._min), self._max)
+
+    def to_point(self, timestamp):
+        """Get a Point conversion of this aggregation.
+
+        :type timestamp: :class: `datetime.datetime`
+        :param timestamp: The time to report the point as having been recorded.
+
+        :rtype: :class: `opencensus.metrics.export.point.Point`
+        :return: a :class: `opencensus.metrics.export.value.ValueSummary`
+        -valued Point with the estimated values at `percentiles`.
+        """
+        value_at_percentiles = [
+            summary.ValueAtPercentile(pp, self.quantile(pp / 100.0))
+            for pp in self._percentiles]
+        snapshot = summary.Snapshot(self.count_data, self.sum_data,
+                                    value_at_percentiles)
+        return point.Point(
+            value.ValueSummary(
+                summary.Summary(self.count_data, self.sum_data, snapshot)),
+            timestamp)
+
+
 class Exemplar(object):
     """ Exemplar represents an example point that may be used to annotate
         aggregated distribution values, associated with a histogram bucket.
@@ -375,12 +930,15 @@ class Exemplar(object):
         :type value: double
         :param value: value of the Exemplar point.
 
-        :type timestamp: time
-        :param timestamp: the time that this Exemplar's value was recorded.
+        :type timestamp: float
+        :param timestamp: the time that this Exemplar's value was recorded, in
+                          seconds since the epoch. It is only formatted as an
+                          ISO 8601 string when converted to a metric.
 
         :type attachments: dict
         :param attachments: the contextual information about the example value.
     """
+    __slots__ = ('_value', '_timestamp', '_attachments')
 
     def __init__(self, value, timestamp, attachments):
         self._value = value
@@ -0,0 +1,102 @@
+# Copyright 2019, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Samplers deciding which recorded values become the exemplars of the
+buckets of distributions."""
+
+import numbers
+import random
+
+
+class ExemplarSampler(object):
+    """Base class for exemplar samplers.
+
+    A sampler is asked before an exemplar is created for a value recorded
+    with attachments, so rejected values do not allocate anything. The same
+    sampler is shared by the distributions of all the time series of a view.
+    """
+
+    def should_sample(self, bucket_count, exemplar, timestamp):
+        """Whether a recorded value should replace the exemplar of its bucket.
+
+        :type bucket_count: int
+        :param bucket_count: The number of values recorded in the bucket,
+                             including this one.
+
+        :type exemplar: :class:`~opencensus.stats.aggregation_data.Exemplar`
+        :param exemplar: The current exemplar of the bucket, or None.
+
+        :type timestamp: float
+        :param timestamp: The time the value was recorded, in seconds since
+                          the epoch.
+
+        :rtype: bool
+        :returns: The sampling decision.
+        """
+        raise NotImplementedError
+
+    def __deepcopy__(self, memo):
+        # Copies of the aggregation data keep sharing the sampler
+        return self
+
+
+class AlwaysOnExemplarSampler(ExemplarSampler):
+    """Keep the last recorded value of each bucket as its exemplar."""
+
+    def should_sample(self, bucket_count, exemplar, timestamp):
+        return True
+
+
+class ReservoirExemplarSampler(ExemplarSampler):
+    """Keep a uniformly random recorded value of each bucket as its exemplar.
+
+    The n-th value of a bucket replaces its exemplar with probability 1/n, so
+    a bucket of n values only creates about ln(n) exemplars. The values of a
+    bucket are counted since the start of the view, or of the current
+    interval for delta views.
+
+    :type rng: :class:`random.Random`
+    :param rng: The random number generator, defaults to the one of the
+                `random` module.
+    """
+
+    def __init__(self, rng=None):
+        self._random = (rng or random).random
+
+    def should_sample(self, bucket_count, exemplar, timestamp):
+        return exemplar is None or self._random() * bucket_count < 1
+
+
+class RateLimitedExemplarSampler(ExemplarSampler):
+    """Replace the exemplar of each bucket at most once per interval.
+
+    Values recorded with ISO 8601 string timestamps, or without timestamps,
+    always replace the exemplar of their bucket.
+
+    :type interval: float
+    :param interval: The minimum number of seconds between the timestamps
+                     of two exemplars of a bucket.
+    """
+
+    def __init__(self, interval):
+        if interval < 0:
+            raise ValueError("interval must not be negative")
+        self.interval = interval
+
+    def should_sample(self, bucket_count, exemplar, timestamp):
+        if (exemplar is None or
+                not isinstance(exemplar.timestamp, numbers.Real) or
+                not isinstance(timestamp, numbers.Real)):
+            return True
+        return timestamp - exemplar.timestamp >= self.interval
@@ -35,8 +35,9 @@ class StatsExporter(object):
         and then it will record on its own way.
 
         :type view_datas: object of :class:
-            `~opencensus.stats.view_data.ViewData`
-        :param list of opencensus.stats.view_data.ViewData ViewData:
-            list of ViewData object to send to Stackdriver Monitoring
+            `~opencensus.stats.view_data.ViewDataSnapshot`
+        :param list of opencensus.stats.view_data.ViewDataSnapshot ViewData:
+            list of immutable ViewData snapshots to send to Stackdriver
+            Monitoring
         """
         raise NotImplementedError  # pragma: NO COVER
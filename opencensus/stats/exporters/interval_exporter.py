@@ -0,0 +1,164 @@
+# Copyright 2019, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Periodically export snapshots of all registered views."""
+
+import atexit
+import logging
+import threading
+
+from opencensus.stats import execution_context
+from opencensus.stats.measure_to_view_map import MeasureToViewMap
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_INTERVAL = 60.0  # Seconds
+_DEFAULT_GRACE_PERIOD = 5.0  # Seconds
+_INTERVAL_EXPORTER_THREAD_NAME = 'opencensus.stats.IntervalStatsExporter'
+
+
+class IntervalStatsExporter(object):
+    """Export snapshots of all registered views on a fixed interval.
+
+    Exporters registered with the view manager are called on every recorded
+    measurement, which makes the record path pay for copying and exporting
+    every affected view. Exporters handed to this class instead are called
+    from a background thread once per ``interval`` with a snapshot of every
+    registered view, so recording only updates the aggregation data.
+
+    :type exporters: list(:class:
+        `~opencensus.stats.exporters.base.StatsExporter`)
+    :param exporters: The exporters to push view data snapshots to.
+
+    :type interval: float
+    :param interval: The number of seconds between two exports.
+
+    :type measure_to_view_map: :class:
+        `~opencensus.stats.measure_to_view_map.MeasureToViewMap`
+    :param measure_to_view_map: The map to read registered views from.
+                                Defaults to the one shared by
+                                :class:`~opencensus.stats.stats.Stats`.
+
+    :type grace_period: float
+    :param grace_period: The amount of time to wait for the final export
+                         when the exporter is stopped.
+    """
+
+    def __init__(self, exporters, interval=_DEFAULT_INTERVAL,
+                 measure_to_view_map=None,
+                 grace_period=_DEFAULT_GRACE_PERIOD):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+
+        if measure_to_view_map is None:
+            if execution_context.get_measure_to_view_map() == {}:
+                execution_context.set_measure_to_view_map(MeasureToViewMap())
+            measure_to_view_map = execution_context.get_measure_to_view_map()
+
+        self._exporters = list(exporters)
+        self._interval = interval
+        self._measure_to_view_map = measure_to_view_map
+        self._grace_period = grace_period
+        self._registered_view_names = set()
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+        self._thread = None
+
+    @property
+    def exporters(self):
+        """the exporters snapshots are pushed to"""
+        return self._exporters
+
+    @property
+    def interval(self):
+        """the number of seconds between two exports"""
+        return self._interval
+
+    @property
+    def measure_to_view_map(self):
+        """the measure to view map views are read from"""
+        return self._measure_to_view_map
+
+    @property
+    def is_alive(self):
+        """Returns True is the background thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def export_views(self):
+        """Snapshot every registered view and push it to the exporters."""
+        view_datas = self.measure_to_view_map.get_view_datas()
+        if not view_datas:
+            return
+
+        for view_data in view_datas:
+            view = view_data.view
+            if view.name not in self._registered_view_names:
+                self._registered_view_names.add(view.name)
+                for exporter in self.exporters:
+                    exporter.on_register_view(view)
+
+        for exporter in self.exporters:
+            try:
+                exporter.export(view_datas)
+            except Exception:
+                logger.exception(
+                    '%s failed to export %s view datas.',
+                    exporter.__class__.__name__, len(view_datas))
+
+    def _thread_main(self):
+        """The entry point for the export thread.
+
+        Exports every ``interval`` seconds until stopped, then does a final
+        export so that data recorded since the last tick is not lost.
+        """
+        while not self._event.wait(self._interval):
+            self.export_views()
+        self.export_views()
+
+    def start(self):
+        """Starts the background thread.
+
+        Additionally, this registers a handler for process exit to export the
+        data recorded since the last tick before shutdown.
+        """
+        with self._lock:
+            if self.is_alive:
+                return
+
+            self._event.clear()
+            self._thread = threading.Thread(
+                target=self._thread_main,
+                name=_INTERVAL_EXPORTER_THREAD_NAME)
+            self._thread.daemon = True
+            self._thread.start()
+            atexit.register(self.stop)
+
+    def stop(self):
+        """Signals the background thread to do a final export and stop.
+
+        :rtype: bool
+        :returns: True if the thread terminated. False if the thread is still
+                  running.
+        """
+        if not self.is_alive:
+            return True
+
+        with self._lock:
+            self._event.set()
+            self._thread.join(timeout=self._grace_period)
+
+            success = not self.is_alive
+            self._thread = None
+
+            return success
@@ -18,6 +18,8 @@ from prometheus_client.core import CounterMetricFamily
 from prometheus_client.core import GaugeMetricFamily
 from prometheus_client.core import HistogramMetricFamily
 from prometheus_client.core import REGISTRY
+from prometheus_client.core import Sample
+from prometheus_client.core import SummaryMetricFamily
 from prometheus_client.core import UnknownMetricFamily
 
 from opencensus.common.transports import sync
@@ -158,6 +160,7 @@ class Collector(object):
 
         :rtype: :class:`~prometheus_client.core.CounterMetricFamily` or
                 :class:`~prometheus_client.core.HistogramMetricFamily` or
+                :class:`~prometheus_client.core.SummaryMetricFamily` or
                 :class:`~prometheus_client.core.UnknownMetricFamily` or
                 :class:`~prometheus_client.core.GaugeMetricFamily`
         :returns: A Prometheus metric object
@@ -223,6 +226,23 @@ class Collector(object):
                               value=agg_data.value)
             return metric
 
+        elif isinstance(agg_data,
+                        aggregation_data_module.QuantileAggregationData):
+            metric = SummaryMetricFamily(name=metric_name,
+                                         documentation=metric_description,
+                                         labels=label_keys)
+            metric.add_metric(labels=tag_values,
+                              count_value=agg_data.count_data,
+                              sum_value=agg_data.sum_data)
+            # Prometheus quantiles are in [0, 1] and set as a label.
+            for percentile in agg_data.percentiles:
+                labels = dict(zip(label_keys, tag_values))
+                labels['quantile'] = str(percentile / 100.0)
+                metric.samples.append(Sample(
+                    metric_name, labels,
+                    agg_data.quantile(percentile / 100.0)))
+            return metric
+
         else:
             raise ValueError("unsupported aggregation type %s"
                              % type(agg_data))
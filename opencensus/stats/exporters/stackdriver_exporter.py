@@ -209,9 +209,9 @@ class StackdriverStatsExporter(base.StatsExporter):
                 sum_of_sqd = agg.sum_of_sqd_deviations
                 dist_value.sum_of_squared_deviation = sum_of_sqd
 
-                # Uncomment this when stackdriver supports Range
-                # point.value.distribution_value.range.min = agg_data.min
-                # point.value.distribution_value.range.max = agg_data.max
+                if agg.count_data and agg.min is not None:
+                    dist_value.range.min = agg.min
+                    dist_value.range.max = agg.max
                 bounds = dist_value.bucket_options.explicit_buckets.bounds
                 buckets = dist_value.bucket_counts
 
@@ -13,10 +13,10 @@
 # limitations under the License.
 
 from collections import defaultdict
-import copy
 import logging
 
 from opencensus.stats import metric_utils
+from opencensus.stats import view as view_module
 from opencensus.stats import view_data as view_data_module
 
 
@@ -24,9 +24,14 @@ class MeasureToViewMap(object):
     """Measure To View Map stores a map from names of Measures to
     specific View Datas
 
+    :type sharded: bool
+    :param sharded: whether the View Datas aggregate the records of each
+                    thread separately and merge them when they are read
+
     """
 
-    def __init__(self):
+    def __init__(self, sharded=False):
+        self._sharded = sharded
         # stores the one-to-many mapping from Measures to View Datas
         self._measure_to_view_data_list_map = defaultdict(list)
         # stores a map from the registered View names to the Views
@@ -38,6 +43,11 @@ class MeasureToViewMap(object):
         # Stores the registered exporters
         self._exporters = []
 
+    @property
+    def sharded(self):
+        """whether records are aggregated per thread"""
+        return self._sharded
+
     @property
     def exported_views(self):
         """the current exported views"""
@@ -97,9 +107,24 @@ class MeasureToViewMap(object):
         self._registered_views[view.name] = view
         if registered_measure is None:
             self._registered_measures[measure.name] = measure
+        if (view.max_time_series is not None
+                or view.temporality != view_module.Temporality.CUMULATIVE
+                or view.max_idle_intervals is not None):
+            # Limits, resets and expiry act on a single map of time series
+            view_data = view_data_module.ViewData(
+                view=view, start_time=timestamp, end_time=timestamp,
+                max_time_series=view.max_time_series,
+                overflow_policy=view.overflow_policy,
+                temporality=view.temporality,
+                max_idle_intervals=view.max_idle_intervals)
+        elif self._sharded:
+            view_data = view_data_module.ShardedViewData(
+                view=view, start_time=timestamp, end_time=timestamp)
+        else:
+            view_data = view_data_module.ViewData(
+                view=view, start_time=timestamp, end_time=timestamp)
         self._measure_to_view_data_list_map[view.measure.name].append(
-            view_data_module.ViewData(view=view, start_time=timestamp,
-                                      end_time=timestamp))
+            view_data)
 
     def record(self, tags, measurement_map, timestamp, attachments=None):
         """records stats with a set of tags"""
@@ -107,24 +132,57 @@ class MeasureToViewMap(object):
         for measure, value in measurement_map.items():
             if measure != self._registered_measures.get(measure.name):
                 return
-            view_datas = []
-            for measure_name, view_data_list \
-                    in self._measure_to_view_data_list_map.items():
-                if measure_name == measure.name:
-                    view_datas.extend(view_data_list)
+            view_datas = self._measure_to_view_data_list_map.get(
+                measure.name)
+            if not view_datas:
+                continue
             for view_data in view_datas:
                 view_data.record(
                     context=tags, value=value, timestamp=timestamp,
                     attachments=attachments)
             self.export(view_datas)
 
+    def record_many(self, tags, measure, values, timestamp,
+                    attachments=None):
+        """records a batch of values of a measure with a set of tags
+
+        The tags are resolved and each aggregation updated once for the
+        whole batch.
+
+        :type values: list
+        :param values: the values to record
+        """
+        assert all(vv >= 0 for vv in values)
+        if measure != self._registered_measures.get(measure.name):
+            return
+        view_datas = self._measure_to_view_data_list_map.get(measure.name)
+        if not view_datas:
+            return
+        for view_data in view_datas:
+            view_data.record_many(
+                context=tags, values=values, timestamp=timestamp,
+                attachments=attachments)
+        self.export(view_datas)
+
     def export(self, view_datas):
         """export view datas to registered exporters"""
+        if not self.exporters:
+            return
         view_datas_copy = \
             [self.copy_and_finalize_view_data(vd) for vd in view_datas]
-        if len(self.exporters) > 0:
-            for e in self.exporters:
-                e.export(view_datas_copy)
+        for e in self.exporters:
+            e.export(view_datas_copy)
+
+    def get_view_datas(self):
+        """collect a snapshot of the View Data of every registered view
+
+        Collecting resets delta views and expires the idle time series of
+        cumulative views, see
+        :meth:`~opencensus.stats.view_data.ViewData.collect`.
+        """
+        return [vd.collect()
+                for vdl in list(self._measure_to_view_data_list_map.values())
+                for vd in vdl]
 
     def get_metrics(self, timestamp):
         """Get a Metric for each registered view.
@@ -138,16 +196,22 @@ class MeasureToViewMap(object):
 
         :rtype: Iterator[:class: `opencensus.metrics.export.metric.Metric`]
         """
+        limited_view_datas = []
         for vdl in self._measure_to_view_data_list_map.values():
             for vd in vdl:
-                metric = metric_utils.view_data_to_metric(vd, timestamp)
+                metric = metric_utils.view_data_to_metric(
+                    vd.snapshot(), timestamp)
                 if metric is not None:
                     yield metric
+                if vd.max_time_series is not None:
+                    limited_view_datas.append(vd)
+        if limited_view_datas:
+            yield metric_utils.view_datas_to_overflow_metric(
+                limited_view_datas, timestamp)
 
-    # TODO(issue #470): remove this method once we export immutable stats.
     def copy_and_finalize_view_data(self, view_data):
-        view_data_copy = copy.copy(view_data)
-        tvdam_copy = copy.deepcopy(view_data.tag_value_aggregation_data_map)
-        view_data_copy._tag_value_aggregation_data_map = tvdam_copy
-        view_data_copy.end()
-        return view_data_copy
+        """get an immutable snapshot of the View Data
+
+        :rtype: :class:`~opencensus.stats.view_data.ViewDataSnapshot`
+        """
+        return view_data.snapshot()
@@ -12,8 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from datetime import datetime
+from collections import defaultdict
 import logging
+import time
 
 from opencensus.tags import execution_context
 
@@ -114,6 +115,75 @@ class MeasurementMap(object):
         self.measure_to_view_map.record(
                 tags=tag_map_tags,
                 measurement_map=self.measurement_map,
-                timestamp=datetime.utcnow().isoformat() + 'Z',
+                timestamp=time.time(),
                 attachments=self.attachments
         )
+
+    def record_many(self, measure, values, tag_map_tags=None):
+        """records a batch of values of a single measure at the same time
+        with a tag_map.
+
+        The tag_map and the timestamp are resolved once for the whole batch,
+        and the aggregations of each view of the measure are updated in bulk.
+
+        :type measure: :class: '~opencensus.stats.measure.BaseMeasure'
+        :param measure: the measure of the values
+
+        :type values: iterable
+        :param values: the values to record. NumPy-like arrays are converted
+                       with their `tolist` method.
+        """
+        if tag_map_tags is None:
+            tag_map_tags = execution_context.get_current_tag_map()
+        values = _to_list(values)
+        if not values:
+            return
+        if min(values) < 0:
+            logger.warning("Dropping values, value to record must be "
+                           "non-negative")
+            return
+
+        self.measure_to_view_map.record_many(
+                tags=tag_map_tags,
+                measure=measure,
+                values=values,
+                timestamp=time.time(),
+                attachments=self.attachments
+        )
+
+    def record_batch(self, rows, tag_map_tags=None):
+        """records a batch of rows of measurements at the same time with a
+        tag_map.
+
+        :type rows: iterable(dict)
+        :param rows: the rows to record, each a map from measures to values
+                     like :attr:`measurement_map`
+        """
+        if tag_map_tags is None:
+            tag_map_tags = execution_context.get_current_tag_map()
+        values_by_measure = defaultdict(list)
+        for row in rows:
+            for measure, value in row.items():
+                values_by_measure[measure].append(value)
+        if any(min(values) < 0 for values in values_by_measure.values()):
+            logger.warning("Dropping values, value to record must be "
+                           "non-negative")
+            return
+
+        timestamp = time.time()
+        for measure, values in values_by_measure.items():
+            self.measure_to_view_map.record_many(
+                    tags=tag_map_tags,
+                    measure=measure,
+                    values=values,
+                    timestamp=timestamp,
+                    attachments=self.attachments
+            )
+
+
+def _to_list(values):
+    """convert an iterable or a NumPy-like array of values to a list"""
+    tolist = getattr(values, 'tolist', None)
+    if tolist is not None:
+        return tolist()
+    return list(values)
@@ -15,10 +15,13 @@
 Utilities to convert stats data models to metrics data models.
 """
 
+from opencensus.metrics import label_key
 from opencensus.metrics import label_value
 from opencensus.metrics.export import metric
 from opencensus.metrics.export import metric_descriptor
+from opencensus.metrics.export import point
 from opencensus.metrics.export import time_series
+from opencensus.metrics.export import value
 from opencensus.stats import aggregation as aggregation_module
 from opencensus.stats import measure as measure_module
 
@@ -32,8 +35,18 @@ AGGREGATION_TYPE_MAP = {
     aggregation_module.DistributionAggregation,
     aggregation_module.Type.LASTVALUE:
     aggregation_module.LastValueAggregation,
+    aggregation_module.Type.QUANTILE:
+    aggregation_module.QuantileAggregation,
 }
 
+OVERFLOW_METRIC_DESCRIPTOR = metric_descriptor.MetricDescriptor(
+    name='opencensus.io/stats/view/overflowed_records',
+    description='Records of new time series beyond the maximum number of '
+                'time series of a view',
+    unit='1',
+    type_=metric_descriptor.MetricDescriptorType.CUMULATIVE_INT64,
+    label_keys=[label_key.LabelKey('view', 'the name of the view')])
+
 
 def get_metric_type(measure, aggregation):
     """Get the corresponding metric type for the given stats type.
@@ -68,6 +81,8 @@ def get_metric_type(measure, aggregation):
             return metric_descriptor.MetricDescriptorType.GAUGE_DOUBLE
         else:
             raise ValueError
+    elif aggregation.aggregation_type == aggregation_module.Type.QUANTILE:
+        return metric_descriptor.MetricDescriptorType.SUMMARY
     else:
         raise AssertionError  # pragma: NO COVER
 
@@ -103,8 +118,8 @@ def get_label_values(tag_values):
 def view_data_to_metric(view_data, timestamp):
     """Convert a ViewData to a Metric at time `timestamp`.
 
-    :type view_data: :class: `opencensus.stats.view_data.ViewData`
-    :param view_data: The ViewData to convert.
+    :type view_data: :class: `opencensus.stats.view_data.ViewDataSnapshot`
+    :param view_data: The ViewData snapshot to convert.
 
     :type timestamp: :class: `datetime.datetime`
     :param timestamp: The time to set on the metric's point's aggregation,
@@ -130,3 +145,27 @@ def view_data_to_metric(view_data, timestamp):
         point = agg_data.to_point(timestamp)
         ts_list.append(time_series.TimeSeries(label_values, [point], ts_start))
     return metric.Metric(md, ts_list)
+
+
+def view_datas_to_overflow_metric(view_datas, timestamp):
+    """Convert the overflow counts of ViewDatas to a Metric at time
+    `timestamp`.
+
+    :type view_datas: list(:class: `opencensus.stats.view_data.ViewData`)
+    :param view_datas: The ViewDatas whose overflow counts to convert, one
+    time series per ViewData.
+
+    :type timestamp: :class: `datetime.datetime`
+    :param timestamp: The time to set on the metric's points, usually the
+    current time.
+
+    :rtype: :class: `opencensus.metrics.export.metric.Metric`
+    :return: A metric counting the overflowing records of each view.
+    """
+    ts_list = []
+    for view_data in view_datas:
+        label_values = get_label_values([view_data.view.name])
+        pt = point.Point(value.ValueLong(view_data.overflow_count), timestamp)
+        ts_list.append(time_series.TimeSeries(label_values, [pt],
+                                              view_data.start_time))
+    return metric.Metric(OVERFLOW_METRIC_DESCRIPTOR, ts_list)
@@ -22,10 +22,15 @@ from opencensus.stats.view_manager import ViewManager
 class Stats(MetricProducer):
     """Stats defines a View Manager and a Stats Recorder in order for the
     collection of Stats
+
+    :type sharded: bool
+    :param sharded: Whether each thread records into its own copy of the
+                    view data, see
+                    :class:`~opencensus.stats.stats_recorder.StatsRecorder`.
     """
 
-    def __init__(self):
-        self.stats_recorder = StatsRecorder()
+    def __init__(self, sharded=False):
+        self.stats_recorder = StatsRecorder(sharded=sharded)
         self.view_manager = ViewManager()
 
     def get_metrics(self):
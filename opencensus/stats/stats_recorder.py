@@ -12,20 +12,35 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import logging
+
 from opencensus.stats.measurement_map import MeasurementMap
 from opencensus.stats.measure_to_view_map import MeasureToViewMap
 from opencensus.stats import execution_context
 
+logger = logging.getLogger(__name__)
+
 
 class StatsRecorder(object):
     """Stats Recorder provides methods to record stats against tags
 
+    :type sharded: bool
+    :param sharded: Whether each thread records into its own copy of the
+                    view data, merged when the view data is read. Recording
+                    from many threads then never contends on shared state.
+                    Only applies if no stats recorder or view manager was
+                    created before.
+
     """
-    def __init__(self):
+    def __init__(self, sharded=False):
         if execution_context.get_measure_to_view_map() == {}:
-            execution_context.set_measure_to_view_map(MeasureToViewMap())
+            execution_context.set_measure_to_view_map(
+                MeasureToViewMap(sharded=sharded))
 
         self.measure_to_view_map = execution_context.get_measure_to_view_map()
+        if sharded and not self.measure_to_view_map.sharded:
+            logger.warning("Stats were already set up without sharding, "
+                           "recording to shared view data")
 
     def new_measurement_map(self):
         """Creates a new MeasurementMap in order to record stats
@@ -20,6 +20,37 @@ from opencensus.metrics.export import metric_descriptor
 from opencensus.stats import metric_utils
 
 
+class OverflowPolicy(object):
+    """ What a view does with the records of new time series once it holds
+    its maximum number of time series.
+
+    Attributes:
+      DROP (int): Drop the records.
+      FOLD (int): Record into a single overflow time series, whose tag values
+        are all `OVERFLOW_TAG_VALUE`.
+      EVICT (int): Evict the least recently updated time series to make
+        room for the new one.
+    """
+    DROP = 0
+    FOLD = 1
+    EVICT = 2
+
+
+OVERFLOW_TAG_VALUE = '__overflow__'
+
+
+class Temporality(object):
+    """ What the snapshots of a view aggregate over.
+
+    Attributes:
+      CUMULATIVE (int): The records since the view was registered.
+      DELTA (int): The records since the previous snapshot. Taking a
+        snapshot resets the aggregation data and the start time of the view.
+    """
+    CUMULATIVE = 0
+    DELTA = 1
+
+
 class View(object):
     """A view defines a specific aggregation and a set of tag keys
 
@@ -39,14 +70,51 @@ class View(object):
     :type aggregation: :class: '~opencensus.stats.aggregation.BaseAggregation'
     :param aggregation: the aggregation the view will support
 
+    :type max_time_series: int
+    :param max_time_series: the maximum number of time series, i.e. distinct
+                            tag values, the view holds. Unlimited by default.
+                            Views with a limit, delta views and views
+                            with `max_idle_intervals` are never sharded.
+
+    :type overflow_policy: int
+    :param overflow_policy: the :class:`OverflowPolicy` applied to the
+                            records of new time series once the view holds
+                            `max_time_series` time series
+
+    :type temporality: int
+    :param temporality: the :class:`Temporality` of the snapshots of the view
+
+    :type max_idle_intervals: int
+    :param max_idle_intervals: the number of consecutive snapshots a time
+                               series of a cumulative view may go without
+                               updates before it is dropped. Never dropped
+                               by default.
+
     """
 
-    def __init__(self, name, description, columns, measure, aggregation):
+    def __init__(self, name, description, columns, measure, aggregation,
+                 max_time_series=None, overflow_policy=OverflowPolicy.DROP,
+                 temporality=Temporality.CUMULATIVE, max_idle_intervals=None):
+        if max_time_series is not None and max_time_series < 1:
+            raise ValueError("max_time_series must be positive")
+        if overflow_policy not in (OverflowPolicy.DROP, OverflowPolicy.FOLD,
+                                   OverflowPolicy.EVICT):
+            raise ValueError("unknown overflow policy: {}"
+                             .format(overflow_policy))
+        if temporality not in (Temporality.CUMULATIVE, Temporality.DELTA):
+            raise ValueError("unknown temporality: {}".format(temporality))
+        if max_idle_intervals is not None and max_idle_intervals < 1:
+            raise ValueError("max_idle_intervals must be positive")
+
         self._name = name
         self._description = description
         self._columns = columns
         self._measure = measure
         self._aggregation = aggregation
+        self._max_time_series = max_time_series
+        self._overflow_policy = overflow_policy
+        self._temporality = temporality
+        self._max_idle_intervals = max_idle_intervals
 
         # Cache the converted MetricDescriptor here to avoid creating it each
         # time we convert a ViewData that realizes this View into a Metric.
@@ -78,6 +146,27 @@ class View(object):
         """the aggregation of the current view"""
         return self._aggregation
 
+    @property
+    def max_time_series(self):
+        """the maximum number of time series of the current view"""
+        return self._max_time_series
+
+    @property
+    def overflow_policy(self):
+        """the overflow policy of the current view"""
+        return self._overflow_policy
+
+    @property
+    def temporality(self):
+        """the temporality of the current view"""
+        return self._temporality
+
+    @property
+    def max_idle_intervals(self):
+        """the number of snapshots without updates after which a time series
+        of the current view is dropped"""
+        return self._max_idle_intervals
+
     def get_metric_descriptor(self):
         """Get a MetricDescriptor for this view.
 
@@ -12,8 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections import OrderedDict
 from datetime import datetime
 import copy
+import threading
+
+from opencensus.stats import view as view_module
+from opencensus.tags import tag_map as tag_map_module
+
+# The number of locks guarding the aggregation data of a view. Each time
+# series is guarded by the lock picked by the hash of its tag values, so
+# concurrent records only contend when they hit the same stripe.
+_LOCK_STRIPES = 16
 
 
 class ViewData(object):
@@ -28,15 +38,57 @@ class ViewData(object):
     :type end_time: datetime
     :param end_time: the end time for this view data
 
+    :type max_time_series: int
+    :param max_time_series: the maximum number of time series to hold, or
+                            None for no limit
+
+    :type overflow_policy: int
+    :param overflow_policy: the :class:`~opencensus.stats.view.OverflowPolicy`
+                            applied to the records of new time series once
+                            `max_time_series` is reached
+
+    :type temporality: int
+    :param temporality: the :class:`~opencensus.stats.view.Temporality` of
+                        the snapshots of this view data
+
+    :type max_idle_intervals: int
+    :param max_idle_intervals: the number of consecutive snapshots a time
+                               series may go without updates before it is
+                               dropped, or None to never drop time series
+
     """
     def __init__(self,
                  view,
                  start_time,
-                 end_time):
+                 end_time,
+                 max_time_series=None,
+                 overflow_policy=view_module.OverflowPolicy.DROP,
+                 temporality=view_module.Temporality.CUMULATIVE,
+                 max_idle_intervals=None):
         self._view = view
         self._start_time = start_time
         self._end_time = end_time
         self._tag_value_aggregation_data_map = {}
+        self._columns = None
+        self._locks = [threading.Lock() for _ in range(_LOCK_STRIPES)]
+        self._max_time_series = max_time_series
+        self._overflow_policy = overflow_policy
+        # Guards the number of time series when it is limited, the overflow
+        # count and the recency order of the time series.
+        self._limit_lock = threading.Lock()
+        self._overflow_count = 0
+        self._recency = OrderedDict()
+        self._temporality = temporality
+        self._max_idle_intervals = max_idle_intervals
+        # The number of snapshots taken so far, and the one during which
+        # each time series was last updated
+        self._interval = 0
+        self._last_updated = {}
+        # The time series changed since the last snapshot, and frozen copies
+        # of the others shared by the snapshots
+        self._dirty = set()
+        self._frozen = {}
+        self._snapshot_lock = threading.Lock()
 
     @property
     def view(self):
@@ -60,6 +112,139 @@ class ViewData(object):
         """the current tag value aggregation map in the view data"""
         return self._tag_value_aggregation_data_map
 
+    @property
+    def max_time_series(self):
+        """the maximum number of time series in the view data"""
+        return self._max_time_series
+
+    @property
+    def overflow_count(self):
+        """the number of records of new time series beyond the maximum
+        number of time series"""
+        return self._overflow_count
+
+    @property
+    def temporality(self):
+        """the temporality of the snapshots of the view data"""
+        return self._temporality
+
+    def _get_lock(self, tag_values):
+        """get the lock guarding the time series for the given tag values"""
+        return self._locks[hash(tag_values) % _LOCK_STRIPES]
+
+    def copy_tag_value_aggregation_data_map(self):
+        """get a deep copy of the tag value aggregation map
+
+        Each aggregation data is copied under its lock, so the copy is
+        consistent even if other threads keep recording to this view data.
+        """
+        map_copy = {}
+        for tag_values, agg_data in list(
+                self._tag_value_aggregation_data_map.items()):
+            with self._get_lock(tag_values):
+                map_copy[tag_values] = copy.deepcopy(agg_data)
+        return map_copy
+
+    def _acquire_all_locks(self):
+        """acquire the locks of all the time series, in order"""
+        for lock in self._locks:
+            lock.acquire()
+
+    def _release_all_locks(self):
+        """release the locks of all the time series"""
+        for lock in reversed(self._locks):
+            lock.release()
+
+    def _expire_idle_time_series(self):
+        """drop the time series not updated in the last `max_idle_intervals`
+        intervals"""
+        for tag_values, interval in list(self._last_updated.items()):
+            if self._interval - interval < self._max_idle_intervals:
+                continue
+            with self._get_lock(tag_values):
+                # The time series may have been updated in the meantime
+                if self._last_updated.get(tag_values) != interval:
+                    continue
+                del self._last_updated[tag_values]
+                self._tag_value_aggregation_data_map.pop(tag_values, None)
+                self._dirty.add(tag_values)
+                with self._limit_lock:
+                    self._recency.pop(tag_values, None)
+
+    def _get_frozen_tag_value_aggregation_data_map(self):
+        """get a copy of the tag value aggregation map sharing the frozen
+        copies of the time series unchanged since the last snapshot
+
+        Must be called with the snapshot lock held.
+        """
+        self._acquire_all_locks()
+        try:
+            dirty = self._dirty
+            self._dirty = set()
+        finally:
+            self._release_all_locks()
+
+        for tag_values in dirty:
+            with self._get_lock(tag_values):
+                agg_data = self._tag_value_aggregation_data_map.get(
+                    tag_values)
+                if agg_data is None:
+                    self._frozen.pop(tag_values, None)
+                else:
+                    self._frozen[tag_values] = copy.deepcopy(agg_data)
+        return dict(self._frozen)
+
+    def snapshot(self):
+        """get an immutable snapshot of the view data
+
+        Only the time series changed since the previous snapshot are copied,
+        the others are shared with the previous snapshots.
+
+        :rtype: :class:`ViewDataSnapshot`
+        :returns: the snapshot
+        """
+        end_time = datetime.utcnow().isoformat() + 'Z'
+        with self._snapshot_lock:
+            tvadm = self._get_frozen_tag_value_aggregation_data_map()
+        return ViewDataSnapshot(self.view, self._start_time, end_time, tvadm)
+
+    def collect(self):
+        """get an immutable snapshot of the view data and start a new interval
+
+        Delta view datas atomically swap out their aggregation data, so the
+        snapshot holds the records since the previous collection and the view
+        data starts again from an empty aggregation map. Cumulative view
+        datas first drop their idle time series if `max_idle_intervals` is
+        set.
+
+        :rtype: :class:`ViewDataSnapshot`
+        :returns: the snapshot
+        """
+        end_time = datetime.utcnow().isoformat() + 'Z'
+        with self._snapshot_lock:
+            if self._temporality == view_module.Temporality.DELTA:
+                self._acquire_all_locks()
+                try:
+                    tvadm = self._tag_value_aggregation_data_map
+                    self._tag_value_aggregation_data_map = {}
+                    self._last_updated = {}
+                    self._dirty = set()
+                    self._frozen = {}
+                    with self._limit_lock:
+                        self._recency = OrderedDict()
+                    start_time = self._start_time
+                    self._start_time = end_time
+                finally:
+                    self._release_all_locks()
+            else:
+                if self._max_idle_intervals is not None:
+                    self._expire_idle_time_series()
+                tvadm = self._get_frozen_tag_value_aggregation_data_map()
+                start_time = self._start_time
+            self._interval += 1
+
+        return ViewDataSnapshot(self.view, start_time, end_time, tvadm)
+
     def start(self):
         """sets the start time for the view data"""
         self._start_time = datetime.utcnow().isoformat() + 'Z'
@@ -81,17 +266,284 @@ class ViewData(object):
             i += 1
         return tag_values
 
+    def _get_tag_value_tuple(self, context):
+        """get the tag values of the view columns from the context"""
+        columns = self._columns
+        if columns is None:
+            # The view columns, compiled once into a hashable projection
+            columns = self._columns = tuple(self.view.columns)
+        if context is None:
+            return (None,) * len(columns)
+        if isinstance(context, tag_map_module.TagMap):
+            return context.project(columns)
+        return tuple(map(context.map.get, columns))
+
+    def _new_aggregation_data(self):
+        """create the aggregation data for a new time series"""
+        return self.view.aggregation.new_aggregation_data()
+
+    def _get_overflow_tag_values(self):
+        """get the tag values of the time series overflowing records fold
+        into"""
+        return (view_module.OVERFLOW_TAG_VALUE,) * len(self.view.columns)
+
+    def _is_full(self):
+        """whether the view data holds the maximum number of time series"""
+        return (len(self._tag_value_aggregation_data_map) >=
+                self._max_time_series)
+
+    def _tracks_recency(self):
+        """whether the recency order of the time series is needed to evict
+        them"""
+        return (self._max_time_series is not None and
+                self._overflow_policy == view_module.OverflowPolicy.EVICT)
+
+    def _record_time_series(self, tag_values, value, timestamp, attachments,
+                            limited=True, many=False):
+        """records to the time series for the given tag values
+
+        `value` is a list of values if `many` is set. Returns False without
+        recording if this would create a time series beyond the maximum
+        number of time series.
+        """
+        with self._get_lock(tag_values):
+            agg_data = self._tag_value_aggregation_data_map.get(tag_values)
+            if agg_data is None:
+                agg_data = self._new_aggregation_data()
+                if self._max_time_series is None:
+                    self._tag_value_aggregation_data_map[tag_values] = agg_data
+                else:
+                    with self._limit_lock:
+                        if limited and self._is_full():
+                            return False
+                        self._tag_value_aggregation_data_map[tag_values] = \
+                            agg_data
+            self._dirty.add(tag_values)
+            if self._max_idle_intervals is not None:
+                self._last_updated[tag_values] = self._interval
+            if self._tracks_recency():
+                with self._limit_lock:
+                    self._recency.pop(tag_values, None)
+                    self._recency[tag_values] = None
+            if many:
+                agg_data.add_samples(value, timestamp, attachments)
+            else:
+                agg_data.add_sample(value, timestamp, attachments)
+        return True
+
+    def _evict_time_series(self):
+        """evicts the least recently updated time series
+
+        Returns False if there is no time series to evict.
+        """
+        while True:
+            with self._limit_lock:
+                if not self._recency:
+                    return False
+                tag_values = next(iter(self._recency))
+            with self._get_lock(tag_values):
+                with self._limit_lock:
+                    # The time series may have been updated or evicted since
+                    if next(iter(self._recency), None) != tag_values:
+                        continue
+                    del self._recency[tag_values]
+                    self._tag_value_aggregation_data_map.pop(tag_values)
+                self._last_updated.pop(tag_values, None)
+                self._dirty.add(tag_values)
+            return True
+
+    def _record(self, tag_values, value, timestamp, attachments, many):
+        """records to the time series for the given tag values, applying the
+        overflow policy if the view data is full"""
+        if self._record_time_series(tag_values, value, timestamp,
+                                    attachments, many=many):
+            return
+
+        with self._limit_lock:
+            self._overflow_count += len(value) if many else 1
+        if self._overflow_policy == view_module.OverflowPolicy.FOLD:
+            self._record_time_series(self._get_overflow_tag_values(), value,
+                                     timestamp, attachments, limited=False,
+                                     many=many)
+        elif self._overflow_policy == view_module.OverflowPolicy.EVICT:
+            # Another thread may take the freed slot before this one does
+            while self._evict_time_series():
+                if self._record_time_series(tag_values, value, timestamp,
+                                            attachments, many=many):
+                    return
+
     def record(self, context, value, timestamp, attachments=None):
         """records the view data against context"""
-        if context is None:
-            tags = dict()
-        else:
-            tags = context.map
-        tag_values = self.get_tag_values(tags=tags,
-                                         columns=self.view.columns)
-        tuple_vals = tuple(tag_values)
-        if tuple_vals not in self.tag_value_aggregation_data_map:
-            self.tag_value_aggregation_data_map[tuple_vals] = copy.deepcopy(
-                self.view.aggregation.aggregation_data)
-        self.tag_value_aggregation_data_map.get(tuple_vals).\
-            add_sample(value, timestamp, attachments)
+        self._record(self._get_tag_value_tuple(context), value, timestamp,
+                     attachments, False)
+
+    def record_many(self, context, values, timestamp, attachments=None):
+        """records a batch of values against context at once
+
+        :type values: list
+        :param values: the values to record
+        """
+        self._record(self._get_tag_value_tuple(context), values, timestamp,
+                     attachments, True)
+
+
+class ViewDataSnapshot(object):
+    """An immutable snapshot of the aggregated data of a view
+
+    Snapshots share the aggregation data of the time series that did not
+    change between them, so neither the snapshot nor its aggregation data
+    may be modified.
+
+    :type view: :class: '~opencensus.stats.view.View'
+    :param view: The view associated with this view data
+
+    :type start_time: str
+    :param start_time: the start time of the aggregated data
+
+    :type end_time: str
+    :param end_time: the time the snapshot was taken
+
+    :type tag_value_aggregation_data_map: dict
+    :param tag_value_aggregation_data_map: the aggregation data of each time
+                                           series, by tag values
+
+    """
+    def __init__(self, view, start_time, end_time,
+                 tag_value_aggregation_data_map):
+        self._view = view
+        self._start_time = start_time
+        self._end_time = end_time
+        self._tag_value_aggregation_data_map = tag_value_aggregation_data_map
+
+    @property
+    def view(self):
+        """the view of the snapshot"""
+        return self._view
+
+    @property
+    def start_time(self):
+        """the start time of the aggregated data"""
+        return self._start_time
+
+    @property
+    def end_time(self):
+        """the time the snapshot was taken"""
+        return self._end_time
+
+    @property
+    def tag_value_aggregation_data_map(self):
+        """the aggregation data of each time series, by tag values"""
+        return self._tag_value_aggregation_data_map
+
+
+class _Shard(object):
+    """The time series recorded by a single thread"""
+    def __init__(self):
+        self.thread = threading.current_thread()
+        self.lock = threading.Lock()
+        self.tag_value_aggregation_data_map = {}
+
+
+class ShardedViewData(ViewData):
+    """View Data that aggregates the records of each thread separately
+
+    Each thread records into its own shard, so recording never contends with
+    other threads. The shards are merged when the aggregated data is read,
+    and the shards of finished threads are folded into the view data.
+
+    :type view:
+    :param view: The view associated with this view data
+
+    :type start_time: datetime
+    :param start_time: the start time for this view data
+
+    :type end_time: datetime
+    :param end_time: the end time for this view data
+
+    """
+    def __init__(self,
+                 view,
+                 start_time,
+                 end_time):
+        super(ShardedViewData, self).__init__(view, start_time, end_time)
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+
+    @property
+    def tag_value_aggregation_data_map(self):
+        """the tag value aggregation map merged from all the shards"""
+        return self.copy_tag_value_aggregation_data_map()
+
+    def _get_shard(self):
+        """get the shard of the current thread"""
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = _Shard()
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def _retire_shard(self, shard):
+        """fold the shard of a finished thread into the view data"""
+        for tag_values, agg_data in \
+                shard.tag_value_aggregation_data_map.items():
+            with self._get_lock(tag_values):
+                retired = self._tag_value_aggregation_data_map.get(tag_values)
+                if retired is None:
+                    self._tag_value_aggregation_data_map[tag_values] = \
+                        agg_data
+                else:
+                    retired.merge(agg_data)
+        self._shards.remove(shard)
+
+    def _get_frozen_tag_value_aggregation_data_map(self):
+        """get the tag value aggregation map merged from all the shards
+
+        The shards are merged into fresh copies, so nothing is shared between
+        the snapshots of sharded view datas.
+        """
+        return self.copy_tag_value_aggregation_data_map()
+
+    def copy_tag_value_aggregation_data_map(self):
+        """get the tag value aggregation map merged from all the shards"""
+        with self._shards_lock:
+            map_copy = super(ShardedViewData,
+                             self).copy_tag_value_aggregation_data_map()
+            for shard in list(self._shards):
+                with shard.lock:
+                    for tag_values, agg_data in \
+                            shard.tag_value_aggregation_data_map.items():
+                        merged = map_copy.get(tag_values)
+                        if merged is None:
+                            map_copy[tag_values] = copy.deepcopy(agg_data)
+                        else:
+                            merged.merge(agg_data)
+                if not shard.thread.is_alive():
+                    self._retire_shard(shard)
+        return map_copy
+
+    def record(self, context, value, timestamp, attachments=None):
+        """records the view data against context in the current thread's
+        shard"""
+        tuple_vals = self._get_tag_value_tuple(context)
+        shard = self._get_shard()
+        with shard.lock:
+            agg_data = shard.tag_value_aggregation_data_map.get(tuple_vals)
+            if agg_data is None:
+                agg_data = self._new_aggregation_data()
+                shard.tag_value_aggregation_data_map[tuple_vals] = agg_data
+            agg_data.add_sample(value, timestamp, attachments)
+
+    def record_many(self, context, values, timestamp, attachments=None):
+        """records a batch of values against context at once in the current
+        thread's shard"""
+        tuple_vals = self._get_tag_value_tuple(context)
+        shard = self._get_shard()
+        with shard.lock:
+            agg_data = shard.tag_value_aggregation_data_map.get(tuple_vals)
+            if agg_data is None:
+                agg_data = self._new_aggregation_data()
+                shard.tag_value_aggregation_data_map[tuple_vals] = agg_data
+            agg_data.add_samples(values, timestamp, attachments)
@@ -12,19 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import threading
+from opencensus.common.runtime_context import context_var
 
-_thread_local = threading.local()
+_current_tag_map = context_var('opencensus.tags.current_tag_map')
 
 
 def get_current_tag_map():
-    return getattr(_thread_local, 'current_tag_map', None)
+    return _current_tag_map.get()
 
 
 def set_current_tag_map(current_tag_map):
-    setattr(_thread_local, 'current_tag_map', current_tag_map)
+    _current_tag_map.set(current_tag_map)
 
 
 def clear():
-    """Clear the thread local, used in test."""
-    _thread_local.__dict__.clear()
+    """Clear the execution context, used in test."""
+    _current_tag_map.set(None)
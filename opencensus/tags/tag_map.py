@@ -29,9 +29,41 @@ class TagMap(object):
     def __init__(self, tags=None):
         self.map = OrderedDict(tags if tags else [])
 
+    @property
+    def map(self):
+        """the current map of tag keys to tag values"""
+        return self._map
+
+    @map.setter
+    def map(self, value):
+        self._map = value
+        # Maps column tuples to the projected tag values, see `project`
+        self._projections = {}
+
     def __iter__(self):
         return self.map.items().__iter__()
 
+    def project(self, columns):
+        """Gets the values of the given tag keys, or None for the keys that
+        are not in the map.
+
+        The projections are cached until the map is modified through
+        `insert`, `delete` or `update`, so recording repeatedly with the same
+        tag map only looks up the tag values once per view.
+
+        :type columns: tuple(:class: '~opencensus.tags.tag_key.TagKey')
+        :param columns: the tag keys to get the values of
+
+        :rtype: tuple(:class: '~opencensus.tags.tag_value.TagValue')
+        :returns: the values of the tag keys, in order
+        """
+        try:
+            return self._projections[columns]
+        except KeyError:
+            values = tuple(map(self._map.get, columns))
+            self._projections[columns] = values
+            return values
+
     def insert(self, key, value):
         """Inserts a key and value in the map if the map does not already
         contain the key.
@@ -51,6 +83,7 @@ class TagMap(object):
             tag_key = TagKey(key)
             tag_val = TagValue(value)
             self.map[tag_key] = tag_val
+            self._projections = {}
         except ValueError:
             raise
 
@@ -64,6 +97,7 @@ class TagMap(object):
                   or None if it is not.
         """
         self.map.pop(key, None)
+        self._projections = {}
 
     def update(self, key, value):
         """Updates the map by updating the value of a key
@@ -77,6 +111,7 @@ class TagMap(object):
         """
         if key in self.map:
             self.map[key] = value
+            self._projections = {}
 
     def tag_key_exists(self, key):
         """Checking if the tag key exists in the map
@@ -12,46 +12,76 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import threading
-
 from typing import Callable
 
+from opencensus.common.runtime_context import context_var
 from opencensus.trace import Span
 from opencensus.trace.tracers import noop_tracer
 
 _span_created_callbacks = []
-_thread_local = threading.local()
+_tracer = context_var('opencensus.trace.tracer')
+_current_span = context_var('opencensus.trace.current_span')
+_attrs = context_var('opencensus.trace.attrs')
+
+# Replaced by integrations keeping the context elsewhere, such as tornado,
+# by a function returning an object holding the context in its attributes,
+# or None to use the context variables.
+_get_context = None
+
 
+def _get(var, attr):
+    context = _get_context()
+    if context is None:
+        return var.get()
+    return getattr(context, attr, None)
 
-def _get_context():
-    return _thread_local
+
+def _set(var, attr, value):
+    context = _get_context()
+    if context is None:
+        var.set(value)
+    else:
+        setattr(context, attr, value)
 
 
 def get_opencensus_tracer():
-    """Get the opencensus tracer from thread local."""
-    return getattr(_get_context(), 'tracer', noop_tracer.NoopTracer())
+    """Get the opencensus tracer from the execution context."""
+    if _get_context is None:
+        tracer = _tracer.get()
+    else:
+        tracer = _get(_tracer, 'tracer')
+    if tracer is None:
+        return noop_tracer.NoopTracer()
+    return tracer
 
 
 def set_opencensus_tracer(tracer):
-    """Add the tracer to thread local."""
-    setattr(_get_context(), 'tracer', tracer)
+    """Add the tracer to the execution context."""
+    if _get_context is None:
+        _tracer.set(tracer)
+    else:
+        _set(_tracer, 'tracer', tracer)
 
 
 def set_opencensus_attr(attr_key, attr_value):
-    # If there is no attrs, initialize it to empty dict.
-    attrs = getattr(_get_context(), 'attrs', {})
+    # Copy the attrs instead of updating them, they may be shared with the
+    # context of other asyncio tasks.
+    attrs = dict(get_opencensus_attrs() or {})
 
     attrs[attr_key] = attr_value
 
-    setattr(_get_context(), 'attrs', attrs)
+    set_opencensus_attrs(attrs)
 
 
 def set_opencensus_attrs(attrs):
-    setattr(_get_context(), 'attrs', attrs)
+    if _get_context is None:
+        _attrs.set(attrs)
+    else:
+        _set(_attrs, 'attrs', attrs)
 
 
 def get_opencensus_attr(attr_key):
-    attrs = getattr(_get_context(), 'attrs', None)
+    attrs = get_opencensus_attrs()
 
     if attrs is not None:
         return attrs.get(attr_key)
@@ -60,11 +90,15 @@ def get_opencensus_attr(attr_key):
 
 
 def get_opencensus_attrs():
-    return getattr(_get_context(), 'attrs', None)
+    if _get_context is None:
+        return _attrs.get()
+    return _get(_attrs, 'attrs')
 
 
 def get_current_span():
-    return getattr(_get_context(), 'current_span', None)
+    if _get_context is None:
+        return _current_span.get()
+    return _get(_current_span, 'current_span')
 
 
 def set_current_span(current_span):
@@ -72,7 +106,10 @@ def set_current_span(current_span):
     for cb in _span_created_callbacks:
         cb(current_span)
 
-    setattr(_get_context(), 'current_span', current_span)
+    if _get_context is None:
+        _current_span.set(current_span)
+    else:
+        _set(_current_span, 'current_span', current_span)
 
 
 def add_current_span_set_callback(cb):
@@ -98,13 +135,19 @@ def set_opencensus_full_context(tracer, span, attrs):
 
 
 def clean():
-    setattr(_get_context(), 'attrs', {})
-    if hasattr(_get_context(), 'current_span'):
-        delattr(_get_context(), 'current_span')
-    if hasattr(_get_context(), 'tracer'):
-        delattr(_get_context(), 'tracer')
+    set_opencensus_attrs({})
+    set_opencensus_tracer(None)
+    if _get_context is None:
+        _current_span.set(None)
+    else:
+        _set(_current_span, 'current_span', None)
 
 
 def clear():
-    """Clear the thread local, used in test."""
-    _get_context().__dict__.clear()
+    """Clear the execution context, used in test."""
+    set_opencensus_attrs(None)
+    set_opencensus_tracer(None)
+    if _get_context is None:
+        _current_span.set(None)
+    else:
+        _set(_current_span, 'current_span', None)
@@ -24,7 +24,12 @@ DEFAULT_FILENAME = 'opencensus-traces.json'
 
 
 class FileExporter(base.Exporter):
-    """
+    """Write each batch of spans to a file as JSON.
+
+    Each batch replaces the previous one with the default file mode. See
+    :class:`~opencensus.trace.exporters.span_log.SpanLogExporter` to keep
+    every span in an append-only log.
+
     :type file_name: str
     :param file_name: The name of the output file.
 
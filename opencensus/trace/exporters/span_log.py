@@ -0,0 +1,350 @@
+# Copyright 2019, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Export the trace spans to binary log files, and read them back.
+
+Spans are appended to segment files as OpenCensus trace protos, each
+prefixed with its size as a varint like protobuf's delimited format. The
+writer starts a new segment when the current one gets too large or too old.
+"""
+
+import atexit
+import io
+import logging
+import mmap
+import os
+import threading
+import time
+
+from opencensus.common.transports import sync
+from opencensus.trace.exporters import base
+from opencensus.trace.exporters.gen.opencensus.trace.v1 import trace_pb2
+from opencensus.trace.exporters.ocagent import utils
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PREFIX = 'opencensus-spans'
+_SEGMENT_SUFFIX = '.pb'
+_DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+_DEFAULT_MAX_AGE = 3600.0  # Seconds
+_DEFAULT_BUFFER_SIZE = 64 * 1024  # Bytes
+
+
+def _encode_varint(value):
+    """Encode an unsigned int as a protobuf varint.
+
+    :rtype: bytes
+    """
+    data = bytearray()
+    while value > 0x7f:
+        data.append((value & 0x7f) | 0x80)
+        value >>= 7
+    data.append(value)
+    return bytes(data)
+
+
+def _decode_varint(data, offset):
+    """Decode the protobuf varint starting at ``offset``.
+
+    :rtype: tuple
+    :returns: The value and the offset following it, or None if the data
+              ends before the varint.
+    """
+    value = 0
+    shift = 0
+    while offset < len(data):
+        byte = bytearray(data[offset:offset + 1])[0]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+    return None
+
+
+class SpanLogWriter(object):
+    """Append spans to rotating segment files.
+
+    Segments are named after ``prefix``, the time they were started and the
+    id of the process, so that they sort in the order they were written.
+    Writes are buffered, call :meth:`flush` to write the buffered spans to
+    the current segment.
+
+    Forked child processes drop the spans buffered by their parent, which
+    the parent writes itself, and start segments of their own.
+
+    :type directory: str
+    :param directory: The directory to write segments to, created if needed.
+
+    :type prefix: str
+    :param prefix: The prefix of the names of the segments.
+
+    :type max_bytes: int
+    :param max_bytes: The size at which a new segment is started.
+
+    :type max_age: float
+    :param max_age: The number of seconds after which a new segment is
+                    started.
+
+    :type buffer_size: int
+    :param buffer_size: The size of the write buffer.
+    """
+
+    def __init__(self, directory, prefix=DEFAULT_PREFIX,
+                 max_bytes=_DEFAULT_MAX_BYTES, max_age=_DEFAULT_MAX_AGE,
+                 buffer_size=_DEFAULT_BUFFER_SIZE):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        if max_age <= 0:
+            raise ValueError("max_age must be positive")
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self.directory = directory
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.buffer_size = buffer_size
+        self._lock = threading.Lock()
+        self._buffer = bytearray()
+        self._file = None
+        self._file_path = None
+        self._file_size = 0
+        self._file_deadline = None
+        self._pid = None
+
+    @property
+    def current_segment(self):
+        """the path of the segment being written, or None"""
+        return self._file_path
+
+    def _open_segment(self, now):
+        self._file_path = os.path.join(
+            self.directory, '{}-{:016d}-{}{}'.format(
+                self.prefix, int(now * 1e6), os.getpid(), _SEGMENT_SUFFIX))
+        # Unbuffered, the buffer is kept separately so that forked children
+        # can drop it without writing it. FileIO.write returns the number of
+        # bytes written, unlike the Python 2 file.write.
+        self._file = io.open(self._file_path, 'ab', buffering=0)
+        self._file_size = 0
+        self._file_deadline = now + self.max_age
+        self._pid = os.getpid()
+
+    def _check_fork(self):
+        """Drop the buffer and the segment inherited from the parent
+        process."""
+        if self._file is not None and self._pid != os.getpid():
+            del self._buffer[:]
+            self._file.close()
+            self._file = None
+            self._file_path = None
+
+    def _flush(self):
+        data = bytes(self._buffer)
+        written = 0
+        while written < len(data):
+            written += self._file.write(data[written:])
+        del self._buffer[:]
+
+    def _close_segment(self):
+        if self._file is not None:
+            self._flush()
+            self._file.close()
+            self._file = None
+            self._file_path = None
+
+    def write(self, span_datas):
+        """Append spans to the current segment.
+
+        :type span_datas: list of :class:
+            `~opencensus.trace.span_data.SpanData`
+        :param span_datas: SpanData tuples to write.
+        """
+        records = []
+        for span_data in span_datas:
+            payload = utils.translate_to_trace_proto(
+                span_data).SerializeToString()
+            records.append(_encode_varint(len(payload)))
+            records.append(payload)
+        data = b''.join(records)
+
+        with self._lock:
+            self._check_fork()
+            now = time.time()
+            if self._file is not None and (
+                    self._file_size >= self.max_bytes or
+                    now >= self._file_deadline):
+                self._close_segment()
+            if self._file is None:
+                self._open_segment(now)
+            self._buffer += data
+            self._file_size += len(data)
+            if len(self._buffer) >= self.buffer_size:
+                self._flush()
+
+    def flush(self):
+        """Write the buffered spans to the current segment."""
+        with self._lock:
+            self._check_fork()
+            if self._file is not None:
+                self._flush()
+
+    def close(self):
+        """Flush and close the current segment."""
+        with self._lock:
+            self._check_fork()
+            self._close_segment()
+
+
+class SpanLogReader(object):
+    """Iterate over the spans of a segment.
+
+    Spans are read up to the end of the segment, or to a span that was only
+    partly written. Segments can be read while they are written to.
+
+    :type path: str
+    :param path: The path of the segment.
+
+    :type use_mmap: bool
+    :param use_mmap: Map the segment in memory instead of reading it, so
+                     that large segments are not loaded in memory at once.
+    """
+
+    def __init__(self, path, use_mmap=False):
+        self.path = path
+        self.use_mmap = use_mmap
+
+    def __iter__(self):
+        with open(self.path, 'rb') as segment:
+            if not self.use_mmap:
+                data = segment.read()
+                for span in self._iter_spans(data):
+                    yield span
+                return
+
+            if os.fstat(segment.fileno()).st_size == 0:
+                return
+            data = mmap.mmap(segment.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                for span in self._iter_spans(data):
+                    yield span
+            finally:
+                data.close()
+
+    def _iter_spans(self, data):
+        """Parse the size-prefixed spans of a segment.
+
+        :rtype: iterator
+        :returns: :class:`~opencensus.proto.trace.Span` messages.
+        """
+        offset = 0
+        size = len(data)
+        while offset < size:
+            decoded = _decode_varint(data, offset)
+            if decoded is None:
+                break
+            length, start = decoded
+            end = start + length
+            if end > size:
+                break
+            yield trace_pb2.Span.FromString(data[start:end])
+            offset = end
+        if offset < size:
+            logger.warning('Ignoring truncated span at the end of %s.',
+                           self.path)
+
+
+def iter_span_log(directory, prefix=DEFAULT_PREFIX, use_mmap=False):
+    """Iterate over the spans of all the segments of a directory, oldest
+    segment first.
+
+    :type directory: str
+    :param directory: The directory the segments were written to.
+
+    :type prefix: str
+    :param prefix: The prefix of the names of the segments.
+
+    :type use_mmap: bool
+    :param use_mmap: Map the segments in memory instead of reading them.
+
+    :rtype: iterator
+    :returns: :class:`~opencensus.proto.trace.Span` messages.
+    """
+    names = sorted(
+        name for name in os.listdir(directory)
+        if name.startswith(prefix + '-') and name.endswith(_SEGMENT_SUFFIX))
+    for name in names:
+        for span in SpanLogReader(os.path.join(directory, name), use_mmap):
+            yield span
+
+
+class SpanLogExporter(base.Exporter):
+    """Export the spans to a binary span log.
+
+    Unlike :class:`~opencensus.trace.exporters.file_exporter.FileExporter`,
+    spans are appended to the log rather than overwriting the previous
+    batch, and are stored as trace protos. Read them back with
+    :func:`iter_span_log`.
+
+    :type directory: str
+    :param directory: The directory to write segments to.
+
+    :type transport: :class:`type`
+    :param transport: Class for creating new transport objects. It should
+                      extend from the base :class:`.Transport` type and
+                      implement :meth:`.Transport.export`. Defaults to
+                      :class:`.SyncTransport`. The other option is
+                      :class:`.AsyncTransport`.
+
+    :type prefix: str
+    :param prefix: The prefix of the names of the segments.
+
+    :type max_bytes: int
+    :param max_bytes: The size at which a new segment is started.
+
+    :type max_age: float
+    :param max_age: The number of seconds after which a new segment is
+                    started.
+
+    :type buffer_size: int
+    :param buffer_size: The size of the write buffer. Buffered spans are
+                        written when the process exits.
+    """
+
+    def __init__(self, directory, transport=sync.SyncTransport,
+                 prefix=DEFAULT_PREFIX, max_bytes=_DEFAULT_MAX_BYTES,
+                 max_age=_DEFAULT_MAX_AGE, buffer_size=_DEFAULT_BUFFER_SIZE):
+        self.writer = SpanLogWriter(
+            directory, prefix, max_bytes, max_age, buffer_size)
+        # Registered before the transport, so that handlers of asynchronous
+        # transports export their pending spans before the log is closed
+        atexit.register(self.writer.close)
+        self.transport = transport(self)
+
+    def emit(self, span_datas):
+        """
+        :type span_datas: list of :class:
+            `~opencensus.trace.span_data.SpanData`
+        :param list of opencensus.trace.span_data.SpanData span_datas:
+            SpanData tuples to emit
+        """
+        self.writer.write(span_datas)
+
+    def export(self, span_datas):
+        """
+        :type span_datas: list of :class:
+            `~opencensus.trace.span_data.SpanData`
+        :param list of opencensus.trace.span_data.SpanData span_datas:
+            SpanData tuples to export
+        """
+        self.transport.export(span_datas)
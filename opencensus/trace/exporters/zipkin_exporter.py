@@ -66,6 +66,12 @@ class ZipkinExporter(base.Exporter):
                       implement :meth:`.Transport.export`. Defaults to
                       :class:`.SyncTransport`. The other option is
                       :class:`.AsyncTransport`.
+
+    :type raise_on_error: bool
+    :param raise_on_error: (Optional) Whether :meth:`emit` raises when the
+                           spans could not be sent, instead of logging the
+                           error. Set by transports retrying failed exports,
+                           such as :class:`.RetryingTransport`.
     """
 
     def __init__(
@@ -77,13 +83,15 @@ class ZipkinExporter(base.Exporter):
             protocol=DEFAULT_PROTOCOL,
             transport=sync.SyncTransport,
             ipv4=None,
-            ipv6=None):
+            ipv6=None,
+            raise_on_error=False):
         self.service_name = service_name
         self.host_name = host_name
         self.port = port
         self.endpoint = endpoint
         self.protocol = protocol
         self.url = self.get_url
+        self.raise_on_error = raise_on_error
         self.transport = transport(self)
         self.ipv4 = ipv4
         self.ipv6 = ipv6
@@ -103,8 +111,10 @@ class ZipkinExporter(base.Exporter):
             `~opencensus.trace.span_data.SpanData`
         :param list of opencensus.trace.span_data.SpanData span_datas:
             SpanData tuples to emit
-        """
 
+        :raises: :class:`requests.exceptions.RequestException` if the spans
+                 could not be sent and ``raise_on_error`` is set.
+        """
         try:
             zipkin_spans = self.translate_to_zipkin(span_datas)
             result = requests.post(
@@ -113,10 +123,13 @@ class ZipkinExporter(base.Exporter):
                 headers=ZIPKIN_HEADERS)
 
             if result.status_code not in SUCCESS_STATUS_CODE:
-                logging.error(
-                    "Failed to send spans to Zipkin server! Spans are {}"
-                    .format(zipkin_spans))
-        except Exception as e:  # pragma: NO COVER
+                raise requests.exceptions.HTTPError(
+                    'Failed to send {} spans to Zipkin server, status code {}'
+                    .format(len(zipkin_spans), result.status_code),
+                    response=result)
+        except Exception as e:
+            if self.raise_on_error:
+                raise
             logging.error(getattr(e, 'message', e))
 
     def export(self, span_datas):
@@ -67,10 +67,8 @@ def trace_tornado():
 
 
 def _get_context():
-    context = _TracerRequestContextManager.current_context()
-    if context is None:
-        return execution_context._thread_local
-    return context
+    # Outside of requests, the default execution context is used
+    return _TracerRequestContextManager.current_context()
 
 
 def _init(__init__, app, args, kwargs):
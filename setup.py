@@ -18,7 +18,7 @@ from setuptools import setup
 
 extras = {
     "stackdriver": ['google-cloud-trace>=0.20.1, <0.30'],
-    "prometheus_client": ['prometheus_client==0.3.1'],
+    "prometheus_client": ['prometheus_client==0.5.0'],
     "requests": ['wrapt==1.10.11']
 }
 
@@ -0,0 +1,72 @@
+# Copyright 2019, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import unittest
+
+from opencensus.common import runtime_context
+
+contextvars = runtime_context.contextvars
+
+
+class TestContextVar(unittest.TestCase):
+    @unittest.skipIf(contextvars is None, "contextvars is not available")
+    def test_context_var(self):
+        var = runtime_context.context_var('test', default='default')
+        self.assertIsInstance(var, contextvars.ContextVar)
+        self.assertEqual(var.name, 'test')
+        self.assertEqual(var.get(), 'default')
+
+    @unittest.skipIf(contextvars is None, "contextvars is not available")
+    def test_context_isolation(self):
+        var = runtime_context.context_var('test')
+        var.set('parent')
+        seen = []
+
+        def child():
+            # Tasks start with the values of the context they are created in
+            seen.append(var.get())
+            var.set('child')
+            seen.append(var.get())
+
+        contextvars.copy_context().run(child)
+
+        self.assertEqual(seen, ['parent', 'child'])
+        self.assertEqual(var.get(), 'parent')
+
+
+class TestThreadLocalVar(unittest.TestCase):
+    def test_get_set(self):
+        var = runtime_context.ThreadLocalVar('test', default='default')
+        self.assertEqual(var.name, 'test')
+        self.assertEqual(var.get(), 'default')
+
+        var.set('value')
+        self.assertEqual(var.get(), 'value')
+
+    def test_thread_isolation(self):
+        var = runtime_context.ThreadLocalVar('test')
+        var.set('main')
+        seen = []
+
+        def target():
+            seen.append(var.get())
+            var.set('thread')
+
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join()
+
+        self.assertEqual(seen, [None])
+        self.assertEqual(var.get(), 'main')
@@ -19,11 +19,6 @@ import mock
 from opencensus.common.transports import async_
 
 
-# Don't let workers wait between exports in testing
-wait_period_patch = mock.patch(
-    'opencensus.common.transports.async_._WAIT_PERIOD', 0)
-
-
 class Test_Worker(unittest.TestCase):
 
     def _start_worker(self, worker):
@@ -84,6 +79,69 @@ class Test_Worker(unittest.TestCase):
         # If thread not alive, do not stop twice.
         worker.stop()
 
+    def test_enqueue_after_fork(self):
+        worker = async_._Worker(mock.Mock())
+        self._start_worker(worker)
+        worker.enqueue([1])
+        parent_thread = worker._thread
+        parent_queue = worker._queue
+
+        # The thread of the parent does not run in the child process
+        parent_thread.stop()
+        with mock.patch('os.getpid', return_value=worker._pid + 1):
+            with mock.patch('threading.Thread', new=_Thread):
+                with mock.patch('atexit.register'):
+                    worker.enqueue([2])
+
+                    self.assertTrue(worker.is_alive)
+                    self.assertIsNot(worker._thread, parent_thread)
+                    self.assertIsNot(worker._queue, parent_queue)
+                    # Data queued in the parent is discarded
+                    self.assertEqual(worker._queue.get_nowait(), [2])
+                    self.assertEqual(worker.enqueued_count, 1)
+
+                    thread = worker._thread
+                    worker.enqueue([3])
+                    self.assertIs(worker._thread, thread)
+
+    def test_flush_after_fork(self):
+        worker = async_._Worker(mock.Mock())
+        self._start_worker(worker)
+        worker.enqueue([1])
+        worker._thread.stop()
+
+        with mock.patch('os.getpid', return_value=worker._pid + 1):
+            with mock.patch.object(async_._Worker, '_start') as mock_start:
+                # Does not wait for the queue of the parent to be drained
+                worker.flush()
+
+        mock_start.assert_called_once_with()
+        self.assertEqual(worker.queue_size, 0)
+
+    def test_enqueue_not_started(self):
+        worker = async_._Worker(mock.Mock())
+
+        with mock.patch('os.getpid', return_value=-1):
+            worker.enqueue([1])
+
+        self.assertFalse(worker.is_alive)
+        self.assertEqual(worker.queue_size, 1)
+
+    def test__after_fork_in_child(self):
+        worker = async_._Worker(mock.Mock())
+        self._start_worker(worker)
+        worker.enqueue([1])
+        lock = worker._lock
+        lock.acquire()
+
+        async_._after_fork_in_child()
+
+        self.assertIsNot(worker._lock, lock)
+        self.assertFalse(worker._lock.locked())
+        self.assertIsNone(worker._thread)
+        self.assertEqual(worker.queue_size, 0)
+        self.assertEqual(worker.enqueued_count, 0)
+
     def test__export_pending_data(self):
         exporter = mock.Mock()
         worker = async_._Worker(exporter)
@@ -133,8 +191,7 @@ class Test_Worker(unittest.TestCase):
         worker.enqueue(trace2)
         worker._queue.put_nowait(async_._WORKER_TERMINATOR)
 
-        with wait_period_patch:
-            worker._thread_main()
+        worker._thread_main()
 
         self.assertTrue(worker.exporter.emit.called)
         self.assertEqual(worker._queue.qsize(), 0)
@@ -169,8 +226,7 @@ class Test_Worker(unittest.TestCase):
 
         worker._queue.put_nowait(async_._WORKER_TERMINATOR)
 
-        with wait_period_patch:
-            worker._thread_main()
+        worker._thread_main()
 
         self.assertEqual(worker._queue.qsize(), 0)
 
@@ -199,8 +255,7 @@ class Test_Worker(unittest.TestCase):
         worker.enqueue(span_data1)
         worker.enqueue(span_data2)
 
-        with wait_period_patch:
-            worker._thread_main()
+        worker._thread_main()
 
         self.assertEqual(exporter.exported, [span_data1])
 
@@ -232,8 +287,7 @@ class Test_Worker(unittest.TestCase):
         worker.enqueue(span_data2)
         worker.enqueue(async_._WORKER_TERMINATOR)
 
-        with wait_period_patch:
-            worker._thread_main()
+        worker._thread_main()
 
         # Span 2 should throw an exception, only span 0 and 1 are left
         self.assertEqual(exporter.exported, span_data0 + span_data1)
@@ -246,6 +300,146 @@ class Test_Worker(unittest.TestCase):
         # and the data was dropped.
         self.assertEqual(worker._queue.qsize(), 0)
 
+    def test_constructor_invalid_queue_options(self):
+        with self.assertRaises(ValueError):
+            async_._Worker(mock.Mock(), max_queue_size=-1)
+        with self.assertRaises(ValueError):
+            async_._Worker(mock.Mock(), drop_policy=3)
+
+    def test_enqueue_drop_newest(self):
+        worker = async_._Worker(mock.Mock(), max_queue_size=2)
+
+        worker.enqueue([1])
+        worker.enqueue([2])
+        worker.enqueue([3])
+
+        self.assertEqual(worker.queue_size, 2)
+        self.assertEqual(worker._queue.get_nowait(), [1])
+        self.assertEqual(worker._queue.get_nowait(), [2])
+        self.assertEqual(worker.enqueued_count, 2)
+        self.assertEqual(worker.dropped_count, 1)
+
+    def test_enqueue_drop_oldest(self):
+        worker = async_._Worker(
+            mock.Mock(), max_queue_size=2,
+            drop_policy=async_.DropPolicy.DROP_OLDEST)
+
+        worker.enqueue([1])
+        worker.enqueue([2])
+        worker.enqueue([3])
+
+        self.assertEqual(worker.queue_size, 2)
+        self.assertEqual(worker._queue.get_nowait(), [2])
+        self.assertEqual(worker._queue.get_nowait(), [3])
+        self.assertEqual(worker.enqueued_count, 3)
+        self.assertEqual(worker.dropped_count, 1)
+
+    def test_enqueue_drop_oldest_keeps_terminator(self):
+        worker = async_._Worker(
+            mock.Mock(), max_queue_size=1,
+            drop_policy=async_.DropPolicy.DROP_OLDEST)
+
+        worker.enqueue(async_._WORKER_TERMINATOR)
+        worker.enqueue([1])
+
+        self.assertEqual(worker.queue_size, 1)
+        self.assertIs(worker._queue.get_nowait(), async_._WORKER_TERMINATOR)
+        self.assertEqual(worker.enqueued_count, 0)
+        self.assertEqual(worker.dropped_count, 1)
+
+    def test_enqueue_block(self):
+        worker = async_._Worker(
+            mock.Mock(), max_queue_size=1,
+            drop_policy=async_.DropPolicy.BLOCK, block_timeout=0.01)
+        worker._queue = mock.Mock(wraps=worker._queue)
+
+        worker.enqueue([1])
+        worker.enqueue([2])
+
+        worker._queue.put.assert_called_with([2], timeout=0.01)
+        self.assertEqual(worker.queue_size, 1)
+        self.assertEqual(worker.enqueued_count, 1)
+        self.assertEqual(worker.dropped_count, 1)
+
+    def test_stop_full_queue(self):
+        worker = async_._Worker(mock.Mock(), grace_period=0.01,
+                                max_queue_size=1)
+        self._start_worker(worker)
+        worker.enqueue([1])
+
+        self.assertFalse(worker.stop())
+        self.assertTrue(worker.is_alive)
+
+    def test_counters(self):
+        exporter = mock.Mock()
+        exporter.emit.side_effect = [None, Exception]
+        worker = async_._Worker(exporter, max_batch_size=2)
+
+        worker.enqueue([1])
+        worker.enqueue([2])
+        worker.enqueue([3])
+        worker.enqueue(async_._WORKER_TERMINATOR)
+
+        with mock.patch('logging.exception'):
+            worker._thread_main()
+
+        self.assertEqual(worker.enqueued_count, 3)
+        self.assertEqual(worker.exported_count, 2)
+        self.assertEqual(worker.dropped_count, 1)
+        self.assertGreaterEqual(worker.export_latency, 0)
+
+    def test_counters_not_emitted(self):
+        exporter = mock.Mock()
+        exporter.emit.side_effect = [async_.NotEmittedError(spilled=True),
+                                     async_.NotEmittedError()]
+        worker = async_._Worker(exporter, max_batch_size=1)
+
+        worker.enqueue([1])
+        worker.enqueue([2])
+        worker.enqueue(async_._WORKER_TERMINATOR)
+
+        with mock.patch('logging.exception') as mock_log:
+            worker._thread_main()
+
+        # The exporter already logged why the batches were not emitted
+        mock_log.assert_not_called()
+        self.assertEqual(worker.exported_count, 0)
+        self.assertEqual(worker.spilled_count, 1)
+        self.assertEqual(worker.dropped_count, 1)
+
+    def test_get_metrics_registry(self):
+        worker = async_._Worker(mock.Mock(), max_queue_size=1)
+        worker.enqueue([1])
+        worker.enqueue([2])
+
+        registry = worker.get_metrics_registry()
+
+        metrics = {metric.descriptor.name: metric
+                   for metric in registry.get_metrics()}
+        self.assertEqual(set(metrics), {
+            'opencensus.io/transport/queue_size',
+            'opencensus.io/transport/enqueued',
+            'opencensus.io/transport/dropped',
+            'opencensus.io/transport/spilled',
+            'opencensus.io/transport/exported',
+            'opencensus.io/transport/export_latency',
+        })
+        dropped = metrics['opencensus.io/transport/dropped']
+        [time_series] = dropped.time_series
+        self.assertEqual(time_series.label_values[0].value, 'Mock')
+        self.assertEqual(time_series.points[0].value.value, 1)
+
+    def test_get_metrics_registry_exporter_name(self):
+        worker = async_._Worker(mock.Mock())
+        worker.exporter_name = 'ZipkinExporter'
+
+        registry = worker.get_metrics_registry()
+
+        for metric in registry.get_metrics():
+            [time_series] = metric.time_series
+            self.assertEqual(time_series.label_values[0].value,
+                             'ZipkinExporter')
+
     def test_flush(self):
         from six.moves import queue
 
@@ -257,6 +451,74 @@ class Test_Worker(unittest.TestCase):
         worker.flush()
         worker._queue.join.assert_called()
 
+    def test_flush_running_worker(self):
+        from six.moves import queue
+
+        worker = async_._Worker(mock.Mock())
+        worker._queue = mock.Mock(spec=queue.Queue)
+        worker._thread = mock.Mock()
+
+        worker.flush()
+
+        worker._queue.put.assert_called_once_with(async_._WORKER_FLUSH)
+        worker._queue.join.assert_called()
+
+    def test__get_items_batch_size_reached(self):
+        worker = async_._Worker(mock.Mock(), max_batch_size=2,
+                                max_latency=60)
+        worker.enqueue([1])
+        worker.enqueue([2])
+        worker.enqueue([3])
+
+        # A full batch is sent without waiting for max_latency
+        self.assertEqual(worker._get_items(), [[1], [2]])
+        self.assertEqual(worker._queue.qsize(), 1)
+
+    def test__get_items_max_latency_elapsed(self):
+        worker = async_._Worker(mock.Mock(), max_latency=0.01)
+        worker.enqueue([1])
+
+        with mock.patch.object(worker._queue, 'get',
+                               wraps=worker._queue.get) as mock_get:
+            self.assertEqual(worker._get_items(), [[1]])
+
+        # Waits for more data until max_latency after the first item
+        _, kwargs = mock_get.call_args
+        self.assertGreater(kwargs['timeout'], 0)
+        self.assertLessEqual(kwargs['timeout'], 0.01)
+
+    def test__get_items_exiting(self):
+        worker = async_._Worker(mock.Mock(), max_latency=60)
+        worker.enqueue([1])
+        worker.enqueue([2])
+        worker._event.set()
+
+        # Pending data is drained without waiting for max_latency
+        self.assertEqual(worker._get_items(), [[1], [2]])
+
+    def test__get_items_flush(self):
+        worker = async_._Worker(mock.Mock(), max_latency=60)
+        worker.enqueue([1])
+        worker._queue.put(async_._WORKER_FLUSH)
+
+        # Flushing sends the batch without waiting for max_latency
+        self.assertEqual(worker._get_items(), [[1], async_._WORKER_FLUSH])
+
+    def test__thread_main_flush(self):
+        exporter = mock.Mock()
+        worker = async_._Worker(exporter)
+        worker.enqueue([1])
+        worker._queue.put(async_._WORKER_FLUSH)
+        worker.enqueue([2])
+        worker.enqueue(async_._WORKER_TERMINATOR)
+
+        worker._thread_main()
+
+        exporter.emit.assert_called_once_with([1, 2])
+        self.assertEqual(worker.enqueued_count, 2)
+        self.assertEqual(worker.exported_count, 2)
+        self.assertEqual(worker._queue.qsize(), 0)
+
 
 class TestAsyncTransport(unittest.TestCase):
 
@@ -303,6 +565,139 @@ class TestAsyncTransport(unittest.TestCase):
 
             self.assertTrue(transport.worker.flush.called)
 
+    def test_get_metrics_registry(self):
+        patch_worker = mock.patch(
+            'opencensus.common.transports.async_._Worker',
+            autospec=True)
+        exporter = mock.Mock()
+
+        with patch_worker:
+            transport = async_.AsyncTransport(exporter)
+
+            registry = transport.get_metrics_registry()
+
+        self.assertIs(registry,
+                      transport.worker.get_metrics_registry.return_value)
+
+
+class TestWorkerPoolTransport(unittest.TestCase):
+
+    def _make_transport(self, exporter, **kwargs):
+        with mock.patch.object(async_._Worker, 'start') as mock_start:
+            transport = async_.WorkerPoolTransport(exporter, **kwargs)
+        self.assertEqual(mock_start.call_count, len(transport.workers))
+        return transport
+
+    @staticmethod
+    def _queued(worker):
+        items = []
+        while not worker._queue.empty():
+            items.append(worker._queue.get_nowait())
+        return items
+
+    def test_constructor(self):
+        exporter = mock.Mock()
+        transport = self._make_transport(
+            exporter, num_workers=3, max_batch_size=20, max_latency=1)
+
+        self.assertIs(transport.exporter, exporter)
+        self.assertEqual(len(transport.workers), 3)
+        for worker in transport.workers:
+            self.assertIs(worker.exporter, exporter)
+            self.assertEqual(worker._max_batch_size, 20)
+            self.assertEqual(worker._max_latency, 1)
+
+    def test_constructor_invalid_num_workers(self):
+        with self.assertRaises(ValueError):
+            async_.WorkerPoolTransport(mock.Mock(), num_workers=0)
+
+    def test_export_partitions_by_trace(self):
+        from opencensus.trace import span_context
+
+        transport = self._make_transport(mock.Mock(), num_workers=4)
+        spans = [
+            mock.Mock(context=span_context.SpanContext(trace_id=trace_id))
+            for trace_id in ['{:032x}'.format(ii % 8) for ii in range(32)]]
+
+        transport.export(spans[:16])
+        transport.export(spans[16:])
+
+        by_trace = {}
+        for index, worker in enumerate(transport.workers):
+            for item in self._queued(worker):
+                for span in item:
+                    by_trace.setdefault(
+                        span.context.trace_id, set()).add(index)
+        self.assertEqual(len(by_trace), 8)
+        for indexes in by_trace.values():
+            self.assertEqual(len(indexes), 1)
+
+    def test_export_keeps_order_within_trace(self):
+        from opencensus.trace import span_context
+
+        transport = self._make_transport(mock.Mock(), num_workers=2)
+        context = span_context.SpanContext(trace_id='1' * 32)
+        spans = [mock.Mock(context=context) for _ in range(3)]
+
+        transport.export(spans[:2])
+        transport.export(spans[2:])
+
+        queued = [span for worker in transport.workers
+                  for item in self._queued(worker) for span in item]
+        self.assertEqual(queued, spans)
+
+    def test_export_round_robin(self):
+        transport = self._make_transport(mock.Mock(), num_workers=2)
+
+        transport.export(['view_data1', 'view_data2', 'view_data3'])
+        transport.export('batch')
+
+        self.assertEqual(self._queued(transport.workers[0]),
+                         [['view_data1', 'view_data3']])
+        self.assertEqual(self._queued(transport.workers[1]),
+                         [['view_data2'], 'batch'])
+
+    def test_export_flush_stop(self):
+        from opencensus.trace import span_context
+
+        exported = []
+        exporter = mock.Mock()
+        exporter.emit.side_effect = exported.extend
+        with mock.patch('atexit.register'):
+            transport = async_.WorkerPoolTransport(
+                exporter, num_workers=3, max_latency=60)
+        spans = [
+            mock.Mock(context=span_context.SpanContext(
+                trace_id='{:032x}'.format(ii)))
+            for ii in range(10)]
+
+        transport.export(spans)
+        transport.flush()
+
+        self.assertEqual(sorted(exported, key=spans.index), spans)
+        self.assertTrue(transport.stop())
+        for worker in transport.workers:
+            self.assertFalse(worker.is_alive)
+
+    def test_get_metrics_registry(self):
+        transport = self._make_transport(mock.Mock(), num_workers=2)
+        transport.export(['view_data1', 'view_data2', 'view_data3'])
+        transport.workers[0]._export_latency = 2.0
+        transport.workers[1]._export_latency = 1.0
+
+        registry = transport.get_metrics_registry()
+
+        values = {metric.descriptor.name:
+                  metric.time_series[0].points[0].value.value
+                  for metric in registry.get_metrics()}
+        self.assertEqual(values['opencensus.io/transport/queue_size'], 2)
+        self.assertEqual(values['opencensus.io/transport/enqueued'], 2)
+        self.assertEqual(values['opencensus.io/transport/dropped'], 0)
+        self.assertEqual(values['opencensus.io/transport/spilled'], 0)
+        self.assertEqual(values['opencensus.io/transport/exported'], 0)
+        self.assertEqual(values['opencensus.io/transport/export_latency'],
+                         2.0)
+
 
 class _Thread(object):
 
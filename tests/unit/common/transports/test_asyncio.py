@@ -0,0 +1,149 @@
+# Copyright 2019, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import unittest
+
+import mock
+
+try:
+    import asyncio
+    from opencensus.common.transports import asyncio_
+except (ImportError, SyntaxError):  # pragma: NO COVER
+    asyncio_ = None
+
+
+@unittest.skipIf(asyncio_ is None, "asyncio is not available")
+class TestAsyncioTransport(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+
+    def test_constructor(self):
+        exporter = mock.Mock()
+        transport = asyncio_.AsyncioTransport(
+            exporter, grace_period=10, max_batch_size=20, loop=self.loop)
+
+        self.assertIs(transport.exporter, exporter)
+        self.assertEqual(transport._grace_period, 10)
+        self.assertEqual(transport._max_batch_size, 20)
+        self.assertFalse(transport.is_alive)
+
+    def test_export_without_loop(self):
+        exporter = mock.Mock()
+        transport = asyncio_.AsyncioTransport(exporter)
+
+        with mock.patch('opencensus.common.transports.asyncio_.logger') \
+                as mock_logger:
+            transport.export(['span'])
+
+        self.assertEqual(mock_logger.warning.call_count, 1)
+        self.assertIsNone(transport._loop)
+        self.assertIsNone(transport._task)
+        exporter.emit.assert_not_called()
+
+    def test_export_binds_running_loop(self):
+        exporter = mock.Mock()
+        transport = asyncio_.AsyncioTransport(exporter)
+
+        self.loop.call_soon(transport.export, ['span1'])
+        self.loop.call_soon(transport.export, ['span2'])
+        self.loop.run_until_complete(asyncio.sleep(0))
+
+        self.assertIs(transport._loop, self.loop)
+        self.assertTrue(transport.is_alive)
+        self.loop.run_until_complete(transport.flush())
+        exporter.emit.assert_called_once_with(['span1', 'span2'])
+        self.assertTrue(self.loop.run_until_complete(transport.stop()))
+
+    @unittest.skipIf(not hasattr(mock, 'AsyncMock'),
+                     "mock.AsyncMock is not available")
+    def test_coroutine_emit(self):
+        exporter = mock.Mock()
+        exporter.emit = mock.AsyncMock()
+        transport = asyncio_.AsyncioTransport(exporter, loop=self.loop)
+
+        transport.export(['span1'])
+        self.loop.run_until_complete(transport.flush())
+
+        exporter.emit.assert_awaited_once_with(['span1'])
+        self.assertTrue(self.loop.run_until_complete(transport.stop()))
+
+    def test_batches(self):
+        exporter = mock.Mock()
+        transport = asyncio_.AsyncioTransport(
+            exporter, max_batch_size=2, loop=self.loop)
+
+        for ii in range(3):
+            transport.export(['span{}'.format(ii)])
+        self.loop.run_until_complete(transport.flush())
+
+        self.assertEqual(exporter.emit.call_args_list, [
+            mock.call(['span0', 'span1']), mock.call(['span2'])])
+        self.assertTrue(self.loop.run_until_complete(transport.stop()))
+
+    def test_max_latency(self):
+        exporter = mock.Mock()
+        transport = asyncio_.AsyncioTransport(
+            exporter, max_latency=0.01, loop=self.loop)
+
+        transport.export(['span1'])
+        self.loop.run_until_complete(asyncio.sleep(0.1))
+
+        # The batch is sent once max_latency elapsed, without flushing
+        exporter.emit.assert_called_once_with(['span1'])
+        self.assertTrue(self.loop.run_until_complete(transport.stop()))
+
+    def test_emit_error(self):
+        exporter = mock.Mock()
+        exporter.emit.side_effect = [ValueError, None]
+        transport = asyncio_.AsyncioTransport(
+            exporter, max_batch_size=1, loop=self.loop)
+
+        transport.export(['span1'])
+        transport.export(['span2'])
+        with mock.patch.object(asyncio_.logger, 'exception') as mock_log:
+            self.loop.run_until_complete(transport.flush())
+
+        self.assertEqual(mock_log.call_count, 1)
+        self.assertEqual(exporter.emit.call_count, 2)
+        self.assertTrue(self.loop.run_until_complete(transport.stop()))
+
+    def test_stop(self):
+        exporter = mock.Mock()
+        transport = asyncio_.AsyncioTransport(exporter, loop=self.loop)
+        self.assertTrue(self.loop.run_until_complete(transport.stop()))
+        self.loop.run_until_complete(transport.flush())
+
+        transport.export(['span1'])
+        self.assertTrue(self.loop.run_until_complete(transport.stop()))
+
+        # Pending data is emitted before stopping
+        exporter.emit.assert_called_once_with(['span1'])
+        self.assertFalse(transport.is_alive)
+
+    def test_stop_timeout(self):
+        event = threading.Event()
+        exporter = mock.Mock()
+        exporter.emit.side_effect = lambda data: event.wait(5)
+        transport = asyncio_.AsyncioTransport(
+            exporter, grace_period=0.01, loop=self.loop)
+
+        transport.export(['span1'])
+        try:
+            self.assertFalse(self.loop.run_until_complete(transport.stop()))
+        finally:
+            event.set()
+        self.assertFalse(transport.is_alive)
@@ -0,0 +1,404 @@
+# Copyright 2019, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from opencensus.common.transports import async_
+from opencensus.common.transports import retry
+
+
+def _http_error(status_code):
+    error = Exception('HTTP error')
+    error.response = mock.Mock(status_code=status_code)
+    return error
+
+
+class Test_should_retry(unittest.TestCase):
+
+    def test_should_retry(self):
+        self.assertTrue(retry._should_retry(ValueError()))
+        self.assertTrue(retry._should_retry(_http_error(503)))
+        self.assertTrue(retry._should_retry(_http_error(429)))
+        self.assertTrue(retry._should_retry(_http_error(408)))
+        self.assertFalse(retry._should_retry(_http_error(400)))
+        self.assertFalse(retry._should_retry(_http_error(404)))
+
+
+class TestRetryBudget(unittest.TestCase):
+
+    def test_constructor_invalid(self):
+        with self.assertRaises(ValueError):
+            retry.RetryBudget(ratio=-1)
+        with self.assertRaises(ValueError):
+            retry.RetryBudget(max_tokens=0)
+
+    def test_budget(self):
+        budget = retry.RetryBudget(ratio=0.5, max_tokens=2)
+
+        self.assertTrue(budget.try_retry())
+        self.assertTrue(budget.try_retry())
+        self.assertFalse(budget.try_retry())
+
+        # Two successes pay for one retry
+        budget.on_success()
+        self.assertFalse(budget.try_retry())
+        budget.on_success()
+        self.assertTrue(budget.try_retry())
+
+        for _ in range(10):
+            budget.on_success()
+        self.assertEqual(budget.tokens, 2)
+
+
+class TestSpillDirectory(unittest.TestCase):
+
+    def setUp(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        self.path = os.path.join(tmpdir, 'spill')
+
+    def _names(self):
+        return sorted(os.listdir(self.path))
+
+    def test_constructor(self):
+        spill = retry.SpillDirectory(self.path, 100, 10)
+
+        self.assertTrue(os.path.isdir(self.path))
+        self.assertEqual(spill.max_bytes, 100)
+        self.assertEqual(spill.segment_bytes, 10)
+
+    def test_constructor_invalid(self):
+        with self.assertRaises(ValueError):
+            retry.SpillDirectory(self.path, 10, 100)
+        with self.assertRaises(ValueError):
+            retry.SpillDirectory(self.path, 10, 0)
+
+    def test_append_replay(self):
+        spill = retry.SpillDirectory(self.path)
+        spill.append(['span1'])
+        spill.append(['span2', 'span3'])
+
+        [name] = self._names()
+        self.assertTrue(name.endswith(retry._OPEN_SUFFIX))
+
+        emitted = []
+        self.assertTrue(spill.replay(emitted.append))
+
+        self.assertEqual(emitted, [['span1'], ['span2', 'span3']])
+        self.assertEqual(self._names(), [])
+
+        # Nothing left to replay
+        self.assertTrue(spill.replay(emitted.append))
+        self.assertEqual(len(emitted), 2)
+
+    def test_append_rolls_segments(self):
+        spill = retry.SpillDirectory(self.path, 10000, 10)
+
+        spill.append(['span1'])
+        spill.append(['span2'])
+
+        names = self._names()
+        self.assertEqual(len(names), 2)
+        for name in names:
+            self.assertTrue(name.endswith(retry._SEGMENT_SUFFIX))
+
+    def test_append_drops_oldest_segments(self):
+        spill = retry.SpillDirectory(self.path, 100, 10)
+
+        for ii in range(10):
+            spill.append(['span{}'.format(ii)])
+
+        total = sum(os.path.getsize(os.path.join(self.path, name))
+                    for name in self._names())
+        self.assertLessEqual(total, 100)
+        emitted = []
+        spill.replay(emitted.append)
+        self.assertEqual(emitted[-1], ['span9'])
+        self.assertNotIn(['span0'], emitted)
+
+    def test_replay_failure_keeps_remaining(self):
+        spill = retry.SpillDirectory(self.path)
+        spill.append(['span1'])
+        spill.append(['span2'])
+        spill.append(['span3'])
+
+        emit = mock.Mock(side_effect=[None, ValueError])
+        self.assertFalse(spill.replay(emit))
+
+        [name] = self._names()
+        self.assertTrue(name.endswith(retry._SEGMENT_SUFFIX))
+        emitted = []
+        self.assertTrue(spill.replay(emitted.append))
+        self.assertEqual(emitted, [['span2'], ['span3']])
+
+    def test_replay_drops_not_retryable(self):
+        spill = retry.SpillDirectory(self.path)
+        spill.append(['span1'])
+        spill.append(['span2'])
+
+        emit = mock.Mock(side_effect=[_http_error(400), None])
+        with mock.patch.object(retry.logger, 'warning'):
+            self.assertTrue(spill.replay(emit))
+
+        emit.assert_called_with(['span2'])
+        self.assertEqual(self._names(), [])
+
+    def test_replay_failure_requeues_segment(self):
+        spill = retry.SpillDirectory(self.path, 10000, 10)
+        spill.append(['span1'])
+        spill.append(['span2'])
+
+        # The failing segment is replayed after the next one
+        with mock.patch.object(retry.logger, 'warning'):
+            self.assertFalse(spill.replay(mock.Mock(side_effect=ValueError)))
+        emitted = []
+        self.assertTrue(spill.replay(emitted.append))
+
+        self.assertEqual(emitted, [['span2'], ['span1']])
+
+    def test_recover(self):
+        spill = retry.SpillDirectory(self.path, 10000, 10)
+        spill.append(['span1'])
+        spill.append(['span2'])
+        spill.append(['span3'])
+        [open_name, replay_name, _] = self._names()
+        os.rename(os.path.join(self.path, open_name),
+                  os.path.join(self.path, '1-123-1' + retry._OPEN_SUFFIX))
+        os.rename(os.path.join(self.path, replay_name),
+                  os.path.join(self.path, '2-1-1.123' + retry._REPLAY_SUFFIX))
+
+        with mock.patch('os.kill', side_effect=OSError(3, 'No such process')):
+            spill = retry.SpillDirectory(self.path)
+
+        names = self._names()
+        self.assertIn('1-123-1' + retry._SEGMENT_SUFFIX, names)
+        self.assertIn('2-1-1' + retry._SEGMENT_SUFFIX, names)
+        emitted = []
+        self.assertTrue(spill.replay(emitted.append))
+        self.assertEqual(len(emitted), 3)
+
+    def test_recover_skips_running_process(self):
+        spill = retry.SpillDirectory(self.path)
+        spill.append(['span1'])
+
+        retry.SpillDirectory(self.path)
+
+        [name] = self._names()
+        self.assertTrue(name.endswith(retry._OPEN_SUFFIX))
+
+    def test_max_bytes_counts_open_segments(self):
+        spill = retry.SpillDirectory(self.path, 100, 10)
+        spill.append(['span1'])
+        # Left open by another running process
+        with open(os.path.join(self.path, '0-{}-1{}'.format(
+                os.getpid(), retry._OPEN_SUFFIX)), 'wb') as segment:
+            segment.write(b'x' * 90)
+
+        with mock.patch.object(retry.logger, 'warning'):
+            spill.append(['span2'])
+
+        total = sum(os.path.getsize(os.path.join(self.path, name))
+                    for name in self._names())
+        self.assertLessEqual(total, 100)
+
+    def test_replay_skips_claimed_segment(self):
+        spill = retry.SpillDirectory(self.path)
+        spill.append(['span1'])
+        emit = mock.Mock()
+
+        with mock.patch('os.rename', side_effect=[None, OSError]):
+            self.assertTrue(spill.replay(emit))
+
+        emit.assert_not_called()
+
+    def test_replay_truncated_segment(self):
+        spill = retry.SpillDirectory(self.path)
+        spill.append(['span1'])
+        spill.append(['span2'])
+        spill._close_segment()
+        [name] = self._names()
+        with open(os.path.join(self.path, name), 'rb+') as segment:
+            segment.truncate(os.path.getsize(segment.name) - 1)
+
+        emitted = []
+        with mock.patch.object(retry.logger, 'warning'):
+            self.assertTrue(spill.replay(emitted.append))
+
+        self.assertEqual(emitted, [['span1']])
+
+    def test_append_after_fork(self):
+        spill = retry.SpillDirectory(self.path)
+        spill.append(['span1'])
+        parent_file = spill._file
+
+        with mock.patch('os.getpid', return_value=spill._pid + 1):
+            spill.append(['span2'])
+
+        self.assertTrue(parent_file.closed)
+        self.assertEqual(len(self._names()), 2)
+
+
+class TestRetryingTransport(unittest.TestCase):
+
+    def _make_transport(self, exporter, **kwargs):
+        with mock.patch('opencensus.common.transports.async_._Worker',
+                        autospec=True):
+            return retry.RetryingTransport(exporter, **kwargs)
+
+    def test_constructor(self):
+        exporter = mock.Mock()
+        transport = self._make_transport(exporter, max_latency=1)
+
+        self.assertIs(transport.exporter, exporter)
+        self.assertIs(transport.emitter.exporter, exporter)
+        self.assertTrue(transport.worker.start.called)
+        self.assertIsNone(transport.emitter._spill)
+
+    def test_constructor_invalid(self):
+        with self.assertRaises(ValueError):
+            self._make_transport(mock.Mock(), max_attempts=0)
+
+    @mock.patch('time.sleep')
+    def test_emit_retries(self, mock_sleep):
+        exporter = mock.Mock()
+        exporter.emit.side_effect = [ValueError, ValueError, None]
+        transport = self._make_transport(
+            exporter, initial_backoff=1, max_backoff=1.5)
+
+        transport.emitter.emit(['span1'])
+
+        self.assertEqual(exporter.emit.call_count, 3)
+        [first], [second] = [args for args, _ in mock_sleep.call_args_list]
+        self.assertTrue(0.5 <= first <= 1)
+        self.assertTrue(0.75 <= second <= 1.5)
+
+    @mock.patch('time.sleep')
+    def test_emit_max_attempts(self, mock_sleep):
+        exporter = mock.Mock()
+        exporter.emit.side_effect = ValueError
+        transport = self._make_transport(exporter, max_attempts=3)
+
+        with self.assertRaises(ValueError):
+            transport.emitter.emit(['span1'])
+
+        self.assertEqual(exporter.emit.call_count, 3)
+
+    @mock.patch('time.sleep')
+    def test_emit_not_retryable(self, mock_sleep):
+        exporter = mock.Mock()
+        exporter.emit.side_effect = _http_error(400)
+        transport = self._make_transport(exporter)
+
+        with self.assertRaises(Exception):
+            transport.emitter.emit(['span1'])
+
+        self.assertEqual(exporter.emit.call_count, 1)
+
+    def test_emit_not_retryable_not_spilled(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        exporter = mock.Mock()
+        exporter.emit.side_effect = _http_error(400)
+        transport = self._make_transport(exporter, spill_dir=tmpdir)
+
+        with mock.patch.object(retry.logger, 'warning'):
+            with self.assertRaises(async_.NotEmittedError) as context:
+                transport.emitter.emit(['span1'])
+
+        self.assertFalse(context.exception.spilled)
+        self.assertEqual(exporter.emit.call_count, 1)
+        self.assertEqual(os.listdir(tmpdir), [])
+
+    @mock.patch('time.sleep')
+    def test_worker_counts_and_labels(self, mock_sleep):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        exporter = mock.Mock()
+        exporter.emit.side_effect = [ValueError, ValueError, _http_error(400)]
+        transport = self._make_transport(
+            exporter, max_attempts=2, spill_dir=tmpdir)
+        worker = async_._Worker(transport.emitter, max_batch_size=1)
+        worker.exporter_name = transport.worker.exporter_name
+
+        worker.enqueue(['span1'])
+        worker.enqueue(['span2'])
+        worker.enqueue(async_._WORKER_TERMINATOR)
+        with mock.patch.object(retry.logger, 'warning'):
+            worker._thread_main()
+
+        self.assertEqual(worker.exported_count, 0)
+        self.assertEqual(worker.spilled_count, 1)
+        self.assertEqual(worker.dropped_count, 1)
+        self.assertEqual(worker.exporter_name, 'Mock')
+        for metric in worker.get_metrics_registry().get_metrics():
+            [time_series] = metric.time_series
+            self.assertEqual(time_series.label_values[0].value, 'Mock')
+
+    def test_constructor_sets_raise_on_error(self):
+        from opencensus.trace.exporters import zipkin_exporter
+
+        exporter = zipkin_exporter.ZipkinExporter(
+            transport=lambda exporter: self._make_transport(exporter))
+
+        self.assertTrue(exporter.raise_on_error)
+
+    @mock.patch('time.sleep')
+    def test_emit_budget_exhausted(self, mock_sleep):
+        exporter = mock.Mock()
+        exporter.emit.side_effect = ValueError
+        budget = retry.RetryBudget(max_tokens=2)
+        transport = self._make_transport(exporter, retry_budget=budget)
+
+        with self.assertRaises(ValueError):
+            transport.emitter.emit(['span1'])
+        with self.assertRaises(ValueError):
+            transport.emitter.emit(['span2'])
+
+        self.assertEqual(exporter.emit.call_count, 4)
+
+    @mock.patch('time.sleep')
+    def test_emit_spills_and_replays(self, mock_sleep):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        emitted = []
+        exporter = mock.Mock()
+        exporter.emit.side_effect = emitted.append
+        transport = self._make_transport(
+            exporter, max_attempts=2, spill_dir=tmpdir)
+        emitter = transport.emitter
+
+        exporter.emit.side_effect = ValueError
+        with mock.patch.object(retry.logger, 'warning'):
+            for datas in (['span1'], ['span2']):
+                with self.assertRaises(async_.NotEmittedError) as context:
+                    emitter.emit(datas)
+                self.assertTrue(context.exception.spilled)
+        self.assertEqual(len(os.listdir(tmpdir)), 1)
+
+        # The spilled batches are replayed once the backend recovers
+        exporter.emit.side_effect = emitted.append
+        emitter.emit(['span3'])
+
+        self.assertEqual(emitted, [['span3'], ['span1'], ['span2']])
+        self.assertEqual(os.listdir(tmpdir), [])
+
+        # Replays are then only attempted every _REPLAY_INTERVAL
+        with mock.patch.object(emitter._spill, 'replay') as mock_replay:
+            emitter.emit(['span4'])
+        mock_replay.assert_not_called()
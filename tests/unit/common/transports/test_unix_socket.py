@@ -0,0 +1,280 @@
+# Copyright 2019, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import socket
+import stat
+import tempfile
+import threading
+import unittest
+
+import mock
+
+from opencensus.common.transports import sync
+from opencensus.common.transports import unix_socket
+
+
+@unittest.skipIf(not hasattr(socket, 'AF_UNIX'),
+                 "Unix domain sockets are not available")
+class TestUnixSocket(unittest.TestCase):
+
+    def setUp(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        self.path = os.path.join(tmpdir, 'exporter.sock')
+        self.received = []
+        self.done = threading.Event()
+
+        def emit(datas):
+            self.received.append(datas)
+            self.done.set()
+
+        self.exporter = mock.Mock()
+        self.exporter.emit.side_effect = emit
+
+    def _start_server(self):
+        server = unix_socket.SidecarServer(
+            self.exporter, self.path, transport=sync.SyncTransport)
+        thread = threading.Thread(target=server.serve_forever,
+                                  kwargs={'poll_interval': 0.01})
+        thread.daemon = True
+        thread.start()
+
+        def stop():
+            server.shutdown()
+            server.server_close()
+        self.addCleanup(stop)
+        return server
+
+    def test_server_socket_mode(self):
+        self._start_server()
+
+        mode = stat.S_IMODE(os.stat(self.path).st_mode)
+        self.assertEqual(mode, 0o600)
+
+    def test_server_replaces_stale_socket(self):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.path)
+        stale.close()
+
+        self._start_server()
+
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.addCleanup(client.close)
+        client.connect(self.path)
+
+    def test_server_keeps_other_files(self):
+        open(self.path, 'w').close()
+
+        with self.assertRaises(socket.error):
+            unix_socket.SidecarServer(
+                self.exporter, self.path, transport=sync.SyncTransport)
+
+        self.assertTrue(stat.S_ISREG(os.stat(self.path).st_mode))
+
+    def test_server_keeps_socket_of_other_user(self):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.path)
+        stale.close()
+
+        with mock.patch('os.getuid', return_value=os.getuid() + 1):
+            with self.assertRaises(socket.error):
+                unix_socket.SidecarServer(
+                    self.exporter, self.path, transport=sync.SyncTransport)
+
+        self.assertTrue(os.path.exists(self.path))
+
+    def test_server_close_removes_socket(self):
+        server = unix_socket.SidecarServer(
+            self.exporter, self.path, transport=sync.SyncTransport)
+
+        server.server_close()
+
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_client_emit(self):
+        self._start_server()
+        client = unix_socket._SocketClient(self.path)
+        self.addCleanup(client.close)
+
+        client.emit(['span1', 'span2'])
+
+        self.assertTrue(self.done.wait(5))
+        self.assertEqual(self.received, [['span1', 'span2']])
+
+    def test_client_no_server(self):
+        client = unix_socket._SocketClient(self.path)
+
+        with self.assertRaises(socket.error):
+            client.emit(['span1'])
+        self.assertIsNone(client._sock)
+
+    def test_client_reconnects(self):
+        self._start_server()
+        client = unix_socket._SocketClient(self.path)
+        self.addCleanup(client.close)
+        broken = mock.Mock()
+        broken.sendall.side_effect = socket.error
+        client._sock = broken
+        client._pid = os.getpid()
+
+        client.emit(['span1'])
+
+        broken.close.assert_called_once_with()
+        self.assertTrue(self.done.wait(5))
+        self.assertEqual(self.received, [['span1']])
+
+    def test_client_reconnects_after_fork(self):
+        self._start_server()
+        client = unix_socket._SocketClient(self.path)
+        self.addCleanup(client.close)
+        parent_sock = mock.Mock()
+        client._sock = parent_sock
+        client._pid = os.getpid() + 1
+
+        client.emit(['span1'])
+
+        parent_sock.sendall.assert_not_called()
+        parent_sock.close.assert_called_once_with()
+        self.assertTrue(self.done.wait(5))
+        self.assertEqual(self.received, [['span1']])
+
+    def test_server_drops_oversized_frame(self):
+        self._start_server()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.addCleanup(sock.close)
+        sock.connect(self.path)
+
+        with mock.patch.object(unix_socket.logger, 'error') as mock_log:
+            sock.sendall(unix_socket._HEADER.pack(
+                unix_socket._MAX_FRAME_SIZE + 1))
+            # The sidecar closes the connection
+            self.assertEqual(sock.recv(1), b'')
+
+        self.assertEqual(mock_log.call_count, 1)
+        self.exporter.emit.assert_not_called()
+
+    def test_server_skips_invalid_frame(self):
+        self._start_server()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.addCleanup(sock.close)
+        sock.connect(self.path)
+        client = unix_socket._SocketClient(self.path)
+        client._sock = sock
+        client._pid = os.getpid()
+
+        with mock.patch.object(unix_socket.logger, 'exception') as mock_log:
+            sock.sendall(unix_socket._HEADER.pack(3) + b'bad')
+            client.emit(['span1'])
+            self.assertTrue(self.done.wait(5))
+
+        self.assertEqual(mock_log.call_count, 1)
+        self.assertEqual(self.received, [['span1']])
+
+    def test_transport(self):
+        self._start_server()
+        exporter = mock.Mock()
+        with mock.patch('atexit.register'):
+            transport = unix_socket.UnixSocketTransport(
+                exporter, path=self.path, max_latency=60)
+        self.addCleanup(transport.worker.stop)
+
+        self.assertIs(transport.exporter, exporter)
+        transport.export(['span1'])
+        transport.export(['span2'])
+        transport.flush()
+
+        self.assertTrue(self.done.wait(5))
+        self.assertEqual(self.received, [['span1', 'span2']])
+        exporter.emit.assert_not_called()
+
+    def test_main(self):
+        server = mock.Mock()
+        server.serve_forever.side_effect = KeyboardInterrupt
+        patch_server = mock.patch.object(
+            unix_socket, 'SidecarServer', return_value=server)
+        patch_signal = mock.patch('signal.signal')
+        patch_logging = mock.patch('logging.basicConfig')
+
+        with patch_server as mock_server, patch_signal, patch_logging:
+            unix_socket.main([
+                '--exporter',
+                'opencensus.trace.exporters.print_exporter:PrintExporter',
+                '--path', self.path])
+
+        exporter, path = mock_server.call_args[0]
+        self.assertEqual(exporter.__class__.__name__, 'PrintExporter')
+        self.assertEqual(path, self.path)
+        server.server_close.assert_called_once_with()
+
+    def test_default_socket_path_runtime_dir(self):
+        with mock.patch.dict('os.environ', {'XDG_RUNTIME_DIR': '/run/user/1'}):
+            self.assertEqual(unix_socket.default_socket_path(),
+                             '/run/user/1/opencensus-exporter.sock')
+
+    def test_default_socket_path_tempdir(self):
+        tmpdir = os.path.dirname(self.path)
+        patch_env = mock.patch.dict('os.environ', {'XDG_RUNTIME_DIR': ''})
+        patch_tempdir = mock.patch('tempfile.gettempdir',
+                                   return_value=tmpdir)
+
+        with patch_env, patch_tempdir:
+            path = unix_socket.default_socket_path()
+            # The directory is reused
+            self.assertEqual(unix_socket.default_socket_path(), path)
+
+        directory = os.path.dirname(path)
+        self.assertEqual(directory, os.path.join(
+            tmpdir, 'opencensus-{}'.format(os.getuid())))
+        self.assertEqual(stat.S_IMODE(os.stat(directory).st_mode), 0o700)
+
+    def test_default_socket_path_unsafe_directory(self):
+        tmpdir = os.path.dirname(self.path)
+        directory = os.path.join(tmpdir, 'opencensus-{}'.format(os.getuid()))
+        os.mkdir(directory)
+        os.chmod(directory, 0o777)
+        patch_env = mock.patch.dict('os.environ', {'XDG_RUNTIME_DIR': ''})
+        patch_tempdir = mock.patch('tempfile.gettempdir',
+                                   return_value=tmpdir)
+
+        with patch_env, patch_tempdir:
+            with self.assertRaises(ValueError):
+                unix_socket.default_socket_path()
+
+    def test_transport_metrics_label(self):
+        from opencensus.trace.exporters import print_exporter
+
+        with mock.patch('atexit.register'):
+            transport = unix_socket.UnixSocketTransport(
+                print_exporter.PrintExporter(), path=self.path)
+        self.addCleanup(transport.worker.stop)
+
+        for metric in transport.get_metrics_registry().get_metrics():
+            [time_series] = metric.time_series
+            self.assertEqual(time_series.label_values[0].value,
+                             'PrintExporter')
+
+    def test_transport_default_path(self):
+        with mock.patch.object(unix_socket, 'default_socket_path',
+                               return_value=self.path):
+            with mock.patch('atexit.register'):
+                transport = unix_socket.UnixSocketTransport(mock.Mock())
+        self.addCleanup(transport.worker.stop)
+
+        self.assertEqual(transport.client.path, self.path)
+
+    def test_load_exporter_invalid(self):
+        with self.assertRaises(ValueError):
+            unix_socket._load_exporter('opencensus.trace.exporters')
@@ -47,6 +47,13 @@ class TestMetricDescriptor(unittest.TestCase):
             metric_descriptor.MetricDescriptor(NAME, DESCRIPTION, UNIT, 0,
                                                (LABEL_KEY1, ))
 
+    def test_summary_type(self):
+        md = metric_descriptor.MetricDescriptor(
+            NAME, DESCRIPTION, UNIT,
+            metric_descriptor.MetricDescriptorType.SUMMARY, (LABEL_KEY1, ))
+        self.assertEqual(md.type,
+                         metric_descriptor.MetricDescriptorType.SUMMARY)
+
     def test_null_label_keys(self):
         with self.assertRaises(ValueError):
             metric_descriptor.MetricDescriptor(
@@ -0,0 +1,152 @@
+# Copyright 2019, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+
+from opencensus.stats import aggregation as aggregation_module
+from opencensus.stats import execution_context
+from opencensus.stats import measure as measure_module
+from opencensus.stats import view as view_module
+from opencensus.stats.exporters import interval_exporter
+from opencensus.stats.measure_to_view_map import MeasureToViewMap
+from opencensus.tags import tag_key as tag_key_module
+from opencensus.tags import tag_map as tag_map_module
+from opencensus.tags import tag_value as tag_value_module
+
+FRONTEND_KEY = tag_key_module.TagKey("myorg_keys_frontend")
+VIDEO_SIZE_MEASURE = measure_module.MeasureInt(
+    "myorg_measure_video_size", "size of video", "By")
+VIDEO_SIZE_VIEW = view_module.View(
+    "myorg_views_video_size", "count of processed videos",
+    [FRONTEND_KEY], VIDEO_SIZE_MEASURE, aggregation_module.CountAggregation())
+
+
+class TestIntervalStatsExporter(unittest.TestCase):
+
+    def setUp(self):
+        self.mtvm = MeasureToViewMap()
+        self.mtvm.register_view(VIDEO_SIZE_VIEW, "2019-01-01T00:00:00Z")
+
+    def _record(self, value):
+        tag_map = tag_map_module.TagMap()
+        tag_map.insert(FRONTEND_KEY, tag_value_module.TagValue("mobile-ios"))
+        self.mtvm.record(tag_map, {VIDEO_SIZE_MEASURE: value},
+                         "2019-01-01T00:00:01Z")
+
+    def test_constructor_defaults(self):
+        execution_context.clear()
+        exporter = interval_exporter.IntervalStatsExporter([])
+
+        self.assertEqual(exporter.exporters, [])
+        self.assertEqual(exporter.interval,
+                         interval_exporter._DEFAULT_INTERVAL)
+        self.assertIs(exporter.measure_to_view_map,
+                      execution_context.get_measure_to_view_map())
+        self.assertFalse(exporter.is_alive)
+        execution_context.clear()
+
+    def test_constructor_invalid_interval(self):
+        with self.assertRaises(ValueError):
+            interval_exporter.IntervalStatsExporter([], interval=0)
+
+    def test_record_does_not_export(self):
+        stats_exporter = mock.Mock()
+        interval_exporter.IntervalStatsExporter(
+            [stats_exporter], measure_to_view_map=self.mtvm)
+
+        self._record(1)
+
+        stats_exporter.export.assert_not_called()
+
+    def test_export_views(self):
+        stats_exporter = mock.Mock()
+        exporter = interval_exporter.IntervalStatsExporter(
+            [stats_exporter], measure_to_view_map=self.mtvm)
+
+        self._record(1)
+        self._record(2)
+        exporter.export_views()
+        exporter.export_views()
+
+        stats_exporter.on_register_view.assert_called_once_with(
+            VIDEO_SIZE_VIEW)
+        self.assertEqual(stats_exporter.export.call_count, 2)
+        [view_data] = stats_exporter.export.call_args[0][0]
+        self.assertIs(view_data.view, VIDEO_SIZE_VIEW)
+        [agg_data] = view_data.tag_value_aggregation_data_map.values()
+        self.assertEqual(agg_data.count_data, 2)
+
+        # Exported data is a snapshot, later records do not change it
+        self._record(3)
+        self.assertEqual(agg_data.count_data, 2)
+
+    def test_export_views_no_views(self):
+        stats_exporter = mock.Mock()
+        exporter = interval_exporter.IntervalStatsExporter(
+            [stats_exporter], measure_to_view_map=MeasureToViewMap())
+
+        exporter.export_views()
+
+        stats_exporter.export.assert_not_called()
+
+    def test_export_views_exporter_error(self):
+        failing_exporter = mock.Mock()
+        failing_exporter.export.side_effect = ValueError
+        stats_exporter = mock.Mock()
+        exporter = interval_exporter.IntervalStatsExporter(
+            [failing_exporter, stats_exporter],
+            measure_to_view_map=self.mtvm)
+
+        exporter.export_views()
+
+        self.assertTrue(failing_exporter.export.called)
+        self.assertTrue(stats_exporter.export.called)
+
+    @mock.patch('atexit.register')
+    def test_start_stop(self, mock_atexit):
+        stats_exporter = mock.Mock()
+        exporter = interval_exporter.IntervalStatsExporter(
+            [stats_exporter], interval=60, measure_to_view_map=self.mtvm)
+
+        exporter.start()
+        self.assertTrue(exporter.is_alive)
+        mock_atexit.assert_called_once_with(exporter.stop)
+
+        # Starting twice does not start a second thread
+        thread = exporter._thread
+        exporter.start()
+        self.assertIs(exporter._thread, thread)
+
+        self._record(1)
+        self.assertTrue(exporter.stop())
+        self.assertFalse(exporter.is_alive)
+
+        # Stopping exports the data recorded since the last tick
+        self.assertEqual(stats_exporter.export.call_count, 1)
+
+        self.assertTrue(exporter.stop())
+
+    @mock.patch('atexit.register')
+    def test_exports_every_interval(self, mock_atexit):
+        stats_exporter = mock.Mock()
+        exporter = interval_exporter.IntervalStatsExporter(
+            [stats_exporter], interval=60, measure_to_view_map=self.mtvm)
+
+        with mock.patch.object(exporter._event, 'wait',
+                               side_effect=[False, False, True]):
+            exporter._thread_main()
+
+        self.assertEqual(stats_exporter.export.call_count, 3)
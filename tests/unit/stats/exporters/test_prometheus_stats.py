@@ -215,6 +215,35 @@ class TestCollectorPrometheus(unittest.TestCase):
                    280.0 * MiB)]
         self.assertEqual(expected_samples, metric.samples)
 
+    def test_collector_to_metric_quantile(self):
+        agg = aggregation_module.QuantileAggregation(percentiles=[50, 99])
+        view = view_module.View(VIDEO_SIZE_VIEW_NAME,
+                                "processed video size over time",
+                                [FRONTEND_KEY], VIDEO_SIZE_MEASURE, agg)
+        registry = mock.Mock()
+        options = prometheus.Options("test1", 8001, "localhost", registry)
+        collector = prometheus.Collector(options=options)
+        collector.register_view(view)
+        desc = collector.registered_views[list(REGISTERED_VIEW)[0]]
+        agg_data = agg.new_aggregation_data()
+        agg_data.add_sample(2, None, None)
+        metric = collector.to_metric(
+            desc=desc,
+            tag_values=[tag_value_module.TagValue("ios")],
+            agg_data=agg_data)
+
+        self.assertEqual(desc['name'], metric.name)
+        self.assertEqual(desc['documentation'], metric.documentation)
+        self.assertEqual('summary', metric.type)
+        expected_samples = [
+            Sample(metric.name + '_count', {"myorg_keys_frontend": "ios"}, 1),
+            Sample(metric.name + '_sum', {"myorg_keys_frontend": "ios"}, 2),
+            Sample(metric.name,
+                   {"myorg_keys_frontend": "ios", "quantile": "0.5"}, 2),
+            Sample(metric.name,
+                   {"myorg_keys_frontend": "ios", "quantile": "0.99"}, 2)]
+        self.assertEqual(expected_samples, metric.samples)
+
     def test_collector_to_metric_invalid_dist(self):
         agg = mock.Mock()
         view = view_module.View(VIDEO_SIZE_VIEW_NAME,
@@ -299,7 +328,7 @@ class TestPrometheusStatsExporter(unittest.TestCase):
         self.assertIsInstance(
             exporter.collector.view_name_to_data_map[
                 'opencensus_myorg_views_video_size_test2'],
-            view_data_module.ViewData)
+            view_data_module.ViewDataSnapshot)
         self.assertEqual(REGISTERED_VIEW2, exporter.collector.registered_views)
         self.assertEqual(options, exporter.options)
         self.assertEqual(options.registry, exporter.gatherer)
@@ -418,6 +418,8 @@ class TestStackdriverStatsExporter(unittest.TestCase):
         value = time_series.points[0].value
         self.assertEqual(value.distribution_value.count, 1)
         self.assertEqual(value.distribution_value.mean, 25 * MiB)
+        self.assertEqual(value.distribution_value.range.min, 25 * MiB)
+        self.assertEqual(value.distribution_value.range.max, 25 * MiB)
 
         time_series_list = exporter.create_time_series_list(
             v_data, "global", "kubernetes.io/myorg")
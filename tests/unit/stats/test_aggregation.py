@@ -14,7 +14,10 @@
 
 import unittest
 
+import mock
+
 from opencensus.stats import aggregation as aggregation_module
+from opencensus.stats import aggregation_data as aggregation_data_module
 
 
 class TestBaseAggregation(unittest.TestCase):
@@ -34,6 +37,15 @@ class TestBaseAggregation(unittest.TestCase):
                          base_aggregation.aggregation_type)
         self.assertEqual(["test"], base_aggregation.buckets)
 
+    def test_new_aggregation_data(self):
+        base_aggregation = aggregation_module.BaseAggregation()
+        base_aggregation.aggregation_data = aggregation_data_module.\
+            CountAggregationData(3)
+
+        agg_data = base_aggregation.new_aggregation_data()
+        self.assertIsNot(agg_data, base_aggregation.aggregation_data)
+        self.assertEqual(agg_data.count_data, 3)
+
 
 class TestSumAggregation(unittest.TestCase):
     def test_constructor_defaults(self):
@@ -52,6 +64,17 @@ class TestSumAggregation(unittest.TestCase):
         self.assertEqual(aggregation_module.Type.SUM,
                          sum_aggregation.aggregation_type)
 
+    def test_new_aggregation_data(self):
+        sum_aggregation = aggregation_module.SumAggregation(sum=2)
+
+        agg_data = sum_aggregation.new_aggregation_data()
+        self.assertIsInstance(agg_data,
+                              aggregation_data_module.SumAggregationDataFloat)
+        self.assertIsNot(agg_data, sum_aggregation.aggregation_data)
+        self.assertEqual(agg_data.sum_data, 2.0)
+        agg_data.add_sample(1)
+        self.assertEqual(sum_aggregation.new_aggregation_data().sum_data, 2.0)
+
 
 class TestCountAggregation(unittest.TestCase):
     def test_constructor_defaults(self):
@@ -70,6 +93,18 @@ class TestCountAggregation(unittest.TestCase):
         self.assertEqual(aggregation_module.Type.COUNT,
                          count_aggregation.aggregation_type)
 
+    def test_new_aggregation_data(self):
+        count_aggregation = aggregation_module.CountAggregation(count=3)
+
+        agg_data = count_aggregation.new_aggregation_data()
+        self.assertIsInstance(agg_data,
+                              aggregation_data_module.CountAggregationData)
+        self.assertIsNot(agg_data, count_aggregation.aggregation_data)
+        self.assertEqual(agg_data.count_data, 3)
+        agg_data.add_sample(1)
+        self.assertEqual(count_aggregation.new_aggregation_data().count_data,
+                         3)
+
 
 class TestLastValueAggregation(unittest.TestCase):
     def test_constructor_defaults(self):
@@ -88,6 +123,16 @@ class TestLastValueAggregation(unittest.TestCase):
         self.assertEqual(aggregation_module.Type.LASTVALUE,
                          last_value_aggregation.aggregation_type)
 
+    def test_new_aggregation_data(self):
+        last_value_aggregation = aggregation_module.LastValueAggregation(
+            value=6)
+
+        agg_data = last_value_aggregation.new_aggregation_data()
+        self.assertIsInstance(
+            agg_data, aggregation_data_module.LastValueAggregationData)
+        self.assertIsNot(agg_data, last_value_aggregation.aggregation_data)
+        self.assertEqual(agg_data.value, 6)
+
 
 class TestDistributionAggregation(unittest.TestCase):
     def test_constructor_defaults(self):
@@ -126,3 +171,125 @@ class TestDistributionAggregation(unittest.TestCase):
         da2 = aggregation_module.DistributionAggregation([-2, -1])
         self.assertEqual(da2.boundaries.boundaries, [])
         self.assertEqual(da2.aggregation_data.bounds, [])
+
+    def test_new_aggregation_data(self):
+        distribution_aggregation = aggregation_module.DistributionAggregation(
+            boundaries=[1, 2, 4])
+
+        agg_data1 = distribution_aggregation.new_aggregation_data()
+        agg_data2 = distribution_aggregation.new_aggregation_data()
+        self.assertIsInstance(
+            agg_data1, aggregation_data_module.DistributionAggregationData)
+        self.assertEqual(agg_data1.bounds, [1, 2, 4])
+        self.assertEqual(agg_data1.counts_per_bucket, [0, 0, 0, 0])
+        self.assertEqual(agg_data1.exemplars,
+                         {0: None, 1: None, 2: None, 3: None})
+
+        # Bounds are shared, the rest of the state is not
+        self.assertIs(agg_data1.bounds, agg_data2.bounds)
+        agg_data1.add_sample(3, None, {"key": "value"})
+        self.assertEqual(agg_data1.counts_per_bucket, [0, 0, 1, 0])
+        self.assertEqual(agg_data2.counts_per_bucket, [0, 0, 0, 0])
+        self.assertIsNone(agg_data2.exemplars[2])
+        self.assertEqual(agg_data2.count_data, 0)
+
+    def test_new_aggregation_data_exemplar_sampler(self):
+        sampler = mock.Mock()
+        distribution_aggregation = aggregation_module.DistributionAggregation(
+            boundaries=[1, 2, 4], exemplar_sampler=sampler)
+        self.assertIs(distribution_aggregation.exemplar_sampler, sampler)
+
+        agg_data = distribution_aggregation.new_aggregation_data()
+        agg_data.add_sample(3, 1.0, {"key": "value"})
+        sampler.should_sample.assert_called_once_with(1, None, 1.0)
+
+    def test_new_aggregation_data_no_boundaries(self):
+        distribution_aggregation = aggregation_module.DistributionAggregation()
+
+        agg_data = distribution_aggregation.new_aggregation_data()
+        self.assertEqual(agg_data.bounds, [])
+        self.assertEqual(agg_data.counts_per_bucket, [0])
+        self.assertIsNone(agg_data.exemplars)
+
+
+class TestExponentialDistributionAggregation(unittest.TestCase):
+    def test_constructor_defaults(self):
+        exponential_aggregation = \
+            aggregation_module.ExponentialDistributionAggregation()
+
+        self.assertEqual(exponential_aggregation.max_size, 160)
+        self.assertEqual(exponential_aggregation.max_scale, 20)
+        self.assertEqual(exponential_aggregation.aggregation_type,
+                         aggregation_module.Type.DISTRIBUTION)
+        self.assertIsInstance(
+            exponential_aggregation.aggregation_data,
+            aggregation_data_module.ExponentialDistributionAggregationData)
+
+    def test_init_bad_max_size(self):
+        with self.assertRaises(ValueError):
+            aggregation_module.ExponentialDistributionAggregation(max_size=1)
+
+    def test_new_aggregation_data(self):
+        exponential_aggregation = \
+            aggregation_module.ExponentialDistributionAggregation(
+                max_size=10, max_scale=3)
+
+        agg_data1 = exponential_aggregation.new_aggregation_data()
+        agg_data2 = exponential_aggregation.new_aggregation_data()
+        self.assertEqual(agg_data1.max_size, 10)
+        self.assertEqual(agg_data1.scale, 3)
+
+        agg_data1.add_sample(3, None, None)
+        self.assertEqual(agg_data1.count_data, 1)
+        self.assertEqual(agg_data2.count_data, 0)
+
+
+class TestQuantileAggregation(unittest.TestCase):
+    def test_constructor_defaults(self):
+        quantile_aggregation = aggregation_module.QuantileAggregation()
+
+        self.assertEqual(quantile_aggregation.percentiles, [50, 90, 99, 99.9])
+        self.assertEqual(quantile_aggregation.relative_accuracy, 0.01)
+        self.assertEqual(quantile_aggregation.max_bins, 2048)
+        self.assertEqual(quantile_aggregation.aggregation_type,
+                         aggregation_module.Type.QUANTILE)
+        self.assertEqual(quantile_aggregation.aggregation_data.count_data, 0)
+
+    def test_constructor_explicit(self):
+        quantile_aggregation = aggregation_module.QuantileAggregation(
+            percentiles=(25, 75), relative_accuracy=0.05, max_bins=10)
+
+        self.assertEqual(quantile_aggregation.percentiles, [25, 75])
+        self.assertEqual(quantile_aggregation.relative_accuracy, 0.05)
+        self.assertEqual(quantile_aggregation.max_bins, 10)
+
+    def test_init_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            aggregation_module.QuantileAggregation(percentiles=[0, 50])
+        with self.assertRaises(ValueError):
+            aggregation_module.QuantileAggregation(percentiles=[50, 101])
+        with self.assertRaises(ValueError):
+            aggregation_module.QuantileAggregation(percentiles=[99, 50])
+        with self.assertRaises(ValueError):
+            aggregation_module.QuantileAggregation(percentiles=[50, 50])
+        with self.assertRaises(ValueError):
+            aggregation_module.QuantileAggregation(relative_accuracy=0)
+        with self.assertRaises(ValueError):
+            aggregation_module.QuantileAggregation(relative_accuracy=1)
+        with self.assertRaises(ValueError):
+            aggregation_module.QuantileAggregation(max_bins=0)
+
+    def test_new_aggregation_data(self):
+        quantile_aggregation = aggregation_module.QuantileAggregation(
+            percentiles=[50], relative_accuracy=0.02, max_bins=100)
+
+        agg_data1 = quantile_aggregation.new_aggregation_data()
+        agg_data2 = quantile_aggregation.new_aggregation_data()
+        self.assertIsInstance(
+            agg_data1, aggregation_data_module.QuantileAggregationData)
+        self.assertEqual(agg_data1.percentiles, [50])
+        self.assertEqual(agg_data1.relative_accuracy, 0.02)
+
+        agg_data1.add_sample(3, None, None)
+        self.assertEqual(agg_data1.count_data, 1)
+        self.assertEqual(agg_data2.count_data, 0)
@@ -13,14 +13,20 @@
 # limitations under the License.
 
 from datetime import datetime
+import bisect
+import copy
+import random
 import time
 import unittest
 
 import mock
 
 from opencensus.metrics.export import point
+from opencensus.metrics.export import summary
 from opencensus.metrics.export import value
 from opencensus.stats import aggregation_data as aggregation_data_module
+from opencensus.stats import bucket_boundaries
+from opencensus.stats import exemplar_sampler
 
 
 class TestBaseAggregationData(unittest.TestCase):
@@ -59,6 +65,20 @@ class TestSumAggregationData(unittest.TestCase):
         self.assertEqual(converted_point.value.value, sum_data)
         self.assertEqual(converted_point.timestamp, timestamp)
 
+    def test_merge(self):
+        agg = aggregation_data_module.SumAggregationDataFloat(1.5)
+        other = aggregation_data_module.SumAggregationDataFloat(2.0)
+        agg.merge(other)
+        self.assertEqual(agg.sum_data, 3.5)
+        self.assertEqual(other.sum_data, 2.0)
+
+    def test_add_samples(self):
+        agg = aggregation_data_module.SumAggregationDataFloat(1.5)
+        agg.add_samples([1, 2.5, 3])
+        self.assertEqual(agg.sum_data, 8.0)
+        agg.add_samples([])
+        self.assertEqual(agg.sum_data, 8.0)
+
 
 class TestCountAggregationData(unittest.TestCase):
     def test_constructor(self):
@@ -86,6 +106,18 @@ class TestCountAggregationData(unittest.TestCase):
         self.assertEqual(converted_point.value.value, count_data)
         self.assertEqual(converted_point.timestamp, timestamp)
 
+    def test_merge(self):
+        agg = aggregation_data_module.CountAggregationData(3)
+        other = aggregation_data_module.CountAggregationData(4)
+        agg.merge(other)
+        self.assertEqual(agg.count_data, 7)
+        self.assertEqual(other.count_data, 4)
+
+    def test_add_samples(self):
+        agg = aggregation_data_module.CountAggregationData(2)
+        agg.add_samples([1, 2.5, 3])
+        self.assertEqual(agg.count_data, 5)
+
 
 class TestLastValueAggregationData(unittest.TestCase):
     def test_constructor(self):
@@ -113,6 +145,39 @@ class TestLastValueAggregationData(unittest.TestCase):
         self.assertEqual(converted_point.value.value, val)
         self.assertEqual(converted_point.timestamp, timestamp)
 
+    def test_merge(self):
+        agg = aggregation_data_module.LastValueAggregationData(0)
+        other = aggregation_data_module.LastValueAggregationData(0)
+
+        # Nothing recorded in the other aggregation, keep the current value
+        agg.add_sample(1, '2019-01-01T00:00:01.000000Z')
+        agg.merge(other)
+        self.assertEqual(agg.value, 1)
+
+        # The other value was recorded later
+        other.add_sample(2, '2019-01-01T00:00:02.000000Z')
+        agg.merge(other)
+        self.assertEqual(agg.value, 2)
+        self.assertEqual(agg.timestamp, '2019-01-01T00:00:02.000000Z')
+
+        # The other value was recorded earlier
+        agg.add_sample(3, '2019-01-01T00:00:03.000000Z')
+        agg.merge(other)
+        self.assertEqual(agg.value, 3)
+
+        # Nothing recorded in this aggregation, take the other value
+        empty = aggregation_data_module.LastValueAggregationData(0)
+        empty.merge(other)
+        self.assertEqual(empty.value, 2)
+
+    def test_add_samples(self):
+        agg = aggregation_data_module.LastValueAggregationData(value=5)
+        agg.add_samples([1, 3], 'timestamp')
+        self.assertEqual(agg.value, 3)
+        self.assertEqual(agg.timestamp, 'timestamp')
+        agg.add_samples([])
+        self.assertEqual(agg.value, 3)
+
 
 def exemplars_equal(stats_ex, metrics_ex):
     """Compare a stats exemplar to a metrics exemplar."""
@@ -148,6 +213,31 @@ class TestDistributionAggregationData(unittest.TestCase):
         self.assertIsNotNone(dist_agg_data.sum)
         self.assertEqual(0, dist_agg_data.variance)
 
+    def test_constructor_shared_bucket_boundaries(self):
+        boundaries = bucket_boundaries.BucketBoundaries([1, 2, 4])
+        dist_agg_data = aggregation_data_module.DistributionAggregationData(
+            0, 0, 0, None, boundaries)
+
+        self.assertIs(dist_agg_data.bounds, boundaries.boundaries)
+        self.assertEqual(dist_agg_data.counts_per_bucket, [0, 0, 0, 0])
+        self.assertEqual(dist_agg_data.exemplars,
+                         {0: None, 1: None, 2: None, 3: None})
+
+    def test_exemplars_allocated_lazily(self):
+        dist_agg_data = aggregation_data_module.DistributionAggregationData(
+            0, 0, 0, None, [1, 2])
+        dist_agg_data.add_sample(1.5, None, None)
+        self.assertEqual(dist_agg_data._exemplars, ())
+
+        other = copy.deepcopy(dist_agg_data)
+        other.add_sample(0.5, 'timestamp', {'one': 'one'})
+        dist_agg_data.merge(other)
+
+        self.assertEqual(dist_agg_data.exemplars[0].value, 0.5)
+        self.assertIsNone(dist_agg_data.exemplars[1])
+        self.assertIsNone(dist_agg_data.exemplars[2])
+        self.assertFalse(hasattr(dist_agg_data, '__dict__'))
+
     def test_init_bad_bucket_counts(self):
         # Check that len(counts_per_bucket) == len(bounds) + 1
         with self.assertRaises(AssertionError):
@@ -456,6 +546,18 @@ class TestDistributionAggregationData(unittest.TestCase):
         dist_agg_data.increment_bucket_count(value=value)
         self.assertEqual([1, 2, 2], dist_agg_data.counts_per_bucket)
 
+    def test_increment_bucket_count_boundaries(self):
+        bounds = [1, 2, 4, 8]
+        dist_agg_data = aggregation_data_module.DistributionAggregationData(
+            0, 0, 0, None, bounds)
+
+        # Each bucket includes its lower bound and excludes its upper bound
+        for sample, bucket in [(0, 0), (0.5, 0), (1, 1), (1.999, 1), (2, 2),
+                               (7.5, 3), (8, 4), (1e9, 4)]:
+            self.assertEqual(dist_agg_data.increment_bucket_count(sample),
+                             bucket)
+        self.assertEqual([2, 2, 1, 1, 2], dist_agg_data.counts_per_bucket)
+
     def test_to_point(self):
         timestamp = datetime(1970, 1, 1)
         ex_9 = aggregation_data_module.Exemplar(
@@ -492,6 +594,17 @@ class TestDistributionAggregationData(unittest.TestCase):
                 ex_99,
                 converted_point.value.buckets[2].exemplar))
 
+    def test_to_point_epoch_exemplar_timestamp(self):
+        dist_agg_data = aggregation_data_module.DistributionAggregationData(
+            0, 0, 0, None, [1, 2])
+        dist_agg_data.add_sample(1.5, 86400.5, {'one': 'one'})
+
+        converted_point = dist_agg_data.to_point(datetime(1970, 1, 1))
+
+        self.assertEqual(dist_agg_data.exemplars[1].timestamp, 86400.5)
+        self.assertEqual(converted_point.value.buckets[1].exemplar.timestamp,
+                         '1970-01-02T00:00:00.500000Z')
+
     def test_to_point_no_histogram(self):
         timestamp = datetime(1970, 1, 1)
         dist_agg_data = aggregation_data_module.DistributionAggregationData(
@@ -508,3 +621,460 @@ class TestDistributionAggregationData(unittest.TestCase):
                          80850.0)
         self.assertIsNone(converted_point.value.buckets)
         self.assertIsNone(converted_point.value.bucket_options._type)
+
+    def test_merge(self):
+        samples = [0.1, 0.7, 1.3, 2.5, 4, 4, 9.8, 3.3]
+        bounds = [1, 2, 4]
+        agg1 = aggregation_data_module.DistributionAggregationData(
+            0, 0, 0, None, bounds)
+        agg2 = aggregation_data_module.DistributionAggregationData(
+            0, 0, 0, None, bounds)
+        expected = aggregation_data_module.DistributionAggregationData(
+            0, 0, 0, None, bounds)
+        for sample in samples[:3]:
+            agg1.add_sample(sample, None, None)
+        for sample in samples[3:]:
+            agg2.add_sample(sample, None, None)
+        for sample in samples:
+            expected.add_sample(sample, None, None)
+
+        agg1.merge(agg2)
+
+        self.assertEqual(agg1.count_data, expected.count_data)
+        self.assertAlmostEqual(agg1.mean_data, expected.mean_data)
+        self.assertAlmostEqual(agg1.sum_of_sqd_deviations,
+                               expected.sum_of_sqd_deviations)
+        self.assertEqual(agg1.counts_per_bucket, expected.counts_per_bucket)
+        self.assertEqual(agg1.min, 0.1)
+        self.assertEqual(agg1.max, 9.8)
+        self.assertEqual(agg2.count_data, 5)
+
+    def test_add_samples(self):
+        samples = [0.1, 0.7, 1, 1.3, 2, 2.5, 4, 4, 9.8, 3.3]
+        bounds = [1, 2, 4]
+        agg = aggregation_data_module.DistributionAggregationData(
+            0, 0, 0, None, bounds)
+        expected = aggregation_data_module.DistributionAggregationData(
+            0, 0, 0, None, bounds)
+        agg.add_sample(5, None, None)
+        expected.add_sample(5, None, None)
+        for sample in samples:
+            expected.add_sample(sample, None, None)
+
+        agg.add_samples(samples)
+        agg.add_samples([])
+
+        self.assertEqual(agg.count_data, expected.count_data)
+        self.assertAlmostEqual(agg.mean_data, expected.mean_data)
+        self.assertAlmostEqual(agg.sum_of_sqd_deviations,
+                               expected.sum_of_sqd_deviations)
+        self.assertEqual(agg.counts_per_bucket, [2, 2, 3, 4])
+        self.assertEqual(agg.counts_per_bucket, expected.counts_per_bucket)
+        self.assertEqual(agg.min, 0.1)
+        self.assertEqual(agg.max, 9.8)
+
+    def test_add_samples_no_histogram(self):
+        agg = aggregation_data_module.DistributionAggregationData(0, 0, 0)
+        agg.add_samples([1, 2, 3])
+        self.assertEqual(agg.count_data, 3)
+        self.assertEqual(agg.mean_data, 2)
+        self.assertEqual(agg.sum_of_sqd_deviations, 2)
+        self.assertEqual(agg.counts_per_bucket, [3])
+
+    def test_add_samples_attachments(self):
+        agg = aggregation_data_module.DistributionAggregationData(
+            0, 0, 0, None, [1, 2])
+        attachments = {'one': 'one'}
+        agg.add_samples([0.5, 1.5, 1.7], 'timestamp', attachments)
+        self.assertEqual(agg.counts_per_bucket, [1, 2, 0])
+        self.assertEqual(agg.exemplars[0].value, 0.5)
+        self.assertEqual(agg.exemplars[1].value, 1.7)
+        self.assertEqual(agg.exemplars[1].attachments, attachments)
+        self.assertIsNone(agg.exemplars[2])
+
+    def test_merge_empty(self):
+        bounds = [1, 2, 4]
+        agg = aggregation_data_module.DistributionAggregationData(
+            0, 0, 0, None, bounds)
+        other = aggregation_data_module.DistributionAggregationData(
+            0, 0, 0, None, bounds)
+        other.add_sample(3, None, None)
+        other.add_sample(5, None, None)
+
+        agg.merge(other)
+        self.assertEqual(agg.count_data, 2)
+        self.assertEqual(agg.mean_data, 4)
+        self.assertEqual(agg.sum_of_sqd_deviations, 2)
+        self.assertEqual(agg.min, 3)
+        self.assertEqual(agg.max, 5)
+
+        agg.merge(aggregation_data_module.DistributionAggregationData(
+            0, 0, 0, None, bounds))
+        self.assertEqual(agg.count_data, 2)
+        self.assertEqual(agg.mean_data, 4)
+
+    def test_min_max(self):
+        agg = aggregation_data_module.DistributionAggregationData(
+            0, 0, 0, None, [1, 2])
+        self.assertIsNone(agg.min)
+        self.assertIsNone(agg.max)
+
+        agg.add_sample(1.5, None, None)
+        self.assertEqual(agg.min, 1.5)
+        self.assertEqual(agg.max, 1.5)
+        agg.add_sample(0.5, None, None)
+        agg.add_sample(3, None, None)
+        self.assertEqual(agg.min, 0.5)
+        self.assertEqual(agg.max, 3)
+
+        agg = aggregation_data_module.DistributionAggregationData(
+            2, 2, 2, None, None, None, 1, 3)
+        self.assertEqual(agg.min, 1)
+        self.assertEqual(agg.max, 3)
+
+    def test_add_sample_exemplar_sampler(self):
+        sampler = mock.Mock()
+        sampler.should_sample.return_value = False
+        agg = aggregation_data_module.DistributionAggregationData(
+            0, 0, 0, None, [1, 2], exemplar_sampler=sampler)
+        attachments = {'one': 'one'}
+
+        agg.add_sample(1.5, 1.0, attachments)
+        sampler.should_sample.assert_called_once_with(1, None, 1.0)
+        self.assertIsNone(agg.exemplars[1])
+
+        sampler.should_sample.return_value = True
+        agg.add_sample(1.7, 2.0, attachments)
+        sampler.should_sample.assert_called_with(2, None, 2.0)
+        self.assertEqual(agg.exemplars[1].value, 1.7)
+
+        # Values without attachments are not offered to the sampler
+        agg.add_sample(1.7, 3.0, None)
+        self.assertEqual(sampler.should_sample.call_count, 2)
+
+    def test_add_sample_rate_limited_string_timestamps(self):
+        sampler = exemplar_sampler.RateLimitedExemplarSampler(10)
+        agg = aggregation_data_module.DistributionAggregationData(
+            0, 0, 0, None, [1, 2], exemplar_sampler=sampler)
+
+        agg.add_sample(1.5, '2019-01-01T00:00:00.000000Z', {'one': 'one'})
+        agg.add_sample(1.7, '2019-01-01T00:00:01.000000Z', {'two': 'two'})
+        agg.add_sample(1.9, 100.0, {'three': 'three'})
+
+        self.assertEqual(agg.count_data, 3)
+        self.assertEqual(agg.exemplars[1].value, 1.9)
+
+    def test_merge_exemplars(self):
+        bounds = [1, 2]
+        attachments1 = {"One": "one"}
+        attachments2 = {"Two": "two"}
+        agg = aggregation_data_module.DistributionAggregationData(
+            0, 0, 0, None, bounds)
+        other = aggregation_data_module.DistributionAggregationData(
+            0, 0, 0, None, bounds)
+        agg.add_sample(0.5, None, attachments1)
+        agg.add_sample(1.5, None, attachments1)
+        other.add_sample(1.5, None, attachments2)
+
+        agg.merge(other)
+        self.assertEqual(agg.exemplars[0].attachments, attachments1)
+        self.assertEqual(agg.exemplars[1].attachments, attachments2)
+        self.assertIsNone(agg.exemplars[2])
+
+    def test_merge_different_bounds(self):
+        agg = aggregation_data_module.DistributionAggregationData(
+            0, 0, 0, None, [1, 2])
+        other = aggregation_data_module.DistributionAggregationData(
+            0, 0, 0, None, [1, 3])
+        with self.assertRaises(ValueError):
+            agg.merge(other)
+
+    def test_deepcopy_shares_bounds(self):
+        sampler = exemplar_sampler.ReservoirExemplarSampler()
+        agg = aggregation_data_module.DistributionAggregationData(
+            0, 0, 0, None, [1, 2], exemplar_sampler=sampler)
+        agg.add_sample(1.5, 1.0, {'one': 'one'})
+
+        agg_copy = copy.deepcopy(agg)
+
+        self.assertIs(agg_copy.bounds, agg.bounds)
+        self.assertIs(agg_copy._exemplar_sampler, sampler)
+        self.assertIsNot(agg_copy.counts_per_bucket, agg.counts_per_bucket)
+        self.assertEqual(agg_copy.counts_per_bucket, [0, 1, 0])
+        self.assertIsNot(agg_copy.exemplars, agg.exemplars)
+        self.assertEqual(agg_copy.exemplars[1].value, 1.5)
+
+        agg.add_sample(0.5, 2.0, None)
+        self.assertEqual(agg_copy.count_data, 1)
+
+
+class TestExponentialDistributionAggregationData(unittest.TestCase):
+    def test_constructor(self):
+        agg = aggregation_data_module.ExponentialDistributionAggregationData(
+            160, 20)
+
+        self.assertEqual(agg.max_size, 160)
+        self.assertEqual(agg.scale, 20)
+        self.assertEqual(agg.count_data, 0)
+        self.assertEqual(agg.zero_count, 0)
+        self.assertEqual(agg.bounds, [])
+        self.assertEqual(agg.counts_per_bucket, [0])
+        self.assertIsNone(agg.exemplars)
+        self.assertIsNone(agg.min)
+
+    def test_add_sample(self):
+        agg = aggregation_data_module.ExponentialDistributionAggregationData(
+            4, 0)
+        for sample in [1, 1.5, 2, 3.9, 4, 0, -1]:
+            agg.add_sample(sample, None, {'key': 'value'})
+
+        # At scale 0 the buckets are [1, 2), [2, 4) and [4, 8)
+        self.assertEqual(agg.scale, 0)
+        self.assertEqual(agg.zero_count, 2)
+        self.assertEqual(agg.bounds, [1, 2, 4, 8])
+        self.assertEqual(agg.counts_per_bucket, [2, 2, 2, 1, 0])
+        self.assertEqual(agg.count_data, 7)
+        self.assertEqual(agg.min, -1)
+        self.assertEqual(agg.max, 4)
+        self.assertIsNone(agg.exemplars)
+
+    def test_add_sample_downscale(self):
+        agg = aggregation_data_module.ExponentialDistributionAggregationData(
+            4, 1)
+        agg.add_sample(1, None, None)
+        agg.add_sample(3, None, None)
+        self.assertEqual(agg.scale, 1)
+        self.assertEqual(len(agg.bounds), 5)
+
+        # 17 is 8 buckets away from 1 at scale 1, 4 buckets at scale 0 and 2
+        # at scale -1
+        agg.add_sample(17, None, None)
+        self.assertEqual(agg.scale, -1)
+        self.assertEqual(agg.bounds, [1, 4, 16, 64])
+        self.assertEqual(agg.counts_per_bucket, [0, 2, 0, 1, 0])
+
+    def test_high_resolution(self):
+        agg = aggregation_data_module.ExponentialDistributionAggregationData(
+            160, 20)
+        samples = [1.5 ** ii for ii in range(-20, 20)]
+        random.Random(0).shuffle(samples)
+        for sample in samples:
+            agg.add_sample(sample, None, None)
+
+        # About 23 octaves fit in 160 buckets at scale 2
+        bounds = agg.bounds
+        self.assertEqual(agg.scale, 2)
+        self.assertLessEqual(len(bounds), 161)
+        self.assertAlmostEqual(bounds[1] / bounds[0], 2 ** 0.25)
+        expected = [0] * (len(bounds) + 1)
+        for sample in samples:
+            expected[bisect.bisect_right(bounds, sample)] += 1
+        self.assertEqual(agg.counts_per_bucket, expected)
+
+    def test_add_samples(self):
+        samples = [0.001, 0.5, 3, 3, 40, 1000, 0]
+        agg = aggregation_data_module.ExponentialDistributionAggregationData(
+            20, 10)
+        expected = \
+            aggregation_data_module.ExponentialDistributionAggregationData(
+                20, 10)
+        agg.add_samples(samples)
+        for sample in samples:
+            expected.add_sample(sample, None, None)
+
+        self.assertEqual(agg.count_data, expected.count_data)
+        self.assertAlmostEqual(agg.mean_data, expected.mean_data)
+        self.assertEqual(agg.scale, expected.scale)
+        self.assertEqual(agg.bounds, expected.bounds)
+        self.assertEqual(agg.counts_per_bucket, expected.counts_per_bucket)
+
+    def test_merge(self):
+        samples = [0.25, 0.7, 1.3, 2.5, 4, 4, 9.8, 3300, 0]
+        agg1 = aggregation_data_module.ExponentialDistributionAggregationData(
+            8, 20)
+        agg2 = aggregation_data_module.ExponentialDistributionAggregationData(
+            8, 20)
+        expected = \
+            aggregation_data_module.ExponentialDistributionAggregationData(
+                8, 20)
+        for sample in samples[:3]:
+            agg1.add_sample(sample, None, None)
+        for sample in samples[3:]:
+            agg2.add_sample(sample, None, None)
+        for sample in samples:
+            expected.add_sample(sample, None, None)
+        self.assertGreater(agg1.scale, agg2.scale)
+
+        agg1.merge(agg2)
+        self.assertEqual(agg1.count_data, expected.count_data)
+        self.assertEqual(agg1.min, 0)
+        self.assertEqual(agg1.max, 3300)
+        self.assertEqual(agg1.scale, expected.scale)
+        self.assertEqual(agg1.bounds, expected.bounds)
+        self.assertEqual(agg1.counts_per_bucket, expected.counts_per_bucket)
+
+        # Merging into an empty distribution copies the other one
+        empty = aggregation_data_module.ExponentialDistributionAggregationData(
+            8, 20)
+        empty.merge(expected)
+        self.assertEqual(empty.bounds, expected.bounds)
+        self.assertEqual(empty.counts_per_bucket, expected.counts_per_bucket)
+
+        # Merging an empty distribution is a no-op
+        expected.merge(
+            aggregation_data_module.ExponentialDistributionAggregationData(
+                8, 20))
+        self.assertEqual(expected.count_data, len(samples))
+
+    def test_merge_explicit(self):
+        agg = aggregation_data_module.ExponentialDistributionAggregationData(
+            8, 20)
+        other = aggregation_data_module.DistributionAggregationData(0, 0, 0)
+        with self.assertRaises(ValueError):
+            agg.merge(other)
+
+    def test_to_point(self):
+        timestamp = datetime(1970, 1, 1)
+        agg = aggregation_data_module.ExponentialDistributionAggregationData(
+            4, 0)
+        agg.add_samples([1, 3, 3])
+
+        converted_point = agg.to_point(timestamp)
+        self.assertTrue(isinstance(converted_point.value,
+                                   value.ValueDistribution))
+        self.assertEqual(converted_point.value.count, 3)
+        self.assertEqual(converted_point.value.sum, 7)
+        self.assertEqual(converted_point.value.bucket_options.type_.bounds,
+                         [1, 2, 4])
+        self.assertEqual(
+            [bb.count for bb in converted_point.value.buckets], [0, 1, 2, 0])
+
+
+class TestQuantileAggregationData(unittest.TestCase):
+    def test_constructor(self):
+        agg = aggregation_data_module.QuantileAggregationData(
+            0.01, 2048, [50, 99])
+
+        self.assertEqual(agg.count_data, 0)
+        self.assertEqual(agg.sum_data, 0)
+        self.assertIsNone(agg.min)
+        self.assertIsNone(agg.max)
+        self.assertEqual(agg.percentiles, [50, 99])
+        self.assertEqual(agg.relative_accuracy, 0.01)
+        self.assertEqual(agg.quantile(0.5), 0.0)
+
+    def test_quantile_relative_accuracy(self):
+        agg = aggregation_data_module.QuantileAggregationData(
+            0.01, 2048, [50, 99, 99.9])
+        values = list(range(1, 10001))
+        random.Random(0).shuffle(values)
+        for val in values:
+            agg.add_sample(val, None, None)
+
+        self.assertEqual(agg.count_data, 10000)
+        self.assertEqual(agg.sum_data, sum(values))
+        self.assertEqual(agg.min, 1)
+        self.assertEqual(agg.max, 10000)
+        for quantile in (0.5, 0.9, 0.99, 0.999):
+            expected = quantile * 9999 + 1
+            self.assertLessEqual(
+                abs(agg.quantile(quantile) - expected), 0.01 * expected)
+        self.assertEqual(agg.quantile(0), 1)
+        self.assertEqual(agg.quantile(1), 10000)
+
+    def test_add_samples(self):
+        agg = aggregation_data_module.QuantileAggregationData(
+            0.01, 2048, [50])
+        other = aggregation_data_module.QuantileAggregationData(
+            0.01, 2048, [50])
+        agg.add_samples([1, 2, 3, 4])
+        for val in [1, 2, 3, 4]:
+            other.add_sample(val, None, None)
+
+        self.assertEqual(agg.count_data, other.count_data)
+        self.assertEqual(agg.sum_data, other.sum_data)
+        self.assertEqual(agg.quantile(0.5), other.quantile(0.5))
+
+    def test_zero_and_negative_values(self):
+        agg = aggregation_data_module.QuantileAggregationData(
+            0.01, 2048, [50])
+        for val in [-1, 0, 0, 10]:
+            agg.add_sample(val, None, None)
+
+        self.assertEqual(agg.min, -1)
+        self.assertEqual(agg.quantile(0), -1)
+        self.assertEqual(agg.quantile(0.5), 0)
+        self.assertAlmostEqual(agg.quantile(1), 10)
+
+    def test_max_bins(self):
+        agg = aggregation_data_module.QuantileAggregationData(
+            0.01, 10, [50])
+        for val in range(1, 1001):
+            agg.add_sample(val, None, None)
+
+        self.assertEqual(len(agg._bins), 10)
+        self.assertEqual(agg.count_data, 1000)
+        # Only the lowest quantiles lose accuracy
+        self.assertLessEqual(abs(agg.quantile(0.999) - 999), 0.01 * 999)
+        self.assertEqual(agg.quantile(0), 1)
+
+    def test_merge(self):
+        agg = aggregation_data_module.QuantileAggregationData(
+            0.01, 2048, [50])
+        other = aggregation_data_module.QuantileAggregationData(
+            0.01, 2048, [50])
+        for val in range(1, 501):
+            agg.add_sample(val, None, None)
+        for val in range(501, 1001):
+            other.add_sample(val, None, None)
+
+        agg.merge(other)
+        self.assertEqual(agg.count_data, 1000)
+        self.assertEqual(agg.sum_data, sum(range(1, 1001)))
+        self.assertEqual(agg.min, 1)
+        self.assertEqual(agg.max, 1000)
+        self.assertLessEqual(abs(agg.quantile(0.5) - 500.5), 0.01 * 500.5)
+
+        # Merging an empty sketch is a no-op
+        agg.merge(aggregation_data_module.QuantileAggregationData(
+            0.01, 2048, [50]))
+        self.assertEqual(agg.count_data, 1000)
+
+        # Merging into an empty sketch copies the other one
+        empty = aggregation_data_module.QuantileAggregationData(
+            0.01, 2048, [50])
+        empty.merge(other)
+        self.assertEqual(empty.min, 501)
+        self.assertEqual(empty.max, 1000)
+
+    def test_merge_different_accuracy(self):
+        agg = aggregation_data_module.QuantileAggregationData(
+            0.01, 2048, [50])
+        other = aggregation_data_module.QuantileAggregationData(
+            0.02, 2048, [50])
+        other.add_sample(1, None, None)
+
+        with self.assertRaises(ValueError):
+            agg.merge(other)
+
+    def test_to_point(self):
+        timestamp = datetime(1970, 1, 1)
+        agg = aggregation_data_module.QuantileAggregationData(
+            0.01, 2048, [50, 100])
+        agg.add_samples([1, 2, 3])
+
+        converted_point = agg.to_point(timestamp)
+        self.assertTrue(isinstance(converted_point, point.Point))
+        self.assertTrue(isinstance(converted_point.value, value.ValueSummary))
+        self.assertEqual(converted_point.timestamp, timestamp)
+        summary_value = converted_point.value.value
+        self.assertTrue(isinstance(summary_value, summary.Summary))
+        self.assertEqual(summary_value.count, 3)
+        self.assertEqual(summary_value.sum_data, 6)
+        self.assertEqual(summary_value.snapshot.count, 3)
+        self.assertEqual(summary_value.snapshot.sum_data, 6)
+        [p50, p100] = summary_value.snapshot.value_at_percentiles
+        self.assertEqual(p50.percentile, 50)
+        self.assertAlmostEqual(p50.value, 2, delta=0.02)
+        self.assertEqual(p100.percentile, 100)
+        self.assertEqual(p100.value, 3)
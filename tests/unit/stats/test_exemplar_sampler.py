@@ -0,0 +1,105 @@
+# Copyright 2019, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import random
+import unittest
+
+import mock
+
+from opencensus.stats import aggregation_data as aggregation_data_module
+from opencensus.stats import exemplar_sampler as exemplar_sampler_module
+
+
+class TestExemplarSampler(unittest.TestCase):
+    def test_should_sample_abstract(self):
+        sampler = exemplar_sampler_module.ExemplarSampler()
+        with self.assertRaises(NotImplementedError):
+            sampler.should_sample(1, None, None)
+
+    def test_deepcopy_shares_sampler(self):
+        sampler = exemplar_sampler_module.ReservoirExemplarSampler()
+        self.assertIs(copy.deepcopy(sampler), sampler)
+
+
+class TestAlwaysOnExemplarSampler(unittest.TestCase):
+    def test_should_sample(self):
+        sampler = exemplar_sampler_module.AlwaysOnExemplarSampler()
+        self.assertTrue(sampler.should_sample(1, None, None))
+        self.assertTrue(sampler.should_sample(100, mock.Mock(), 1.0))
+
+
+class TestReservoirExemplarSampler(unittest.TestCase):
+    def test_should_sample_first(self):
+        rng = mock.Mock()
+        rng.random.return_value = 0.99
+        sampler = exemplar_sampler_module.ReservoirExemplarSampler(rng)
+        self.assertTrue(sampler.should_sample(5, None, None))
+
+    def test_should_sample_probability(self):
+        rng = mock.Mock()
+        sampler = exemplar_sampler_module.ReservoirExemplarSampler(rng)
+        exemplar = mock.Mock()
+
+        rng.random.return_value = 0.24
+        self.assertTrue(sampler.should_sample(4, exemplar, None))
+        rng.random.return_value = 0.25
+        self.assertFalse(sampler.should_sample(4, exemplar, None))
+
+    def test_few_exemplars_created(self):
+        sampler = exemplar_sampler_module.ReservoirExemplarSampler(
+            random.Random(0))
+        agg = aggregation_data_module.DistributionAggregationData(
+            0, 0, 0, None, [10], exemplar_sampler=sampler)
+
+        with mock.patch.object(aggregation_data_module, 'Exemplar',
+                               wraps=aggregation_data_module.Exemplar) \
+                as mock_exemplar:
+            for ii in range(10000):
+                agg.add_sample(1, None, {'trace_id': str(ii)})
+
+        self.assertLess(mock_exemplar.call_count, 50)
+        self.assertEqual(agg.counts_per_bucket, [10000, 0])
+        self.assertIsNotNone(agg.exemplars[0])
+        self.assertIsNone(agg.exemplars[1])
+
+
+class TestRateLimitedExemplarSampler(unittest.TestCase):
+    def test_constructor(self):
+        sampler = exemplar_sampler_module.RateLimitedExemplarSampler(10)
+        self.assertEqual(sampler.interval, 10)
+
+        with self.assertRaises(ValueError):
+            exemplar_sampler_module.RateLimitedExemplarSampler(-1)
+
+    def test_should_sample(self):
+        sampler = exemplar_sampler_module.RateLimitedExemplarSampler(10)
+        exemplar = aggregation_data_module.Exemplar(1, 100.0, {})
+
+        self.assertTrue(sampler.should_sample(1, None, 100.0))
+        self.assertFalse(sampler.should_sample(2, exemplar, 109.0))
+        self.assertTrue(sampler.should_sample(2, exemplar, 110.0))
+        self.assertTrue(sampler.should_sample(2, exemplar, None))
+
+    def test_should_sample_string_timestamps(self):
+        sampler = exemplar_sampler_module.RateLimitedExemplarSampler(10)
+        numeric = aggregation_data_module.Exemplar(1, 100.0, {})
+        iso = aggregation_data_module.Exemplar(
+            1, '2019-01-01T00:00:00.000000Z', {})
+
+        self.assertTrue(sampler.should_sample(
+            2, numeric, '2019-01-01T00:00:01.000000Z'))
+        self.assertTrue(sampler.should_sample(2, iso, 101.0))
+        self.assertTrue(sampler.should_sample(
+            2, iso, '2019-01-01T00:00:01.000000Z'))
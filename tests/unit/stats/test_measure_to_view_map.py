@@ -20,7 +20,9 @@ from opencensus.stats import measure_to_view_map as measure_to_view_map_module
 from opencensus.stats.aggregation import CountAggregation
 from opencensus.stats.measure import BaseMeasure
 from opencensus.stats.measure import MeasureInt
+from opencensus.stats.view import Temporality
 from opencensus.stats.view import View
+from opencensus.stats.view_data import ShardedViewData
 from opencensus.stats.view_data import ViewData
 from opencensus.tags import tag_key as tag_key_module
 
@@ -412,3 +414,174 @@ class TestMeasureToViewMap(unittest.TestCase):
         self.assertIsNot(exported_vd1, exported_vd2)
         self.assertIsNot(exported_vd1.end_time, view_data.end_time)
         self.assertIsNot(exported_vd2.end_time, view_data.end_time)
+
+    def test_export_no_exporters(self):
+        """Check that we don't copy view data if nothing is exported."""
+        mtvm = measure_to_view_map_module.MeasureToViewMap()
+        view_data = mock.Mock()
+        with mock.patch.object(mtvm, 'copy_and_finalize_view_data') as cafvd:
+            mtvm.export([view_data])
+        cafvd.assert_not_called()
+
+    def test_get_view_datas(self):
+        mtvm = measure_to_view_map_module.MeasureToViewMap()
+        self.assertEqual(mtvm.get_view_datas(), [])
+
+        timestamp = mock.Mock()
+        mtvm.register_view(REQUEST_COUNT_VIEW, timestamp)
+        [view_data] = mtvm._measure_to_view_data_list_map[
+            REQUEST_COUNT_MEASURE.name]
+
+        [view_data_copy] = mtvm.get_view_datas()
+        self.assertIsNot(view_data_copy, view_data)
+        self.assertIs(view_data_copy.view, REQUEST_COUNT_VIEW)
+        self.assertIsNot(view_data_copy.end_time, timestamp)
+
+    def test_get_view_datas_delta(self):
+        delta_view = View("delta_view", "description", [METHOD_KEY],
+                          REQUEST_COUNT_MEASURE, COUNT,
+                          temporality=Temporality.DELTA)
+        mtvm = measure_to_view_map_module.MeasureToViewMap(sharded=True)
+        mtvm.register_view(delta_view, "2019-01-01T00:00:00Z")
+        [view_data] = mtvm._measure_to_view_data_list_map[
+            REQUEST_COUNT_MEASURE.name]
+        self.assertNotIsInstance(view_data, ShardedViewData)
+
+        tags = mock.Mock()
+        tags.map = {METHOD_KEY: 'get'}
+        mtvm.record(tags, {REQUEST_COUNT_MEASURE: 1}, mock.Mock())
+
+        [first] = mtvm.get_view_datas()
+        [agg_data] = first.tag_value_aggregation_data_map.values()
+        self.assertEqual(agg_data.count_data, 1)
+        [second] = mtvm.get_view_datas()
+        self.assertEqual(second.tag_value_aggregation_data_map, {})
+        self.assertEqual(second.start_time, first.end_time)
+
+    def test_record_many(self):
+        exporter = mock.Mock()
+        mtvm = measure_to_view_map_module.MeasureToViewMap()
+        mtvm.register_view(REQUEST_COUNT_VIEW, mock.Mock())
+        mtvm.exporters.append(exporter)
+        tags = mock.Mock()
+        tags.map = {METHOD_KEY: 'get'}
+
+        mtvm.record_many(tags, REQUEST_COUNT_MEASURE, [1, 2, 3], mock.Mock())
+
+        [view_data] = mtvm._measure_to_view_data_list_map[
+            REQUEST_COUNT_MEASURE.name]
+        [agg_data] = view_data.tag_value_aggregation_data_map.values()
+        self.assertEqual(agg_data.count_data, 3)
+        # The batch is exported once
+        exporter.export.assert_called_once()
+
+    def test_record_many_unregistered_measure(self):
+        mtvm = measure_to_view_map_module.MeasureToViewMap()
+        mtvm.register_view(REQUEST_COUNT_VIEW, mock.Mock())
+        other_measure = MeasureInt("request_count", "other measure", "1")
+        [view_data] = mtvm._measure_to_view_data_list_map[
+            REQUEST_COUNT_MEASURE.name]
+
+        mtvm.record_many(mock.Mock(), other_measure, [1], mock.Mock())
+        mtvm.record_many(mock.Mock(), MeasureInt("other", "", "1"), [1],
+                         mock.Mock())
+
+        self.assertEqual(view_data.tag_value_aggregation_data_map, {})
+
+    def test_record_looks_up_measure_by_name(self):
+        """Check that record doesn't scan the views of other measures."""
+
+        class NoScanDict(dict):
+            def items(self):
+                raise AssertionError("measure map should not be scanned")
+
+            def values(self):
+                raise AssertionError("measure map should not be scanned")
+
+        mtvm = measure_to_view_map_module.MeasureToViewMap()
+        other_view_datas = []
+        for ii in range(10):
+            other_measure = MeasureInt("other_{}".format(ii), "other", "1")
+            other_view_data = mock.Mock()
+            mtvm._registered_measures[other_measure.name] = other_measure
+            mtvm._measure_to_view_data_list_map[other_measure.name] = [
+                other_view_data]
+            other_view_datas.append(other_view_data)
+
+        view_data = mock.Mock()
+        mtvm._registered_measures[REQUEST_COUNT_MEASURE.name] = \
+            REQUEST_COUNT_MEASURE
+        mtvm._measure_to_view_data_list_map[REQUEST_COUNT_MEASURE.name] = [
+            view_data]
+        mtvm._measure_to_view_data_list_map = NoScanDict(
+            mtvm._measure_to_view_data_list_map)
+
+        tags = mock.Mock()
+        timestamp = mock.Mock()
+        mtvm.record(tags, {REQUEST_COUNT_MEASURE: 1}, timestamp)
+
+        view_data.record.assert_called_once_with(
+            context=tags, value=1, timestamp=timestamp, attachments=None)
+        for other_view_data in other_view_datas:
+            other_view_data.record.assert_not_called()
+
+    def test_record_measure_without_views(self):
+        exporter = mock.Mock()
+        mtvm = measure_to_view_map_module.MeasureToViewMap()
+        mtvm.exporters.append(exporter)
+        mtvm._registered_measures[REQUEST_COUNT_MEASURE.name] = \
+            REQUEST_COUNT_MEASURE
+
+        mtvm.record(mock.Mock(), {REQUEST_COUNT_MEASURE: 1}, mock.Mock())
+
+        exporter.export.assert_not_called()
+
+    def test_register_view_sharded(self):
+        mtvm = measure_to_view_map_module.MeasureToViewMap(sharded=True)
+        self.assertTrue(mtvm.sharded)
+        mtvm.register_view(REQUEST_COUNT_VIEW, mock.Mock())
+        [view_data] = mtvm._measure_to_view_data_list_map[
+            REQUEST_COUNT_MEASURE.name]
+        self.assertIsInstance(view_data, ShardedViewData)
+
+        # Copies of sharded view data contain the merged data
+        view_data.record(None, 1, None)
+        view_data_copy = mtvm.get_view(REQUEST_COUNT_VIEW_NAME, None)
+        self.assertNotIsInstance(view_data_copy, ShardedViewData)
+        [agg_data] = view_data_copy.tag_value_aggregation_data_map.values()
+        self.assertEqual(agg_data.count_data, 1)
+
+    def test_register_view_max_time_series(self):
+        view = View("limited_view", "description", [METHOD_KEY],
+                    REQUEST_COUNT_MEASURE, COUNT, max_time_series=1)
+        mtvm = measure_to_view_map_module.MeasureToViewMap(sharded=True)
+        mtvm.register_view(view, mock.Mock())
+        [view_data] = mtvm._measure_to_view_data_list_map[
+            REQUEST_COUNT_MEASURE.name]
+        self.assertNotIsInstance(view_data, ShardedViewData)
+        self.assertEqual(view_data.max_time_series, 1)
+
+    def test_get_metrics_overflow(self):
+        limited_view = View("limited_view", "description", [METHOD_KEY],
+                            REQUEST_COUNT_MEASURE, COUNT, max_time_series=1)
+        mtvm = measure_to_view_map_module.MeasureToViewMap()
+        mtvm.register_view(REQUEST_COUNT_VIEW, "2019-01-01T00:00:00Z")
+
+        # No overflow metric without views with a limit
+        self.assertEqual(list(mtvm.get_metrics(mock.Mock())), [])
+
+        mtvm.register_view(limited_view, "2019-01-01T00:00:00Z")
+        for method in ('get', 'post', 'put'):
+            tags = mock.Mock()
+            tags.map = {METHOD_KEY: method}
+            mtvm.record(tags, {REQUEST_COUNT_MEASURE: 1}, mock.Mock())
+
+        metrics = list(mtvm.get_metrics(mock.Mock()))
+        names = [mm.descriptor.name for mm in metrics]
+        self.assertEqual(
+            names, [REQUEST_COUNT_VIEW_NAME, "limited_view",
+                    "opencensus.io/stats/view/overflowed_records"])
+        [ts] = metrics[-1].time_series
+        self.assertEqual(ts.label_values[0].value, "limited_view")
+        self.assertEqual(ts.points[0].value.value, 2)
+        self.assertEqual(ts.start_timestamp, "2019-01-01T00:00:00Z")
@@ -133,6 +133,17 @@ class TestMeasurementMap(unittest.TestCase):
         measurement_map.record(tag_map_tags=tags)
         self.assertTrue(measure_to_view_map.record.called)
 
+    @mock.patch('time.time', return_value=1.5)
+    def test_record_epoch_timestamp(self, mock_time):
+        measure_to_view_map = mock.Mock()
+        measurement_map = measurement_map_module.MeasurementMap(
+            measure_to_view_map=measure_to_view_map)
+
+        measurement_map.record(tag_map_tags={})
+
+        _, kwargs = measure_to_view_map.record.call_args
+        self.assertEqual(kwargs['timestamp'], 1.5)
+
     def test_record_against_implicit_tag_map(self):
         measure_to_view_map = mock.Mock()
         measurement_map = measurement_map_module.MeasurementMap(
@@ -196,3 +207,79 @@ class TestMeasurementMap(unittest.TestCase):
         with logger_patch as another_mock_logger:
             measurement_map.measure_float_put(mock.Mock(), -1.0)
         another_mock_logger.warning.assert_called_once()
+
+    def test_record_many(self):
+        measure_to_view_map = mock.Mock()
+        measurement_map = measurement_map_module.MeasurementMap(
+            measure_to_view_map=measure_to_view_map,
+            attachments={'k': 'v'})
+        measure = mock.Mock()
+        tags = {'testtag1': 'testtag1val'}
+
+        measurement_map.record_many(measure, iter([1, 2, 3]),
+                                    tag_map_tags=tags)
+
+        measure_to_view_map.record_many.assert_called_once_with(
+            tags=tags, measure=measure, values=[1, 2, 3],
+            timestamp=mock.ANY, attachments={'k': 'v'})
+
+    def test_record_many_array(self):
+        measure_to_view_map = mock.Mock()
+        measurement_map = measurement_map_module.MeasurementMap(
+            measure_to_view_map=measure_to_view_map)
+        values = mock.Mock()
+        values.tolist.return_value = [1.5, 2.5]
+
+        execution_context.set_current_tag_map({})
+        measurement_map.record_many(mock.Mock(), values)
+
+        _, kwargs = measure_to_view_map.record_many.call_args
+        self.assertEqual(kwargs['values'], [1.5, 2.5])
+        self.assertEqual(kwargs['tags'], {})
+
+    def test_record_many_empty(self):
+        measure_to_view_map = mock.Mock()
+        measurement_map = measurement_map_module.MeasurementMap(
+            measure_to_view_map=measure_to_view_map)
+        measurement_map.record_many(mock.Mock(), [], tag_map_tags={})
+        measure_to_view_map.record_many.assert_not_called()
+
+    def test_record_many_negative_value(self):
+        measurement_map = measurement_map_module.MeasurementMap(mock.Mock())
+
+        with logger_patch as mock_logger:
+            measurement_map.record_many(mock.Mock(), [1, -1, 2],
+                                        tag_map_tags={})
+
+        measurement_map.measure_to_view_map.record_many.assert_not_called()
+        mock_logger.warning.assert_called_once()
+
+    def test_record_batch(self):
+        measure_to_view_map = mock.Mock()
+        measurement_map = measurement_map_module.MeasurementMap(
+            measure_to_view_map=measure_to_view_map)
+        measure1 = mock.Mock()
+        measure2 = mock.Mock()
+        tags = {'testtag1': 'testtag1val'}
+
+        measurement_map.record_batch(
+            [{measure1: 1, measure2: 10}, {measure1: 2}, {measure2: 20}],
+            tag_map_tags=tags)
+
+        calls = measure_to_view_map.record_many.call_args_list
+        self.assertEqual(len(calls), 2)
+        values = {kwargs['measure']: kwargs['values']
+                  for _, kwargs in calls}
+        self.assertEqual(values, {measure1: [1, 2], measure2: [10, 20]})
+        # All the rows are recorded at the same time
+        self.assertEqual(calls[0][1]['timestamp'], calls[1][1]['timestamp'])
+
+    def test_record_batch_negative_value(self):
+        measurement_map = measurement_map_module.MeasurementMap(mock.Mock())
+
+        with logger_patch as mock_logger:
+            measurement_map.record_batch(
+                [{mock.Mock(): 1}, {mock.Mock(): -1}], tag_map_tags={})
+
+        measurement_map.measure_to_view_map.record_many.assert_not_called()
+        mock_logger.warning.assert_called_once()
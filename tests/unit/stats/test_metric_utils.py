@@ -45,6 +45,8 @@ class TestMetricUtils(unittest.TestCase):
         agg_dist.aggregation_type = aggregation.Type.DISTRIBUTION
         agg_lv = mock.Mock(spec=aggregation.LastValueAggregation)
         agg_lv.aggregation_type = aggregation.Type.LASTVALUE
+        agg_quantile = mock.Mock(spec=aggregation.QuantileAggregation)
+        agg_quantile.aggregation_type = aggregation.Type.QUANTILE
 
         view_to_metric_type = {
             (measure_int, agg_sum):
@@ -63,6 +65,10 @@ class TestMetricUtils(unittest.TestCase):
             metric_descriptor.MetricDescriptorType.CUMULATIVE_DISTRIBUTION,
             (measure_float, agg_lv):
             metric_descriptor.MetricDescriptorType.GAUGE_DOUBLE,
+            (measure_int, agg_quantile):
+            metric_descriptor.MetricDescriptorType.SUMMARY,
+            (measure_float, agg_quantile):
+            metric_descriptor.MetricDescriptorType.SUMMARY,
         }
 
         for (mm, ma), metric_type in view_to_metric_type.items():
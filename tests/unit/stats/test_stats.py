@@ -22,6 +22,7 @@ import unittest
 from opencensus.metrics.export import metric_descriptor
 from opencensus.metrics.export import value
 from opencensus.stats import aggregation
+from opencensus.stats import execution_context
 from opencensus.stats import measure
 from opencensus.stats import stats as stats_module
 from opencensus.stats import view
@@ -32,6 +33,8 @@ class TestStats(unittest.TestCase):
     def test_get_metrics(self):
         """Test that Stats converts recorded values into metrics."""
 
+        execution_context.clear()
+        self.addCleanup(execution_context.clear)
         stats = stats_module.Stats()
 
         # Check that metrics are empty before view registration
@@ -48,6 +51,9 @@ class TestStats(unittest.TestCase):
         mock_view.measure = mock_measure
         mock_view.get_metric_descriptor.return_value = mock_md
         mock_view.columns = ['k1']
+        mock_view.max_time_series = None
+        mock_view.temporality = view.Temporality.CUMULATIVE
+        mock_view.max_idle_intervals = None
 
         stats.view_manager.measure_to_view_map.register_view(mock_view, Mock())
 
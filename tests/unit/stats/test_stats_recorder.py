@@ -40,3 +40,22 @@ class TestStatsRecorder(unittest.TestCase):
             measurement_map.measurement_map,
             MeasurementMap(
                 measure_to_view_map=measure_to_view_map).measurement_map)
+
+    def test_constructor_sharded(self):
+        execution_context.clear()
+
+        stats_recorder = stats_recorder_module.StatsRecorder(sharded=True)
+        self.assertTrue(stats_recorder.measure_to_view_map.sharded)
+
+        execution_context.clear()
+
+    @mock.patch('opencensus.stats.stats_recorder.logger')
+    def test_constructor_sharded_after_setup(self, mock_logger):
+        execution_context.clear()
+
+        stats_recorder_module.StatsRecorder()
+        stats_recorder = stats_recorder_module.StatsRecorder(sharded=True)
+        self.assertFalse(stats_recorder.measure_to_view_map.sharded)
+        self.assertTrue(mock_logger.warning.called)
+
+        execution_context.clear()
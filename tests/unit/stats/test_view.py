@@ -43,6 +43,51 @@ class TestView(unittest.TestCase):
         self.assertEqual(measure, view.measure)
         self.assertEqual(aggregation, view.aggregation)
 
+    def test_constructor_max_time_series(self):
+        test_view = view_module.View(
+            "name", "description", ["tk1"], mock.Mock(), mock.Mock())
+        self.assertIsNone(test_view.max_time_series)
+        self.assertEqual(test_view.overflow_policy,
+                         view_module.OverflowPolicy.DROP)
+
+        test_view = view_module.View(
+            "name", "description", ["tk1"], mock.Mock(), mock.Mock(),
+            max_time_series=10,
+            overflow_policy=view_module.OverflowPolicy.FOLD)
+        self.assertEqual(test_view.max_time_series, 10)
+        self.assertEqual(test_view.overflow_policy,
+                         view_module.OverflowPolicy.FOLD)
+
+    def test_constructor_invalid_max_time_series(self):
+        with self.assertRaises(ValueError):
+            view_module.View("name", "description", ["tk1"], mock.Mock(),
+                             mock.Mock(), max_time_series=0)
+        with self.assertRaises(ValueError):
+            view_module.View("name", "description", ["tk1"], mock.Mock(),
+                             mock.Mock(), max_time_series=10,
+                             overflow_policy=3)
+
+    def test_constructor_temporality(self):
+        test_view = view_module.View(
+            "name", "description", ["tk1"], mock.Mock(), mock.Mock())
+        self.assertEqual(test_view.temporality,
+                         view_module.Temporality.CUMULATIVE)
+        self.assertIsNone(test_view.max_idle_intervals)
+
+        test_view = view_module.View(
+            "name", "description", ["tk1"], mock.Mock(), mock.Mock(),
+            temporality=view_module.Temporality.DELTA, max_idle_intervals=3)
+        self.assertEqual(test_view.temporality,
+                         view_module.Temporality.DELTA)
+        self.assertEqual(test_view.max_idle_intervals, 3)
+
+        with self.assertRaises(ValueError):
+            view_module.View("name", "description", ["tk1"], mock.Mock(),
+                             mock.Mock(), temporality=2)
+        with self.assertRaises(ValueError):
+            view_module.View("name", "description", ["tk1"], mock.Mock(),
+                             mock.Mock(), max_idle_intervals=0)
+
     def test_view_to_metric_descriptor(self):
         mock_measure = mock.Mock(spec=measure.MeasureFloat)
         mock_agg = mock.Mock(spec=aggregation.SumAggregation)
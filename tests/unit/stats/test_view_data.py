@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
 import unittest
 import mock
 from datetime import datetime
@@ -19,6 +20,9 @@ from opencensus.stats import aggregation as aggregation_module
 from opencensus.stats import measure as measure_module
 from opencensus.stats import view_data as view_data_module
 from opencensus.stats import view as view_module
+from opencensus.tags import tag_key as tag_key_module
+from opencensus.tags import tag_map as tag_map_module
+from opencensus.tags import tag_value as tag_value_module
 
 
 class TestViewData(unittest.TestCase):
@@ -314,3 +318,517 @@ class TestViewData(unittest.TestCase):
         self.assertTrue(tuple_vals in view_data.tag_value_aggregation_data_map)
         sum_data = view_data.tag_value_aggregation_data_map.get(tuple_vals)
         self.assertEqual(4, sum_data.sum_data)
+
+    def test_record_with_tag_map(self):
+        key1 = tag_key_module.TagKey('key1')
+        key2 = tag_key_module.TagKey('key2')
+        view = view_module.View(
+            "test_view", "description", [key2, key1], mock.Mock(),
+            aggregation_module.SumAggregation())
+        view_data = view_data_module.ViewData(
+            view=view, start_time=mock.Mock(), end_time=mock.Mock())
+        tag_map = tag_map_module.TagMap()
+        tag_map.insert(key1, tag_value_module.TagValue('val1'))
+
+        view_data.record(context=tag_map, value=1, timestamp=None)
+        view_data.record(context=tag_map, value=2, timestamp=None)
+        tag_map.insert(key2, tag_value_module.TagValue('val2'))
+        view_data.record(context=tag_map, value=4, timestamp=None)
+
+        tvadm = view_data.tag_value_aggregation_data_map
+        self.assertEqual(tvadm[(None, 'val1')].sum_data, 3)
+        self.assertEqual(tvadm[('val2', 'val1')].sum_data, 4)
+
+    def test_copy_tag_value_aggregation_data_map(self):
+        measure = mock.Mock()
+        sum_aggregation = aggregation_module.SumAggregation()
+        view = view_module.View("test_view", "description", ['key1'],
+                                measure, sum_aggregation)
+        view_data = view_data_module.ViewData(
+            view=view, start_time=mock.Mock(), end_time=mock.Mock())
+        context = mock.Mock()
+        context.map = {'key1': 'val1'}
+        view_data.record(context=context, value=2, timestamp=None)
+
+        map_copy = view_data.copy_tag_value_aggregation_data_map()
+        view_data.record(context=context, value=3, timestamp=None)
+
+        self.assertEqual(map_copy[('val1',)].sum_data, 2)
+        self.assertEqual(
+            view_data.tag_value_aggregation_data_map[('val1',)].sum_data, 5)
+
+    def test_record_concurrently(self):
+        """Check that concurrent records to the same series aren't lost."""
+        num_threads = 32
+        num_records = 1000
+
+        measure = mock.Mock()
+        count_view = view_module.View(
+            "count_view", "description", ['key1'], measure,
+            aggregation_module.CountAggregation())
+        distribution_view = view_module.View(
+            "distribution_view", "description", ['key1'], measure,
+            aggregation_module.DistributionAggregation([1, 2, 4]))
+        count_view_data = view_data_module.ViewData(
+            view=count_view, start_time=mock.Mock(), end_time=mock.Mock())
+        distribution_view_data = view_data_module.ViewData(
+            view=distribution_view, start_time=mock.Mock(),
+            end_time=mock.Mock())
+        evict_view_data = view_data_module.ViewData(
+            view=count_view, start_time=mock.Mock(), end_time=mock.Mock(),
+            max_time_series=50,
+            overflow_policy=view_module.OverflowPolicy.EVICT)
+
+        # Keep the time series evicted meanwhile to count their records
+        evict_agg_data = []
+        new_aggregation_data = evict_view_data._new_aggregation_data
+
+        def track_aggregation_data():
+            agg_data = new_aggregation_data()
+            evict_agg_data.append(agg_data)
+            return agg_data
+        evict_view_data._new_aggregation_data = track_aggregation_data
+
+        contexts = []
+        for ii in range(200):
+            context = mock.Mock()
+            context.map = {'key1': 'val{}'.format(ii)}
+            contexts.append(context)
+
+        def record():
+            for ii in range(num_records):
+                context = contexts[ii % len(contexts)]
+                count_view_data.record(context, 1, None)
+                distribution_view_data.record(context, ii % 5, None)
+                evict_view_data.record(context, 1, None)
+
+        threads = [threading.Thread(target=record)
+                   for _ in range(num_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        per_series = num_threads * num_records // len(contexts)
+        count_map = count_view_data.tag_value_aggregation_data_map
+        self.assertEqual(len(count_map), len(contexts))
+        for agg_data in count_map.values():
+            self.assertEqual(agg_data.count_data, per_series)
+
+        dist_map = distribution_view_data.tag_value_aggregation_data_map
+        self.assertEqual(len(dist_map), len(contexts))
+        for agg_data in dist_map.values():
+            self.assertEqual(agg_data.count_data, per_series)
+            self.assertEqual(sum(agg_data.counts_per_bucket), per_series)
+
+        evict_map = evict_view_data.tag_value_aggregation_data_map
+        # Threads racing to create the same time series may both evict one
+        self.assertLessEqual(len(evict_map), 50)
+        self.assertEqual(set(evict_view_data._recency), set(evict_map))
+        self.assertEqual(
+            sum(agg_data.count_data for agg_data in evict_agg_data),
+            num_threads * num_records)
+
+    def test_record_many(self):
+        measure = mock.Mock()
+        view = view_module.View(
+            "test_view", "description", ['key1'], measure,
+            aggregation_module.DistributionAggregation([1, 2]))
+        view_data = view_data_module.ViewData(
+            view=view, start_time=mock.Mock(), end_time=mock.Mock())
+        context = mock.Mock()
+        context.map = {'key1': 'val1'}
+
+        view_data.record_many(context=context, values=[0.5, 1, 1.5, 3],
+                              timestamp=None)
+        view_data.record(context=context, value=2, timestamp=None)
+
+        [agg_data] = view_data.tag_value_aggregation_data_map.values()
+        self.assertEqual(agg_data.count_data, 5)
+        self.assertEqual(agg_data.mean_data, 1.6)
+        self.assertEqual(agg_data.counts_per_bucket, [1, 2, 2])
+
+
+class TestViewDataMaxTimeSeries(unittest.TestCase):
+    def _make_view_data(self, overflow_policy):
+        view = view_module.View(
+            "test_view", "description", ['key1', 'key2'], mock.Mock(),
+            aggregation_module.CountAggregation(), max_time_series=2,
+            overflow_policy=overflow_policy)
+        return view_data_module.ViewData(
+            view=view, start_time=mock.Mock(), end_time=mock.Mock(),
+            max_time_series=view.max_time_series,
+            overflow_policy=view.overflow_policy)
+
+    @staticmethod
+    def _record(view_data, value1, value2='val'):
+        context = mock.Mock()
+        context.map = {'key1': value1, 'key2': value2}
+        view_data.record(context=context, value=1, timestamp=None)
+
+    def _get_counts(self, view_data):
+        return {tag_values: agg_data.count_data
+                for tag_values, agg_data
+                in view_data.tag_value_aggregation_data_map.items()}
+
+    def test_unlimited(self):
+        view_data = view_data_module.ViewData(
+            view=mock.Mock(), start_time=mock.Mock(), end_time=mock.Mock())
+        self.assertIsNone(view_data.max_time_series)
+        self.assertEqual(view_data.overflow_count, 0)
+
+    def test_drop(self):
+        view_data = self._make_view_data(view_module.OverflowPolicy.DROP)
+        self.assertEqual(view_data.max_time_series, 2)
+
+        self._record(view_data, 'a')
+        self._record(view_data, 'b')
+        self._record(view_data, 'c')
+        self._record(view_data, 'c')
+        # Existing time series keep recording once the limit is reached
+        self._record(view_data, 'a')
+
+        self.assertEqual(self._get_counts(view_data),
+                         {('a', 'val'): 2, ('b', 'val'): 1})
+        self.assertEqual(view_data.overflow_count, 2)
+
+    def test_fold(self):
+        view_data = self._make_view_data(view_module.OverflowPolicy.FOLD)
+
+        self._record(view_data, 'a')
+        self._record(view_data, 'b')
+        self._record(view_data, 'c')
+        self._record(view_data, 'd')
+
+        overflow = (view_module.OVERFLOW_TAG_VALUE,) * 2
+        self.assertEqual(self._get_counts(view_data),
+                         {('a', 'val'): 1, ('b', 'val'): 1, overflow: 2})
+        self.assertEqual(view_data.overflow_count, 2)
+
+    def test_evict(self):
+        view_data = self._make_view_data(view_module.OverflowPolicy.EVICT)
+
+        self._record(view_data, 'a')
+        self._record(view_data, 'b')
+        self._record(view_data, 'a')
+        # 'b' is the least recently updated time series
+        self._record(view_data, 'c')
+
+        self.assertEqual(self._get_counts(view_data),
+                         {('a', 'val'): 2, ('c', 'val'): 1})
+        self.assertEqual(view_data.overflow_count, 1)
+
+        self._record(view_data, 'b')
+
+        self.assertEqual(self._get_counts(view_data),
+                         {('c', 'val'): 1, ('b', 'val'): 1})
+        self.assertEqual(view_data.overflow_count, 2)
+
+    def test_record_many(self):
+        view_data = self._make_view_data(view_module.OverflowPolicy.FOLD)
+        context = mock.Mock()
+
+        for value1 in ('a', 'b', 'c'):
+            context.map = {'key1': value1, 'key2': 'val'}
+            view_data.record_many(context, [1, 2, 3], None)
+
+        overflow = (view_module.OVERFLOW_TAG_VALUE,) * 2
+        self.assertEqual(self._get_counts(view_data),
+                         {('a', 'val'): 3, ('b', 'val'): 3, overflow: 3})
+        self.assertEqual(view_data.overflow_count, 3)
+
+    def test_record_concurrently(self):
+        view_data = self._make_view_data(view_module.OverflowPolicy.FOLD)
+        num_threads = 8
+        num_records = 500
+
+        def record(thread_index):
+            for ii in range(num_records):
+                self._record(view_data, str(ii % 10), str(thread_index))
+
+        threads = [threading.Thread(target=record, args=(ii,))
+                   for ii in range(num_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        counts = self._get_counts(view_data)
+        # The limit plus the overflow time series
+        self.assertEqual(len(counts), 3)
+        self.assertEqual(sum(counts.values()), num_threads * num_records)
+        overflow = (view_module.OVERFLOW_TAG_VALUE,) * 2
+        self.assertEqual(counts[overflow], view_data.overflow_count)
+
+
+class TestViewDataSnapshot(unittest.TestCase):
+    def _make_view_data(self, **kwargs):
+        view = view_module.View(
+            "test_view", "description", ['key1'], mock.Mock(),
+            aggregation_module.SumAggregation())
+        return view_data_module.ViewData(
+            view=view, start_time="2019-01-01T00:00:00Z",
+            end_time="2019-01-01T00:00:00Z", **kwargs)
+
+    @staticmethod
+    def _record(view_data, tag_value, value=1):
+        context = mock.Mock()
+        context.map = {'key1': tag_value}
+        view_data.record(context=context, value=value, timestamp=None)
+
+    @staticmethod
+    def _get_sums(view_data):
+        return {tag_values: agg_data.sum_data
+                for tag_values, agg_data
+                in view_data.tag_value_aggregation_data_map.items()}
+
+    def test_snapshot(self):
+        view_data = self._make_view_data()
+        self._record(view_data, 'a', 2)
+        self._record(view_data, 'b', 1)
+
+        first = view_data.snapshot()
+        self._record(view_data, 'a', 3)
+        second = view_data.snapshot()
+
+        self.assertIsInstance(first, view_data_module.ViewDataSnapshot)
+        self.assertIs(first.view, view_data.view)
+        self.assertEqual(first.start_time, "2019-01-01T00:00:00Z")
+        self.assertEqual(self._get_sums(first), {('a',): 2, ('b',): 1})
+        self.assertEqual(self._get_sums(second), {('a',): 5, ('b',): 1})
+        # Only the time series changed since the first snapshot are copied
+        first_map = first.tag_value_aggregation_data_map
+        second_map = second.tag_value_aggregation_data_map
+        self.assertIs(first_map[('b',)], second_map[('b',)])
+        self.assertIsNot(first_map[('a',)], second_map[('a',)])
+        self.assertIsNot(second_map[('a',)],
+                         view_data.tag_value_aggregation_data_map[('a',)])
+        # Taking a snapshot does not start a new interval
+        self.assertEqual(self._get_sums(view_data.collect()),
+                         {('a',): 5, ('b',): 1})
+
+    def test_snapshot_removed_time_series(self):
+        view_data = self._make_view_data(max_idle_intervals=1)
+        self._record(view_data, 'a')
+        self._record(view_data, 'b')
+        self.assertEqual(self._get_sums(view_data.snapshot()),
+                         {('a',): 1, ('b',): 1})
+
+        view_data.collect()
+        self._record(view_data, 'a')
+        view_data.collect()
+
+        self.assertEqual(self._get_sums(view_data.snapshot()), {('a',): 2})
+
+    def test_snapshot_concurrently(self):
+        """Check that snapshots taken while recording stay consistent."""
+        view_data = self._make_view_data()
+        num_threads = 8
+        num_records = 1000
+        done = threading.Event()
+        totals = []
+
+        def record():
+            for ii in range(num_records):
+                self._record(view_data, str(ii % 50))
+
+        def take_snapshots():
+            while not done.is_set():
+                totals.append(sum(self._get_sums(
+                    view_data.snapshot()).values()))
+
+        snapshot_thread = threading.Thread(target=take_snapshots)
+        snapshot_thread.start()
+        threads = [threading.Thread(target=record)
+                   for _ in range(num_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        done.set()
+        snapshot_thread.join()
+
+        self.assertEqual(totals, sorted(totals))
+        self.assertEqual(sum(self._get_sums(view_data.snapshot()).values()),
+                         num_threads * num_records)
+
+    def test_collect_cumulative(self):
+        view_data = self._make_view_data()
+        self.assertEqual(view_data.temporality,
+                         view_module.Temporality.CUMULATIVE)
+        self._record(view_data, 'a', 2)
+
+        snapshot = view_data.collect()
+        self._record(view_data, 'a', 3)
+
+        self.assertIsNot(snapshot, view_data)
+        self.assertEqual(self._get_sums(snapshot), {('a',): 2})
+        self.assertEqual(snapshot.start_time, "2019-01-01T00:00:00Z")
+        self.assertNotEqual(snapshot.end_time, "2019-01-01T00:00:00Z")
+        self.assertEqual(self._get_sums(view_data.collect()), {('a',): 5})
+        self.assertEqual(view_data.start_time, "2019-01-01T00:00:00Z")
+
+    def test_collect_delta(self):
+        view_data = self._make_view_data(
+            temporality=view_module.Temporality.DELTA)
+        self._record(view_data, 'a', 2)
+        self._record(view_data, 'b', 1)
+
+        first = view_data.collect()
+        self._record(view_data, 'a', 3)
+        second = view_data.collect()
+        third = view_data.collect()
+
+        self.assertEqual(self._get_sums(first), {('a',): 2, ('b',): 1})
+        self.assertEqual(self._get_sums(second), {('a',): 3})
+        self.assertEqual(self._get_sums(third), {})
+        self.assertEqual(first.start_time, "2019-01-01T00:00:00Z")
+        self.assertEqual(second.start_time, first.end_time)
+        self.assertEqual(third.start_time, second.end_time)
+        self.assertEqual(view_data.start_time, third.end_time)
+
+    def test_collect_expires_idle_time_series(self):
+        view_data = self._make_view_data(max_idle_intervals=2)
+        self._record(view_data, 'a')
+        self._record(view_data, 'b')
+
+        self.assertEqual(self._get_sums(view_data.collect()),
+                         {('a',): 1, ('b',): 1})
+        self._record(view_data, 'a')
+        self.assertEqual(self._get_sums(view_data.collect()),
+                         {('a',): 2, ('b',): 1})
+        # 'b' was not updated in the last two intervals
+        self.assertEqual(self._get_sums(view_data.collect()), {('a',): 2})
+        self.assertEqual(self._get_sums(view_data.collect()), {})
+
+        # An expired time series starts again from scratch
+        self._record(view_data, 'b')
+        self.assertEqual(self._get_sums(view_data.collect()), {('b',): 1})
+
+    def test_collect_delta_concurrently(self):
+        """Check that records racing with snapshots are never lost."""
+        view_data = self._make_view_data(
+            temporality=view_module.Temporality.DELTA)
+        num_threads = 8
+        num_records = 1000
+        snapshots = []
+        done = threading.Event()
+
+        def record():
+            for ii in range(num_records):
+                self._record(view_data, str(ii % 50))
+
+        def take_snapshots():
+            while not done.is_set():
+                snapshots.append(view_data.collect())
+
+        snapshot_thread = threading.Thread(target=take_snapshots)
+        snapshot_thread.start()
+        threads = [threading.Thread(target=record)
+                   for _ in range(num_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        done.set()
+        snapshot_thread.join()
+        snapshots.append(view_data.collect())
+
+        total = sum(sum(self._get_sums(snapshot).values())
+                    for snapshot in snapshots)
+        self.assertEqual(total, num_threads * num_records)
+
+
+class TestShardedViewData(unittest.TestCase):
+    def _make_view_data(self, aggregation):
+        view = view_module.View("test_view", "description", ['key1'],
+                                mock.Mock(), aggregation)
+        return view_data_module.ShardedViewData(
+            view=view, start_time=mock.Mock(), end_time=mock.Mock())
+
+    @staticmethod
+    def _make_context(value):
+        context = mock.Mock()
+        context.map = {'key1': value}
+        return context
+
+    def test_record_per_thread(self):
+        view_data = self._make_view_data(
+            aggregation_module.SumAggregation())
+        view_data.record(self._make_context('val1'), 1, None)
+        view_data.record(self._make_context('val2'), 2, None)
+
+        barrier = threading.Event()
+        done = threading.Event()
+
+        def record():
+            view_data.record(self._make_context('val1'), 10, None)
+            barrier.set()
+            done.wait()
+
+        thread = threading.Thread(target=record)
+        thread.start()
+        barrier.wait()
+
+        self.assertEqual(len(view_data._shards), 2)
+        tvadm = view_data.tag_value_aggregation_data_map
+        self.assertEqual(tvadm[('val1',)].sum_data, 11)
+        self.assertEqual(tvadm[('val2',)].sum_data, 2)
+
+        # Reading the merged data doesn't change the shards
+        self.assertEqual(
+            view_data._get_shard().tag_value_aggregation_data_map[
+                ('val1',)].sum_data, 1)
+
+        done.set()
+        thread.join()
+
+        # The shard of the finished thread is folded into the view data
+        tvadm = view_data.copy_tag_value_aggregation_data_map()
+        self.assertEqual(tvadm[('val1',)].sum_data, 11)
+        self.assertEqual(len(view_data._shards), 1)
+        tvadm = view_data.copy_tag_value_aggregation_data_map()
+        self.assertEqual(tvadm[('val1',)].sum_data, 11)
+        self.assertEqual(tvadm[('val2',)].sum_data, 2)
+
+        view_data.record(self._make_context('val1'), 100, None)
+        tvadm = view_data.copy_tag_value_aggregation_data_map()
+        self.assertEqual(tvadm[('val1',)].sum_data, 111)
+
+    def test_record_many(self):
+        view_data = self._make_view_data(
+            aggregation_module.SumAggregation())
+        view_data.record_many(self._make_context('a'), [1, 2, 3], None)
+        view_data.record(self._make_context('a'), 4, None)
+
+        [agg_data] = view_data.tag_value_aggregation_data_map.values()
+        self.assertEqual(agg_data.sum_data, 10)
+
+    def test_record_concurrently(self):
+        num_threads = 32
+        num_records = 1000
+        view_data = self._make_view_data(
+            aggregation_module.DistributionAggregation([1, 2, 4]))
+        contexts = [self._make_context('val{}'.format(ii))
+                    for ii in range(8)]
+
+        def record():
+            for ii in range(num_records):
+                view_data.record(contexts[ii % len(contexts)], ii % 5, None)
+
+        threads = [threading.Thread(target=record)
+                   for _ in range(num_threads)]
+        for thread in threads:
+            thread.start()
+        # Read while the other threads are recording
+        view_data.copy_tag_value_aggregation_data_map()
+        for thread in threads:
+            thread.join()
+
+        tvadm = view_data.tag_value_aggregation_data_map
+        self.assertEqual(len(tvadm), len(contexts))
+        per_series = num_threads * num_records // len(contexts)
+        for agg_data in tvadm.values():
+            self.assertEqual(agg_data.count_data, per_series)
+            self.assertEqual(sum(agg_data.counts_per_bucket), per_series)
+            self.assertAlmostEqual(agg_data.mean_data, 2)
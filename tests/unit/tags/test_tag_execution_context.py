@@ -14,6 +14,7 @@
 
 import unittest
 
+from opencensus.common import runtime_context
 from opencensus.tags import execution_context
 from opencensus.tags import tag_key as tag_key_module
 from opencensus.tags import tag_map as tag_map_module
@@ -41,3 +42,17 @@ class TestTagExecutionContext(unittest.TestCase):
         result = execution_context.get_current_tag_map()
 
         self.assertEqual(result, tag_map)
+
+    @unittest.skipIf(runtime_context.contextvars is None,
+                     "contextvars is not available")
+    def test_context_isolation(self):
+        tag_map = tag_map_module.TagMap()
+        execution_context.set_current_tag_map(tag_map)
+
+        def task():
+            self.assertIs(execution_context.get_current_tag_map(), tag_map)
+            execution_context.set_current_tag_map(tag_map_module.TagMap())
+
+        runtime_context.contextvars.copy_context().run(task)
+
+        self.assertIs(execution_context.get_current_tag_map(), tag_map)
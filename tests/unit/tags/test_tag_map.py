@@ -90,3 +90,34 @@ class TestTagMap(unittest.TestCase):
 
         with self.assertRaises(KeyError):
             tag_map.get_value(key='not_in_map')
+
+    def test_project(self):
+        key1 = tags.TagKey('key1')
+        key2 = tags.TagKey('key2')
+        tag_map = tags.TagMap(tags=[tags.Tag(key1, tags.TagValue('value1'))])
+
+        self.assertEqual(tag_map.project((key1, key2)), ('value1', None))
+        self.assertEqual(tag_map.project((key2, key1)), (None, 'value1'))
+        self.assertEqual(tag_map.project(()), ())
+        # Projections are cached
+        self.assertIs(tag_map.project((key1, key2)),
+                      tag_map.project((key1, key2)))
+
+    def test_project_invalidated(self):
+        key1 = tags.TagKey('key1')
+        key2 = tags.TagKey('key2')
+        columns = (key1, key2)
+        tag_map = tags.TagMap()
+        self.assertEqual(tag_map.project(columns), (None, None))
+
+        tag_map.insert(key1, tags.TagValue('value1'))
+        self.assertEqual(tag_map.project(columns), ('value1', None))
+
+        tag_map.update(key1, tags.TagValue('value2'))
+        self.assertEqual(tag_map.project(columns), ('value2', None))
+
+        tag_map.delete(key1)
+        self.assertEqual(tag_map.project(columns), (None, None))
+
+        tag_map.map = {key2: tags.TagValue('value3')}
+        self.assertEqual(tag_map.project(columns), (None, 'value3'))
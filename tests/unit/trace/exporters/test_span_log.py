@@ -0,0 +1,251 @@
+# Copyright 2019, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from opencensus.trace import span_context as span_context_module
+from opencensus.trace import span_data as span_data_module
+from opencensus.trace.exporters import span_log
+
+
+def _make_span_data(name, span_id='6e0c63257de34c92'):
+    return span_data_module.SpanData(
+        name=name,
+        context=span_context_module.SpanContext(
+            trace_id='6e0c63257de34c92bf9efcd03927272e'),
+        span_id=span_id,
+        parent_span_id=None,
+        attributes={'key': 'value'},
+        start_time='2019-01-01T00:00:00.000000Z',
+        end_time='2019-01-01T00:00:01.000000Z',
+        child_span_count=None,
+        stack_trace=None,
+        time_events=None,
+        links=None,
+        status=None,
+        same_process_as_parent_span=None,
+        span_kind=0)
+
+
+class TestVarint(unittest.TestCase):
+
+    def test_roundtrip(self):
+        for value in (0, 1, 127, 128, 300, 2 ** 32):
+            data = b'x' + span_log._encode_varint(value)
+            self.assertEqual(span_log._decode_varint(data, 1),
+                             (value, len(data)))
+
+    def test_decode_truncated(self):
+        data = span_log._encode_varint(300)[:1]
+        self.assertIsNone(span_log._decode_varint(data, 0))
+
+
+class TestSpanLog(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def _segments(self):
+        return sorted(os.listdir(self.directory))
+
+    def _make_writer(self, **kwargs):
+        writer = span_log.SpanLogWriter(self.directory, **kwargs)
+        self.addCleanup(writer.close)
+        return writer
+
+    def test_writer_invalid(self):
+        with self.assertRaises(ValueError):
+            span_log.SpanLogWriter(self.directory, max_bytes=0)
+        with self.assertRaises(ValueError):
+            span_log.SpanLogWriter(self.directory, max_age=0)
+
+    def test_writer_creates_directory(self):
+        directory = os.path.join(self.directory, 'spans')
+
+        span_log.SpanLogWriter(directory)
+
+        self.assertTrue(os.path.isdir(directory))
+
+    def test_write_read(self):
+        writer = self._make_writer()
+        writer.write([_make_span_data('span1'), _make_span_data('span2')])
+        writer.write([_make_span_data('span3')])
+        writer.close()
+
+        [segment] = self._segments()
+        self.assertTrue(segment.startswith(span_log.DEFAULT_PREFIX))
+        for use_mmap in (False, True):
+            spans = list(span_log.SpanLogReader(
+                os.path.join(self.directory, segment), use_mmap))
+            self.assertEqual([span.name.value for span in spans],
+                             ['span1', 'span2', 'span3'])
+            self.assertEqual(spans[0].attributes.attribute_map[
+                'key'].string_value.value, 'value')
+
+    def test_write_buffered(self):
+        writer = self._make_writer()
+        writer.write([_make_span_data('span1')])
+
+        self.assertEqual(os.path.getsize(writer.current_segment), 0)
+        writer.flush()
+        self.assertGreater(os.path.getsize(writer.current_segment), 0)
+
+    def test_write_flushes_full_buffer(self):
+        writer = self._make_writer(buffer_size=1)
+        writer.write([_make_span_data('span1')])
+
+        self.assertGreater(os.path.getsize(writer.current_segment), 0)
+
+    def test_flush_partial_writes(self):
+        writer = self._make_writer()
+        writer.write([_make_span_data('span1'), _make_span_data('span2')])
+        self.assertIsInstance(writer._file, io.FileIO)
+        file_write = writer._file.write
+        sizes = []
+
+        def write(data):
+            # Write at most 10 bytes at a time
+            sizes.append(file_write(data[:10]))
+            return sizes[-1]
+
+        with mock.patch.object(writer, '_file', mock.Mock(wraps=writer._file,
+                                                          write=write)):
+            writer.flush()
+
+        self.assertTrue(all(size <= 10 for size in sizes))
+        self.assertGreater(len(sizes), 1)
+        writer.close()
+        spans = list(span_log.iter_span_log(self.directory))
+        self.assertEqual([span.name.value for span in spans],
+                         ['span1', 'span2'])
+
+    def test_write_after_fork(self):
+        writer = self._make_writer()
+        writer.write([_make_span_data('span1')])
+        parent_segment = writer.current_segment
+
+        with mock.patch('os.getpid', return_value=writer._pid + 1):
+            writer.write([_make_span_data('span2')])
+            child_segment = writer.current_segment
+            writer.close()
+
+        # The span buffered by the parent is not written by the child
+        self.assertNotEqual(child_segment, parent_segment)
+        self.assertEqual(os.path.getsize(parent_segment), 0)
+        spans = list(span_log.SpanLogReader(child_segment))
+        self.assertEqual([span.name.value for span in spans], ['span2'])
+
+    def test_close_after_fork(self):
+        writer = self._make_writer()
+        writer.write([_make_span_data('span1')])
+
+        with mock.patch('os.getpid', return_value=writer._pid + 1):
+            writer.close()
+
+        [segment] = self._segments()
+        self.assertEqual(
+            os.path.getsize(os.path.join(self.directory, segment)), 0)
+
+    def test_rotate_by_size(self):
+        writer = self._make_writer(max_bytes=1)
+
+        with mock.patch('time.time', side_effect=[1.0, 2.0, 3.0]):
+            for name in ('span1', 'span2', 'span3'):
+                writer.write([_make_span_data(name)])
+        writer.close()
+
+        self.assertEqual(len(self._segments()), 3)
+        spans = list(span_log.iter_span_log(self.directory))
+        self.assertEqual([span.name.value for span in spans],
+                         ['span1', 'span2', 'span3'])
+
+    def test_rotate_by_age(self):
+        writer = self._make_writer(max_age=10)
+
+        with mock.patch('time.time', side_effect=[1.0, 5.0, 11.0]):
+            for name in ('span1', 'span2', 'span3'):
+                writer.write([_make_span_data(name)])
+        writer.close()
+
+        segments = self._segments()
+        self.assertEqual(len(segments), 2)
+        spans = list(span_log.SpanLogReader(
+            os.path.join(self.directory, segments[0])))
+        self.assertEqual([span.name.value for span in spans],
+                         ['span1', 'span2'])
+
+    def test_read_truncated(self):
+        writer = self._make_writer()
+        writer.write([_make_span_data('span1'), _make_span_data('span2')])
+        path = writer.current_segment
+        writer.close()
+        with open(path, 'rb+') as segment:
+            segment.truncate(os.path.getsize(path) - 1)
+
+        for use_mmap in (False, True):
+            with mock.patch.object(span_log.logger, 'warning') as mock_log:
+                spans = list(span_log.SpanLogReader(path, use_mmap))
+
+            self.assertEqual([span.name.value for span in spans], ['span1'])
+            self.assertEqual(mock_log.call_count, 1)
+
+    def test_read_empty(self):
+        path = os.path.join(self.directory, 'empty.pb')
+        open(path, 'wb').close()
+
+        for use_mmap in (False, True):
+            self.assertEqual(
+                list(span_log.SpanLogReader(path, use_mmap)), [])
+
+    def test_iter_span_log_prefix(self):
+        writer = self._make_writer(prefix='other')
+        writer.write([_make_span_data('span1')])
+        writer.close()
+        open(os.path.join(self.directory, 'other-notes.txt'), 'w').close()
+
+        self.assertEqual(list(span_log.iter_span_log(self.directory)), [])
+        spans = list(span_log.iter_span_log(self.directory, prefix='other'))
+        self.assertEqual([span.name.value for span in spans], ['span1'])
+
+    @mock.patch('atexit.register')
+    def test_exporter(self, mock_atexit):
+        exporter = span_log.SpanLogExporter(self.directory)
+        mock_atexit.assert_called_once_with(exporter.writer.close)
+
+        exporter.export([_make_span_data('span1')])
+        exporter.export([_make_span_data('span2')])
+        exporter.writer.close()
+
+        spans = list(span_log.iter_span_log(self.directory, use_mmap=True))
+        self.assertEqual([span.name.value for span in spans],
+                         ['span1', 'span2'])
+
+    @mock.patch('atexit.register')
+    def test_exporter_transport(self, mock_atexit):
+        transport = mock.Mock()
+        span_datas = [_make_span_data('span1')]
+
+        exporter = span_log.SpanLogExporter(
+            self.directory, transport=transport)
+        exporter.export(span_datas)
+
+        transport.assert_called_once_with(exporter)
+        transport.return_value.export.assert_called_once_with(span_datas)
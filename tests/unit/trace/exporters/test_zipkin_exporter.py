@@ -15,6 +15,7 @@
 import unittest
 
 import mock
+import requests
 from datetime import datetime
 from opencensus.trace import span_context
 from opencensus.trace import span_data as span_data_module
@@ -45,6 +46,7 @@ class TestZipkinExporter(unittest.TestCase):
         self.assertEqual(exporter.endpoint, endpoint)
         self.assertEqual(exporter.url, expected_url)
         self.assertEqual(exporter.ipv4, ipv4)
+        self.assertFalse(exporter.raise_on_error)
 
     def test_export(self):
         exporter = zipkin_exporter.ZipkinExporter(
@@ -91,6 +93,32 @@ class TestZipkinExporter(unittest.TestCase):
             data=json.dumps(trace),
             headers=zipkin_exporter.ZIPKIN_HEADERS)
 
+    @mock.patch('requests.post')
+    @mock.patch.object(zipkin_exporter.ZipkinExporter, 'translate_to_zipkin')
+    def test_emit_failed_raise_on_error(self, translate_mock, requests_mock):
+        exporter = zipkin_exporter.ZipkinExporter(
+            service_name='my_service', raise_on_error=True)
+        response = mock.Mock()
+        response.status_code = 400
+        requests_mock.return_value = response
+        translate_mock.return_value = {'test': 'this_is_for_test'}
+
+        with self.assertRaises(requests.exceptions.HTTPError) as context:
+            exporter.emit([])
+
+        self.assertIs(context.exception.response, response)
+
+    @mock.patch('requests.post')
+    def test_emit_connection_error(self, requests_mock):
+        requests_mock.side_effect = requests.exceptions.ConnectionError
+        exporter = zipkin_exporter.ZipkinExporter(service_name='my_service')
+
+        exporter.emit([])
+
+        exporter.raise_on_error = True
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            exporter.emit([])
+
     def test_translate_to_zipkin_span_kind_none(self):
         trace_id = '6e0c63257de34c92bf9efcd03927272e'
         spans_ipv4 = [
@@ -16,6 +16,7 @@ import unittest
 import mock
 import threading
 
+from opencensus.common import runtime_context
 from opencensus.trace import execution_context
 
 
@@ -106,3 +107,57 @@ class Test__get_opencensus_attr(unittest.TestCase):
         execution_context.set_current_span(mock_span)
 
         cb.assert_called_once_with(mock_span)
+
+    def test_clear(self):
+        execution_context.set_opencensus_tracer(mock.Mock())
+        execution_context.set_current_span(mock.Mock())
+        execution_context.set_opencensus_attr('key', 'value')
+
+        execution_context.clear()
+
+        self.assertIsNone(execution_context.get_current_span())
+        self.assertIsNone(execution_context.get_opencensus_attrs())
+
+    def test_context_override(self):
+        context = mock.Mock(spec=['tracer', 'current_span', 'attrs'])
+        context.tracer = mock_tracer = mock.Mock()
+        context.current_span = None
+        context.attrs = None
+        get_context = mock.Mock(return_value=context)
+        execution_context.set_current_span(mock.Mock())
+
+        with mock.patch.object(execution_context, '_get_context',
+                               get_context):
+            self.assertIs(execution_context.get_opencensus_tracer(),
+                          mock_tracer)
+            self.assertIsNone(execution_context.get_current_span())
+            mock_span = mock.Mock()
+            execution_context.set_current_span(mock_span)
+            execution_context.set_opencensus_attr('key', 'value')
+
+            self.assertIs(context.current_span, mock_span)
+            self.assertEqual(context.attrs, {'key': 'value'})
+
+            # Without a context, the context variables are used
+            get_context.return_value = None
+            self.assertIsNot(execution_context.get_current_span(), mock_span)
+
+        self.assertIsNone(execution_context.get_opencensus_attrs())
+
+    @unittest.skipIf(runtime_context.contextvars is None,
+                     "contextvars is not available")
+    def test_context_isolation(self):
+        mock_span = mock.Mock()
+        execution_context.set_current_span(mock_span)
+        execution_context.set_opencensus_attr('key', 'parent')
+
+        def task():
+            self.assertIs(execution_context.get_current_span(), mock_span)
+            execution_context.set_current_span(mock.Mock())
+            execution_context.set_opencensus_attr('key', 'child')
+
+        runtime_context.contextvars.copy_context().run(task)
+
+        self.assertIs(execution_context.get_current_span(), mock_span)
+        self.assertEqual(execution_context.get_opencensus_attr('key'),
+                         'parent')
@@ -79,6 +79,14 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(
             list(utils.uniq(['a', 'b', 'a', 'c', 'c'])), ['a', 'b', 'c'])
 
+    def test_to_iso_str(self):
+        self.assertEqual(utils.to_iso_str(0), '1970-01-01T00:00:00Z')
+        self.assertEqual(utils.to_iso_str(1.25),
+                         '1970-01-01T00:00:01.250000Z')
+        self.assertEqual(utils.to_iso_str('2019-01-01T00:00:00Z'),
+                         '2019-01-01T00:00:00Z')
+        self.assertIsNone(utils.to_iso_str(None))
+
 
 class TestGetWeakref(unittest.TestCase):
 